@@ -11,8 +11,7 @@ from alembic import context
 sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.core.config import settings
-from app.db.base_class import Base
-from app.models import user, course, user_course, module_model, unit
+from app.models import Base # The Base every model is declared on; importing app.models registers them all
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -29,6 +28,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# The URL comes from the app settings; set it here so the ini's %(DB_CONNECTION_STRING)s placeholder is never interpolated.
+config.set_main_option("sqlalchemy.url", str(settings.SQLALCHEMY_DATABASE_URI).replace("%", "%%"))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Autogenerate: ignore the monthly activity_events partitions (managed by app/services/activity_log.py)."""
+    if type_ in ("table", "index") and reflected and compare_to is None and name.startswith("activity_events_"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,12 +56,13 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = settings.SQLALCHEMY_DATABASE_URI
+    url = str(settings.SQLALCHEMY_DATABASE_URI)
     context.configure(
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -60,7 +70,7 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection):
     """Helper function to run migrations with a given connection."""
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -77,7 +87,7 @@ async def run_migrations_online() -> None:
     if connectable_config is None:
         connectable_config = {}
 
-    connectable_config["sqlalchemy.url"] = settings.SQLALCHEMY_DATABASE_URI
+    connectable_config["sqlalchemy.url"] = str(settings.SQLALCHEMY_DATABASE_URI)
 
     connectable = AsyncEngine(
         engine_from_config(
@@ -98,4 +108,4 @@ if context.is_offline_mode():
     run_migrations_offline()
 else:
     import asyncio
-    asyncio.run(run_migrations_online)
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,107 @@
+"""Baseline: the schema as created by Base.metadata.create_all before migrations existed
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 12:00:00.000000
+
+Exactly the tables the app created before migrations existed (users, courses,
+user_courses, modules and units, with their original foreign keys); every later change is
+a revision of its own. New databases run everything with `alembic upgrade head`.
+A database created before migrations existed is marked with `alembic stamp 0001_baseline`
+and then upgraded with `alembic upgrade head`. Stamp nothing else: a database with tables
+from later revisions fails the upgrade on the first table or constraint it already has
+(or is missing), and has to be recreated.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The models declare their enums with create_type=False, so they are created explicitly here.
+unit_type_enum = postgresql.ENUM(
+    'MATERIAL', 'ASSIGNMENT', 'QUIZ', 'VIDEO', 'DISCUSSION', 'EXTERNAL_LINK',
+    name='unit_type_enum_db', create_type=False
+)
+user_course_role_enum = postgresql.ENUM('teacher', 'student', name='user_course_role_enum', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for enum_type in (unit_type_enum, user_course_role_enum):
+        enum_type.create(bind, checkfirst=True)
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('google_sub', sa.String(length=255), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_google_sub', 'users', ['google_sub'], unique=True)
+
+    op.create_table(
+        'courses',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_courses_id', 'courses', ['id'])
+
+    op.create_table(
+        'user_courses',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.UUID(), nullable=False),
+        sa.Column('role', user_course_role_enum, nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'course_id'),
+    )
+
+    op.create_table(
+        'modules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('order', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_modules_id', 'modules', ['id'])
+
+    op.create_table(
+        'units',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('type', unit_type_enum, nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('order', sa.Integer(), nullable=False),
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['module_id'], ['modules.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_units_id', 'units', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        'units', 'modules', 'user_courses', 'courses', 'users',
+    ):
+        op.drop_table(table) # Drops its indexes too
+    bind = op.get_bind()
+    for enum_type in (user_course_role_enum, unit_type_enum):
+        enum_type.drop(bind, checkfirst=True)
@@ -0,0 +1,44 @@
+"""ON DELETE CASCADE for the course content foreign keys
+
+Revision ID: 0002_cascade_foreign_keys
+Revises: 0001_baseline
+Create Date: 2026-10-19 12:10:00.000000
+
+modules.course_id and units.module_id are rebuilt with ON DELETE CASCADE, so deleting a
+course or module removes its modules and units in the database. The models rely on it:
+their relationships set passive_deletes, and crud_course.remove_with_cascade deletes a
+course without loading its children. Without this revision such deletes fail on the
+foreign keys of existing databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_cascade_foreign_keys'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (constraint, table, column, referenced table); names as PostgreSQL generated them for the baseline
+FOREIGN_KEYS = (
+    ('modules_course_id_fkey', 'modules', 'course_id', 'courses'),
+    ('units_module_id_fkey', 'units', 'module_id', 'modules'),
+)
+
+
+def _rebuild(ondelete: Union[str, None]) -> None:
+    for name, table, column, referred_table in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred_table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rebuild('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild(None)
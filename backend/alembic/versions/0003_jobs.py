@@ -0,0 +1,64 @@
+"""Background jobs table
+
+Revision ID: 0003_jobs
+Revises: 0002_cascade_foreign_keys
+Create Date: 2026-10-19 12:20:00.000000
+
+The queue of the in-process job workers (app/jobs/worker.py) and its status enum type.
+Workers claim queued jobs, and running jobs whose lease expired, through ix_jobs_claimable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_jobs'
+down_revision: Union[str, None] = '0002_cascade_foreign_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Declared with create_type=False on the model (app/models/job.py), so it is created explicitly here.
+job_status_enum = postgresql.ENUM('queued', 'running', 'succeeded', 'failed', name='job_status_enum', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    job_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('kind', sa.String(length=100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', job_status_enum, nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('progress_message', sa.Text(), nullable=True),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_jobs_created_by_id', 'jobs', ['created_by_id'])
+    op.create_index(
+        'ix_jobs_claimable', 'jobs', ['status', 'run_after'],
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('jobs')
+    job_status_enum.drop(op.get_bind(), checkfirst=True)
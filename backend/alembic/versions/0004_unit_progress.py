@@ -0,0 +1,43 @@
+"""Unit progress table
+
+Revision ID: 0004_unit_progress
+Revises: 0003_jobs
+Create Date: 2026-10-19 12:30:00.000000
+
+Per-(user, unit) progress, written in batches by the write-behind buffer
+(app/services/progress_buffer.py) with INSERT ... ON CONFLICT DO UPDATE.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_unit_progress'
+down_revision: Union[str, None] = '0003_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'unit_progress',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unit_id', sa.Integer(), nullable=False),
+        sa.Column('open_count', sa.Integer(), nullable=False),
+        sa.Column('first_opened_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_opened_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['unit_id'], ['units.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'unit_id'),
+    )
+    op.create_index('ix_unit_progress_unit_id', 'unit_progress', ['unit_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('unit_progress')
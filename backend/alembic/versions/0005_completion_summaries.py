@@ -0,0 +1,61 @@
+"""Course and module completion summaries
+
+Revision ID: 0005_completion_summaries
+Revises: 0004_unit_progress
+Create Date: 2026-10-19 12:40:00.000000
+
+Per-student completion summaries of courses and modules, kept current in the same
+transaction as the unit progress upserts (app/crud/crud_completion.py) so course
+analytics read them instead of aggregating unit_progress.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_completion_summaries'
+down_revision: Union[str, None] = '0004_unit_progress'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_completion',
+        sa.Column('course_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('units_opened', sa.Integer(), nullable=False),
+        sa.Column('units_completed', sa.Integer(), nullable=False),
+        sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('course_id', 'user_id'),
+    )
+    op.create_index('ix_course_completion_user_id', 'course_completion', ['user_id'])
+
+    op.create_table(
+        'module_completion',
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.UUID(), nullable=False),
+        sa.Column('units_opened', sa.Integer(), nullable=False),
+        sa.Column('units_completed', sa.Integer(), nullable=False),
+        sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['module_id'], ['modules.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('module_id', 'user_id'),
+    )
+    op.create_index('ix_module_completion_course_id', 'module_completion', ['course_id'])
+    op.create_index('ix_module_completion_user_id', 'module_completion', ['user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('module_completion')
+    op.drop_table('course_completion')
@@ -0,0 +1,45 @@
+"""Partitioned activity event log
+
+Revision ID: 0006_activity_events
+Revises: 0005_completion_summaries
+Create Date: 2026-10-19 12:50:00.000000
+
+Append-only log of learning activity, partitioned by month on occurred_at. Only the
+partitioned parent is created here: app/services/activity_log.py creates the monthly
+partitions ahead of time and drops them after the retention period.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_activity_events'
+down_revision: Union[str, None] = '0005_completion_summaries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'activity_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('event_type', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('course_id', sa.UUID(), nullable=True),
+        sa.Column('unit_id', sa.Integer(), nullable=True),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.PrimaryKeyConstraint('id', 'occurred_at'),
+        postgresql_partition_by='RANGE (occurred_at)',
+    )
+    op.create_index('ix_activity_events_user_id_occurred_at', 'activity_events', ['user_id', 'occurred_at'])
+    op.create_index('ix_activity_events_course_id_occurred_at', 'activity_events', ['course_id', 'occurred_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('activity_events') # Drops the monthly partitions too
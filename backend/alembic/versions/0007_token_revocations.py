@@ -0,0 +1,52 @@
+"""Token revocation list
+
+Revision ID: 0007_token_revocations
+Revises: 0006_activity_events
+Create Date: 2026-10-19 13:00:00.000000
+
+Revoked access tokens (by jti) and per-user epochs that revoke every token issued before
+them; app/services/token_revocation.py keeps both in memory.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_token_revocations'
+down_revision: Union[str, None] = '0006_activity_events'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index('ix_revoked_tokens_user_id', 'revoked_tokens', ['user_id'])
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+
+    op.create_table(
+        'user_token_epochs',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('not_before', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('ix_user_token_epochs_updated_at', 'user_token_epochs', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('user_token_epochs', 'revoked_tokens'):
+        op.drop_table(table) # Drops its indexes too
@@ -0,0 +1,46 @@
+"""Identity snapshot versions
+
+Revision ID: 0008_users_token_version
+Revises: 0007_token_revocations
+Create Date: 2026-10-19 13:10:00.000000
+
+users.token_version is bumped when a user's name or email changes; access tokens carry
+the version of their identity snapshot. user_token_epochs also publishes the current
+version to every process (app/services/token_revocation.py), so a row no longer implies a
+revocation epoch (not_before becomes nullable). The foreign key is dropped: a row outlives
+its deleted user, so that user's tokens stay rejected until they expire.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_users_token_version'
+down_revision: Union[str, None] = '0007_token_revocations'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='1', nullable=False))
+    op.drop_constraint('user_token_epochs_user_id_fkey', 'user_token_epochs', type_='foreignkey')
+    op.alter_column('user_token_epochs', 'not_before', existing_type=sa.DateTime(timezone=True), nullable=True)
+    op.add_column('user_token_epochs', sa.Column('token_version', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_token_epochs', 'token_version')
+    # Rows that only published a version, or outlived their user, have no place in the old schema.
+    op.execute(
+        "DELETE FROM user_token_epochs WHERE not_before IS NULL "
+        "OR NOT EXISTS (SELECT 1 FROM users WHERE users.id = user_token_epochs.user_id)"
+    )
+    op.alter_column('user_token_epochs', 'not_before', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.create_foreign_key(
+        'user_token_epochs_user_id_fkey', 'user_token_epochs', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    op.drop_column('users', 'token_version')
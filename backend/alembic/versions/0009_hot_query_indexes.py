@@ -0,0 +1,46 @@
+"""Composite indexes for the hot read paths
+
+Revision ID: 0009_hot_query_indexes
+Revises: 0008_users_token_version
+Create Date: 2026-10-19 12:30:00.000000
+
+- modules (course_id, order): a course's outline, already in display order
+- units (module_id, order): a module's units, already in display order
+- user_courses (course_id, role): the course side of enrollments (rosters, student
+  counts, event fan-out); the (user_id, course_id) primary key serves the user side
+- courses (name): course lists are ordered by name
+
+Built CONCURRENTLY (outside the migration transaction) so existing tables stay writable.
+scripts/check_query_plans.py checks that the hot queries use them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_hot_query_indexes'
+down_revision: Union[str, None] = '0008_users_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_modules_course_id_order', 'modules', ['course_id', 'order']),
+    ('ix_units_module_id_order', 'units', ['module_id', 'order']),
+    ('ix_user_courses_course_id_role', 'user_courses', ['course_id', 'role']),
+    ('ix_courses_name', 'courses', ['name']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
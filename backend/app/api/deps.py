@@ -1,34 +1,76 @@
 # backend/app/api/deps.py
 from typing import Optional, AsyncGenerator
 
-from fastapi import Depends, HTTPException, status, Request # Request is needed to access cookies
+from fastapi import Depends, HTTPException, Query, status, Request, Response # Request is needed to access cookies
 from sqlalchemy.ext.asyncio import AsyncSession
 import jwt # Still used by security.verify_token internally, but not directly here for decoding
 import asyncio
 import traceback
+from datetime import datetime, timezone
 
 from app.core.config import settings # Your Pydantic settings
 from app.core import security      # Your security utilities (verify_token)
+from app.core import metrics
+from app.core import rate_limit as rate_limiter # Token buckets (memory / redis backend)
 from app.db.session import get_db_session # Your ASYNC database session dependency
 from app.models.user import User as UserModel # Your SQLAlchemy User model
 from app.crud.crud_user import crud_user            # Your CRUD operations for user
+from app.schemas.course_schemas import CourseView
 from app.schemas.token_schemas import TokenPayload # Your Pydantic schema for token payload
+from app.schemas.user_schemas import CurrentIdentity
+from app.services.token_revocation import token_revocations # In-memory revocation list
+
+# Scope key under which a request carries an identity already authenticated by its caller
+# (POST /batch sub-requests): the cookie is verified once per batch, not once per sub-request.
+SHARED_IDENTITY_SCOPE_KEY = "lms.identity"
+
+def refresh_access_token_cookie(response: Response, token_data: TokenPayload, user: UserModel) -> None:
+    """
+    Silently reissues the access token with the user's current identity snapshot. The new
+    token keeps the old expiry, so refreshing never extends a session.
+    """
+    remaining = datetime.fromtimestamp(token_data.exp, timezone.utc) - datetime.now(timezone.utc) if token_data.exp else None
+    if remaining is not None and remaining.total_seconds() <= 0:
+        return
+    access_token = security.create_access_token(
+        subject=str(user.id), expires_delta=remaining, identity=security.identity_claims(user)
+    )
+    security.set_access_token_cookie(response, access_token)
+    metrics.ACCESS_TOKENS_REFRESHED.inc()
+    print(f"DEBUG: Reissued access token for user {user.id} (identity version {token_data.ver} -> {user.token_version})")
+
+
+def _require_revocation_list() -> None:
+    """Answers 503 while the revocation list is not loaded: a token cannot be checked yet, but it is not invalid."""
+    if not token_revocations.loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily unavailable, please retry",
+            headers={"Retry-After": "2"},
+        )
+
 
 async def get_current_user_from_cookie(
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db_session)
 ) -> Optional[UserModel]:
     """
     Dependency to get the current user from the access_token cookie.
     Verifies the token, and fetches the user from the database.
     Returns the SQLAlchemy UserModel instance or None if not authenticated or user not found.
+    Reissues the token when its identity snapshot is older than the user's token_version.
     """
     print('--- get_current_user_from_cookie ---')
+    shared_identity: Optional[CurrentIdentity] = request.scope.get(SHARED_IDENTITY_SCOPE_KEY)
+    if shared_identity is not None:
+        return await crud_user.load(db, shared_identity.id) # Memoized on the batch's shared session
     access_token: Optional[str] = request.cookies.get("access_token")
     print(f'access_token: {access_token[:30] if access_token else "None"}...')
 
     if not access_token:
         return None
+    _require_revocation_list()
 
     try:
         payload_dict = security.verify_token(access_token)
@@ -48,6 +90,12 @@ async def get_current_user_from_cookie(
             print("ERROR: token_data.sub is None")
             return None
 
+        # Logged out (this token, or all of the user's tokens): two dict lookups, no query.
+        if token_revocations.is_revoked(token_data):
+            print(f"DEBUG: Token {token_data.jti} of user {token_data.sub} has been revoked")
+            metrics.REVOKED_TOKENS_REJECTED.inc()
+            return None
+
         try:
             user_id = int(token_data.sub)
             print(f'user_id from token: {user_id}')
@@ -70,7 +118,9 @@ async def get_current_user_from_cookie(
         print(f"DEBUG: Attempting to call await crud_user.get(db, id={user_id})")
         user: Optional[UserModel] = None
         try:
-            user = await crud_user.get(db=db, record_id=user_id)
+            # load() rather than get(): memoizes the current user on the request's session,
+            # so services looking the same id up again (e.g. self-enrollment) skip the query.
+            user = await crud_user.load(db, user_id)
         except Exception as e_crud_get:
             print(f"ERROR: Exception during crud_user.get call: {e_crud_get}")
             traceback.print_exc()
@@ -81,6 +131,8 @@ async def get_current_user_from_cookie(
         if not user:
             return None
 
+        if token_data.ver != user.token_version:
+            refresh_access_token_cookie(response, token_data, user)
         return user
 
     except jwt.ExpiredSignatureError:
@@ -130,6 +182,128 @@ async def get_optional_current_user(
     """
     return current_user
 
+
+def _valid_token_payload(request: Request) -> Optional[TokenPayload]:
+    """The access_token cookie's claims if it is present, valid, not expired and not revoked."""
+    access_token = request.cookies.get("access_token")
+    if not access_token:
+        return None
+    _require_revocation_list()
+    payload_dict = security.verify_token(access_token)
+    if payload_dict is None:
+        return None
+    try:
+        token_data = TokenPayload(**payload_dict)
+    except Exception as e:
+        print(f"ERROR: Token payload validation error: {e}")
+        return None
+    if token_data.sub is None or not token_data.sub.isdigit():
+        return None
+    if token_revocations.is_revoked(token_data):
+        metrics.REVOKED_TOKENS_REJECTED.inc()
+        return None
+    return token_data
+
+
+async def get_optional_current_identity(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db_session) # Opened lazily: no connection unless the user must be loaded
+) -> Optional[CurrentIdentity]:
+    """
+    Like get_optional_current_user, but for endpoints that only need the user's id, email
+    and name: trusts the token's signed identity snapshot and loads nothing. Tokens without
+    a snapshot, or with one older than the user's current version (an in-memory check, see
+    app/services/token_revocation.py), load the user once and get a fresh token.
+    """
+    shared_identity: Optional[CurrentIdentity] = request.scope.get(SHARED_IDENTITY_SCOPE_KEY)
+    if shared_identity is not None:
+        return shared_identity
+    token_data = _valid_token_payload(request)
+    if token_data is None:
+        return None
+    if not token_revocations.is_stale(token_data) and token_data.email is not None:
+        metrics.IDENTITY_FROM_TOKEN.labels("snapshot").inc()
+        return CurrentIdentity(id=int(token_data.sub), email=token_data.email, name=token_data.name)
+
+    metrics.IDENTITY_FROM_TOKEN.labels("loaded").inc()
+    user = await crud_user.load(db, int(token_data.sub))
+    if not user:
+        return None
+    refresh_access_token_cookie(response, token_data, user)
+    return CurrentIdentity.model_validate(user)
+
+
+async def get_current_identity(
+    current_identity: Optional[CurrentIdentity] = Depends(get_optional_current_identity)
+) -> CurrentIdentity:
+    """get_current_active_user for identity-only endpoints: 401 unless authenticated, no user row loaded."""
+    if not current_identity:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated or user not found.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return current_identity
+
+
+def get_course_view(
+    fields: Optional[str] = Query(None, description="Comma-separated CourseOut fields to return (id is always returned); all if omitted"),
+    include: Optional[str] = Query(None, description="Comma-separated relationships to load: user_associations, modules, modules.units; all if omitted, none if empty"),
+) -> CourseView:
+    """Sparse fieldset of a course response; 422 on unknown names."""
+    try:
+        return CourseView.parse(fields=fields, include=include)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
+def set_total_count_headers(response: Response, total: int, is_exact: bool) -> None:
+    """Total of a paginated list, in headers so the response body stays a plain list."""
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Total-Count-Exact"] = "true" if is_exact else "false"
+
+
+def client_ip(request: Request) -> str:
+    """The caller's IP; behind a reverse proxy, the address it appended to X-Forwarded-For (when trusted)."""
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(route: str):
+    """
+    Dependency factory: token-bucket limit for `route` (RATE_LIMIT_<ROUTE> in Settings), per
+    authenticated user, else per client IP. Raises 429 with Retry-After when the bucket is empty.
+    Fails open (logged) if the shared backend is unreachable.
+
+        @router.post("", dependencies=[Depends(deps.rate_limit("course_create"))])
+    """
+    async def check_rate_limit(
+        request: Request,
+        current_user: Optional[CurrentIdentity] = Depends(get_optional_current_identity)
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        key = f"user:{current_user.id}" if current_user else f"ip:{client_ip(request)}"
+        limiter = rate_limiter.get_rate_limiter()
+        try:
+            allowed, retry_after = await limiter.check(route, key)
+        except Exception as e:
+            print(f"ERROR: Rate limit backend failed for {route} ({key}), allowing the request: {e}")
+            metrics.RATE_LIMIT_BACKEND_ERRORS.inc()
+            return
+        if not allowed:
+            metrics.RATE_LIMITED.labels(route).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please retry later.",
+                headers={"Retry-After": limiter.retry_after_header(retry_after)},
+            )
+    return check_rate_limit
+
 # Example: Dependency for requiring a specific role (if you implement roles)
 # from app.models.enums import UserRoleEnum
 # def require_role(required_role: UserRoleEnum):
@@ -1,8 +1,13 @@
 # backend/app/api/v1/api_v1.py
 from fastapi import APIRouter
-from .endpoints import auth, courses, users
+from .endpoints import auth, batch, courses, events, jobs, submissions, units, users
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(courses.router, prefix="/courses", tags=["Courses"])
-api_router.include_router(users.router, prefix="/users", tags=["Users"])
\ No newline at end of file
+api_router.include_router(users.router, prefix="/users", tags=["Users"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(units.router, prefix="/units", tags=["Units"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
+api_router.include_router(submissions.router, prefix="/submissions", tags=["Submissions"])
@@ -1,16 +1,18 @@
 # backend/app/api/v1/endpoints/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status, Response as FastAPIResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response as FastAPIResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.user import User as UserModel
 from app.schemas.user_schemas import UserOut
 from app.schemas.token_schemas import GoogleIdToken
 from app.services.auth_service import auth_service
 from app.db.session import get_db_session
+from app.api import deps
 from app.core import security
 
 router = APIRouter()
 
-@router.post("/google", response_model=UserOut)
+@router.post("/google", response_model=UserOut, dependencies=[Depends(deps.rate_limit("auth_google"))])
 async def login_with_google(
     response: FastAPIResponse,
     payload: GoogleIdToken,
@@ -22,16 +24,7 @@ async def login_with_google(
             db, google_id_token=payload.token
         )
 
-        response.set_cookie(
-            key="access_token",
-            value=access_token,
-            httponly=security.COOKIE_HTTPONLY,
-            secure=security.COOKIE_SECURE,
-            samesite=security.COOKIE_SAMESITE,
-            max_age=security.COOKIE_MAX_AGE,
-            path=security.COOKIE_PATH,
-            # domain=security.COOKIE_DOMAIN,
-        )
+        security.set_access_token_cookie(response, access_token)
         return user
     except HTTPException as e:
         print(f"DEBUG: HTTPException in login_with_google: {e.detail}")
@@ -43,9 +36,7 @@ async def login_with_google(
             detail="An unexpected error occurred during authentication."
         )
 
-@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(response: FastAPIResponse):
-    print("DEBUG: POST /api/v1/auth/logout endpoint hit!")
+def _clear_access_cookie(response: FastAPIResponse) -> None:
     response.delete_cookie(
         key="access_token",
         path=security.COOKIE_PATH,
@@ -54,4 +45,25 @@ async def logout(response: FastAPIResponse):
         samesite=security.COOKIE_SAMESITE,
         # domain=security.COOKIE_DOMAIN,
     )
-    return
\ No newline at end of file
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Request,
+    response: FastAPIResponse,
+    db: AsyncSession = Depends(get_db_session)
+):
+    print("DEBUG: POST /api/v1/auth/logout endpoint hit!")
+    await auth_service.logout(db, access_token=request.cookies.get("access_token"))
+    _clear_access_cookie(response)
+    return
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_everywhere(
+    response: FastAPIResponse,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(deps.get_current_active_user)
+):
+    print(f"DEBUG: POST /api/v1/auth/logout-all endpoint hit by user {current_user.id}")
+    await auth_service.logout_everywhere(db, user=current_user)
+    _clear_access_cookie(response)
+    return
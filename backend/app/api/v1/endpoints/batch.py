@@ -0,0 +1,151 @@
+# backend/app/api/v1/endpoints/batch.py
+"""
+POST /batch: several API reads in one HTTP request, for pages that would otherwise fan out
+(e.g. /users/me, then /courses, then /courses/{id}).
+
+Each sub-request is dispatched through the application's router, so it runs the same
+endpoint, validation and authorization as a direct call. The batch authenticates the
+cookie once and opens one database session; sub-requests find both in their ASGI scope
+(see deps.SHARED_IDENTITY_SCOPE_KEY and session.SHARED_SESSION_SCOPE_KEY) instead of
+verifying the token and checking out a connection again. Sub-requests run one after
+another, since they share the session, and bypass the HTTP middleware (the batch itself
+is measured as one request). Streaming endpoints (event streams, exports) cannot be batched.
+"""
+import json
+import traceback
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.routing import Match
+
+from app.api import deps
+from app.core.config import settings
+from app.db.session import SHARED_SESSION_SCOPE_KEY, get_db_session
+from app.schemas.batch_schemas import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+from app.schemas.user_schemas import CurrentIdentity
+
+router = APIRouter()
+
+# Request headers a sub-request does not inherit from the batch (they describe the batch's own body)
+_DROPPED_REQUEST_HEADERS = {b"content-length", b"content-type", b"transfer-encoding"}
+# Response headers not copied into a sub-response (the batch response carries its own)
+_DROPPED_RESPONSE_HEADERS = {"content-length", "set-cookie", "server-timing", "transfer-encoding"}
+
+
+class _StreamingNotBatchable(Exception):
+    pass
+
+
+def _sub_request_scope(request: Request, item: BatchRequestItem, current_user: CurrentIdentity, db: AsyncSession) -> Dict[str, Any]:
+    """ASGI scope of one sub-request: the batch's connection details with its own method, path and query."""
+    target = urlsplit(item.path)
+    if target.scheme or target.netloc:
+        raise ValueError("path must be relative to this API")
+    path = target.path if target.path.startswith(settings.API_V1_STR + "/") else settings.API_V1_STR + "/" + target.path.lstrip("/")
+    if path.rstrip("/") == request.url.path.rstrip("/"):
+        raise ValueError("batches cannot be nested")
+    scope = {
+        key: value for key, value in request.scope.items()
+        if key not in ("route", "endpoint", "path_params", "state") # Set per request by the router
+    }
+    scope.update({
+        "method": item.method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": target.query.encode(),
+        "headers": [(k, v) for k, v in request.scope["headers"] if k not in _DROPPED_REQUEST_HEADERS],
+        "state": {},
+        deps.SHARED_IDENTITY_SCOPE_KEY: current_user,
+        SHARED_SESSION_SCOPE_KEY: db,
+    })
+    return scope
+
+
+def _is_streaming_route(request: Request, scope: Dict[str, Any]) -> bool:
+    """Whether the route the sub-request resolves to declares a streaming response (checked before it runs)."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "response_class", None) is StreamingResponse
+    return False
+
+
+async def _dispatch(request: Request, scope: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    """Runs one sub-request through the router and collects its response."""
+    started: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            started.update(message)
+        elif message["type"] == "http.response.body":
+            if message.get("more_body"): # A streaming response not caught by _is_streaming_route
+                raise _StreamingNotBatchable()
+            chunks.append(message.get("body", b""))
+
+    await request.app.router(scope, receive, send)
+    return started.get("status", 500), started.get("headers", []), b"".join(chunks)
+
+
+def _response_item(item: BatchRequestItem, status_code: int, raw_headers: List[Tuple[bytes, bytes]], body: bytes) -> BatchResponseItem:
+    headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in raw_headers}
+    headers = {k: v for k, v in headers.items() if k.lower() not in _DROPPED_RESPONSE_HEADERS}
+    content_type = next((v for k, v in headers.items() if k.lower() == "content-type"), "")
+    decoded: Any = None
+    if body:
+        decoded = json.loads(body) if content_type.startswith("application/json") else body.decode("utf-8", "replace")
+    return BatchResponseItem(id=item.id, status=status_code, headers=headers, body=decoded)
+
+
+def _error_item(item: BatchRequestItem, status_code: int, detail: str) -> BatchResponseItem:
+    return BatchResponseItem(
+        id=item.id, status=status_code, headers={"content-type": "application/json"}, body={"detail": detail}
+    )
+
+
+@router.post("", response_model=BatchResponse, summary="Run several API reads in one request")
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    Runs each `GET` in `requests` in order, as the authenticated user and on one database
+    session, and returns their responses (status, headers, decoded body) in the same order.
+    A failing sub-request does not fail the batch; its status says what went wrong.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests.",
+        )
+    print(f"DEBUG: POST /batch with {len(batch.requests)} requests by user_id: {current_user.id}")
+    responses: List[BatchResponseItem] = []
+    for item in batch.requests:
+        try:
+            scope = _sub_request_scope(request, item, current_user, db)
+        except ValueError as e:
+            responses.append(_error_item(item, status.HTTP_400_BAD_REQUEST, f"Invalid path {item.path!r}: {e}"))
+            continue
+        if _is_streaming_route(request, scope):
+            responses.append(_error_item(item, status.HTTP_400_BAD_REQUEST, "Streaming responses cannot be batched."))
+            continue
+        try:
+            responses.append(_response_item(item, *await _dispatch(request, scope)))
+        except StarletteHTTPException as e: # Raised by the router itself, e.g. no route matches the path
+            responses.append(_error_item(item, e.status_code, str(e.detail)))
+        except _StreamingNotBatchable:
+            responses.append(_error_item(item, status.HTTP_400_BAD_REQUEST, "Streaming responses cannot be batched."))
+        except Exception as e:
+            print(f"ERROR in batch sub-request {item.method} {item.path}: {e}")
+            traceback.print_exc()
+            responses.append(_error_item(item, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error."))
+    return BatchResponse(responses=responses)
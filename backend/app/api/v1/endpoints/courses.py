@@ -1,16 +1,24 @@
 # backend/app/api/v1/endpoints/courses.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
-from typing import List
+from typing import List, Optional
 import traceback # For detailed error logging
 
 from app.db.session import get_db_session # Async DB session
 from app.models.user import User as UserModel # SQLAlchemy User model
-from app.schemas.course_schemas import CourseOut, CourseCreate # Pydantic schemas
+from app.schemas.user_schemas import CurrentIdentity, UserForCourseResponse # Token identity snapshot, course member
+from app.schemas.course_schemas import CourseOut, CourseCreate, CourseClone, CourseView # Pydantic schemas
 from app.schemas.user_course_schemas import UserCourseCreate, UserCourseOut # For enrollment
+from app.schemas.job_schemas import JobOut # Background job status
+from app.schemas.progress_schemas import UnitProgressOut # Unit progress
+from app.schemas.analytics_schemas import CourseAnalyticsOut # Teacher dashboard
 from app.api import deps # API dependencies
 from app.services.course_service import course_service # Course service layer
+from app.services.course_transfer_service import course_transfer_service # JSON Lines export/import
+from app.services.progress_service import progress_service # Unit progress
 
 router = APIRouter()
 
@@ -18,17 +26,21 @@ router = APIRouter()
 @router.get("/", response_model=List[CourseOut], include_in_schema=False) # Keep for flexibility
 async def list_my_courses(
     db: AsyncSession = Depends(get_db_session),
-    current_user: UserModel = Depends(deps.get_current_active_user),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity),
+    view: CourseView = Depends(deps.get_course_view),
     skip: int = 0,
     limit: int = 100
 ):
     """
     Retrieve a list of courses the authenticated user is enrolled in.
     Includes details about the user's role in each course and associated modules/units.
+    `fields` / `include` narrow each course to the parts requested; the rest is not queried.
     """
     courses = await course_service.get_courses_for_user(
-        db, user=current_user, skip=skip, limit=limit
+        db, user=current_user, skip=skip, limit=limit, view=view
     )
+    if not view.is_full:
+        return JSONResponse(content=[view.dump(course) for course in courses])
     # Pydantic should handle the conversion from List[CourseModel] to List[CourseOut]
     # Ensure your CourseOut and nested schemas (UserForCourseResponse, ModuleOut, UnitOut)
     # have `from_attributes = True` in their Config and relationships are correctly loaded by CRUD.
@@ -38,21 +50,26 @@ async def list_my_courses(
 async def get_course_details(
     course_id: uuid.UUID,
     db: AsyncSession = Depends(get_db_session),
-    current_user: UserModel = Depends(deps.get_current_active_user)
+    current_user: CurrentIdentity = Depends(deps.get_current_identity),
+    view: CourseView = Depends(deps.get_course_view)
 ):
     """
     Fetch a single course by its ID.
     Includes associated users (with their roles in this course),
     modules (ordered by 'order'), and units (ordered by 'order') within each module.
+    `fields` / `include` narrow the response (e.g. `include=modules` for the outline without
+    units); relationships left out are not queried.
     """
     print(f"DEBUG: Endpoint /api/v1/courses/{course_id} HIT. Requested by user_id: {current_user.id}")
     try:
         course_orm = await course_service.get_course_by_id_for_user(
-            db, course_id=course_id, user=current_user
+            db, course_id=course_id, user=current_user, view=view
         )
         if not course_orm:
              print(f"DEBUG: Course service returned None for course_id: {course_id}")
              raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found by service")
+        if not view.is_full:
+            return JSONResponse(content=view.dump(course_orm))
 
         # --- Start Manual Pydantic Validation for Debugging ---
         print(f"DEBUG [Endpoint]: ORM Course object Name: {course_orm.name}")
@@ -101,6 +118,7 @@ async def get_course_details(
     "",
     response_model=CourseOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(deps.rate_limit("course_create"))],
     summary="Create a new course"
 )
 async def create_new_course(
@@ -131,6 +149,7 @@ async def create_new_course(
     "/enroll",
     response_model=UserCourseOut, # Schema for the association link
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(deps.rate_limit("course_enroll"))],
     summary="Enroll a user in a course"
 )
 async def enroll_user_in_course_endpoint( # Renamed to avoid conflict
@@ -155,4 +174,147 @@ async def enroll_user_in_course_endpoint( # Renamed to avoid conflict
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while enrolling the user."
-        )
\ No newline at end of file
+        )
+
+@router.delete(
+    "/{course_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=None,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobOut, "description": "Deletion queued as a background job"}},
+    summary="Delete a course with its modules, units and enrollments"
+)
+async def delete_course_endpoint(
+    course_id: uuid.UUID,
+    background: bool = False,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(deps.get_current_active_user)
+):
+    """
+    Delete a course. Only a teacher of the course may do this.
+    Large courses are removed in chunks, each in its own short transaction.
+    With `?background=true` the deletion runs as a background job: the response is
+    202 with the job, to be polled at GET /jobs/{job_id}.
+    """
+    if background:
+        job = await course_service.enqueue_course_delete(db, course_id=course_id, current_user=current_user)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(JobOut.model_validate(job)))
+    await course_service.delete_course(db, course_id=course_id, current_user=current_user)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.post(
+    "/{course_id}/clone",
+    response_model=CourseOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(deps.rate_limit("course_create"))],
+    summary="Clone a course with its modules and units"
+)
+async def clone_course_endpoint(
+    course_id: uuid.UUID,
+    clone_in: CourseClone,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(deps.get_current_active_user)
+):
+    """
+    Copy a course for a new term: modules and units are copied inside the database,
+    keeping their order. Teacher enrollments are copied unless `copy_teachers` is false;
+    the requesting user always becomes a teacher of the copy. Only a teacher of the
+    source course may clone it.
+    """
+    return await course_service.clone_course(db, course_id=course_id, clone_data=clone_in, current_user=current_user)
+
+@router.get(
+    "/{course_id}/export",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "application/gzip": {}}}},
+    summary="Export a course as JSON Lines"
+)
+async def export_course_endpoint(
+    course_id: uuid.UUID,
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(deps.get_current_active_user)
+):
+    """
+    Stream the course, its modules and its units as JSON Lines (one record per line),
+    read from server-side cursors so memory use does not depend on the course size.
+    `?gzip=true` compresses the stream on the fly. Only teachers of the course may export it.
+    """
+    await course_service.authorize_course_export(db, course_id=course_id, current_user=current_user)
+    filename = f"course-{course_id}.jsonl" + (".gz" if gzip else "")
+    return StreamingResponse(
+        course_transfer_service.export_stream(course_id=course_id, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post(
+    "/import",
+    response_model=CourseOut,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"content": {"application/x-ndjson": {}, "application/gzip": {}}, "required": True}},
+    dependencies=[Depends(deps.rate_limit("course_create"))],
+    summary="Import a course from a JSON Lines export"
+)
+async def import_course_endpoint(
+    request: Request,
+    name: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(deps.get_current_active_user)
+):
+    """
+    Create a new course from the body of a `/export` download (plain or gzip-compressed),
+    read incrementally and inserted in batches within one transaction. New ids are
+    assigned; the importing user becomes the course's teacher. `?name=` overrides the name.
+    """
+    return await course_transfer_service.import_stream(
+        db, chunks=request.stream(), creator=current_user, name=name
+    )
+
+@router.get("/{course_id}/roster", response_model=List[UserForCourseResponse], summary="List the members of a course")
+async def get_course_roster_endpoint(
+    course_id: uuid.UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity),
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False
+):
+    """
+    One page of the course's members with their roles (teachers first, then by name).
+    With `include_total`, the member count is returned in X-Total-Count; X-Total-Count-Exact
+    is "false" when it is an estimate. Only members of the course may view it.
+    """
+    members, total = await course_service.get_course_roster(
+        db, course_id=course_id, current_user=current_user, skip=skip, limit=limit, include_total=include_total
+    )
+    if total is not None:
+        deps.set_total_count_headers(response, *total)
+    return members
+
+@router.get("/{course_id}/progress", response_model=List[UnitProgressOut], summary="Get my progress in a course")
+async def get_my_course_progress(
+    course_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    The authenticated user's progress on each unit of the course they have opened or completed.
+    """
+    return await progress_service.get_course_progress_for_user(db, course_id=course_id, user=current_user)
+
+@router.get("/{course_id}/analytics", response_model=CourseAnalyticsOut, summary="Get class-wide completion for a course")
+async def get_course_analytics_endpoint(
+    course_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity),
+    skip: int = 0,
+    limit: int = 100
+):
+    """
+    Completion of the course and of each module across all enrolled students, plus one
+    page (`skip` / `limit`, by name) of per-student completion. Only teachers of the course may view it.
+    """
+    return await course_service.get_course_analytics(
+        db, course_id=course_id, current_user=current_user, skip=skip, limit=limit
+    )
@@ -0,0 +1,49 @@
+# backend/app/api/v1/endpoints/events.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from typing import List, Optional
+
+from app.db.session import get_db_session # Async DB session
+from app.models.user import User as UserModel # SQLAlchemy User model
+from app.schemas.user_schemas import CurrentIdentity # Token identity snapshot
+from app.api import deps # API dependencies
+from app.crud.crud_course import crud_course # Enrollment lookup
+from app.services.course_events import course_events # SSE fan-out
+
+router = APIRouter()
+
+@router.get(
+    "/courses",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+    summary="Stream real-time events for my courses (Server-Sent Events)"
+)
+async def stream_course_events(
+    course_id: Optional[List[uuid.UUID]] = Query(None, description="Courses to follow; all enrolled courses if omitted"),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    Long-lived `text/event-stream` of events (`enrollment.created`, `course.updated`,
+    `course.deleted`, `resync`) for courses the user is enrolled in. Use it with
+    `EventSource` and refetch the course when an event arrives instead of polling.
+    Enrollment is checked when the stream opens; reconnect to pick up new enrollments.
+    At the per-worker stream limit the request gets 503, or, if the limit was reached
+    while it was being checked, an `unavailable` event after which the stream ends.
+    """
+    if course_events.subscriber_count >= course_events.max_connections:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many event streams; retry later.")
+    enrolled = set(await crud_course.get_enrolled_course_ids(db, user_id=current_user.id))
+    if course_id:
+        if not set(course_id) <= enrolled:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You are not enrolled in every requested course.")
+        enrolled = set(course_id)
+    # The request's session is released before the stream starts; the stream itself holds no DB connection.
+    # It subscribes when it starts (and re-checks the limit then: the check above is only a fast path).
+    return StreamingResponse(
+        course_events.stream(user_id=current_user.id, course_ids=enrolled),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}, # No proxy buffering (nginx)
+    )
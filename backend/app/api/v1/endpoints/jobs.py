@@ -0,0 +1,26 @@
+# backend/app/api/v1/endpoints/jobs.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+
+from app.db.session import get_db_session # Async DB session
+from app.models.user import User as UserModel # SQLAlchemy User model
+from app.schemas.user_schemas import CurrentIdentity # Token identity snapshot
+from app.schemas.job_schemas import JobOut # Pydantic schemas
+from app.api import deps # API dependencies
+from app.services.job_service import job_service # Job service layer
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=JobOut, summary="Get the status of a background job")
+async def get_job_status(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    Poll a background job started by the authenticated user.
+    `status` moves queued -> running -> succeeded / failed; `progress` goes from 0.0 to 1.0.
+    Failed attempts are retried automatically while `attempts` < `max_attempts`.
+    """
+    return await job_service.get_job_for_user(db, job_id=job_id, user=current_user)
@@ -0,0 +1,50 @@
+# backend/app/api/v1/endpoints/submissions.py
+from fastapi import APIRouter, Depends, Header, Path, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+
+from app.db.session import get_db_session # Async DB session
+from app.schemas.user_schemas import CurrentIdentity # Token identity snapshot
+from app.schemas.submission_schemas import SubmissionOut # Pydantic schemas
+from app.api import deps # API dependencies
+from app.services.submission_service import submission_service # Submission service layer
+
+router = APIRouter()
+
+@router.get("/{submission_id}", response_model=SubmissionOut, summary="Get a submission and its upload state")
+async def get_submission(
+    submission_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    Poll or resume an upload: continue with chunk `next_chunk`. `chunk_checksums` lists the
+    SHA-256 of every chunk the server has, to compare with the local file.
+    """
+    return await submission_service.get_submission_for_user(db, submission_id=submission_id, user=current_user)
+
+@router.put(
+    "/{submission_id}/chunks/{index}",
+    response_model=SubmissionOut,
+    openapi_extra={"requestBody": {"content": {"application/octet-stream": {}}, "required": True}},
+    summary="Upload one chunk of a submission"
+)
+async def upload_submission_chunk(
+    request: Request,
+    submission_id: uuid.UUID,
+    index: int = Path(..., ge=0),
+    x_chunk_sha256: str = Header(..., description="SHA-256 (hex) of the chunk body"),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    Send chunk `index` (bytes `index * chunk_size` up to the next chunk, or the end of the
+    file) as the raw request body, streamed to disk as it arrives, with its SHA-256 (hex) in
+    the `X-Chunk-SHA256` header; a body that does not match it is rejected. Chunks go in order;
+    retrying an acknowledged chunk is safe. The submission is complete when the last chunk
+    is stored: `completed` is true and `sha256` is the digest of the whole file.
+    """
+    return await submission_service.upload_chunk(
+        db, submission_id=submission_id, index=index, checksum=x_chunk_sha256,
+        chunks=request.stream(), user=current_user
+    )
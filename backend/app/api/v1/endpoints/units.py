@@ -0,0 +1,62 @@
+# backend/app/api/v1/endpoints/units.py
+from typing import List
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db_session # Async DB session
+from app.models.user import User as UserModel # SQLAlchemy User model
+from app.schemas.user_schemas import CurrentIdentity # Token identity snapshot
+from app.schemas.progress_schemas import ProgressEventIn # Pydantic schemas
+from app.schemas.submission_schemas import SubmissionCreate, SubmissionOut
+from app.api import deps # API dependencies
+from app.services.progress_service import progress_service # Progress service layer
+from app.services.submission_service import submission_service # Submission service layer
+
+router = APIRouter()
+
+@router.post(
+    "/{unit_id}/progress",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Record a progress event (opened / completed) for a unit"
+)
+async def record_unit_progress(
+    unit_id: int,
+    event_in: ProgressEventIn,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(deps.get_current_active_user)
+):
+    """
+    Record that the authenticated user opened or completed a unit of one of their courses.
+    Accepted immediately and written in the next batched flush (within a few seconds).
+    """
+    await progress_service.record_event(db, unit_id=unit_id, event=event_in.event, user=current_user)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+@router.post(
+    "/{unit_id}/submissions",
+    response_model=SubmissionOut,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a submission (chunked upload) for an assignment unit"
+)
+async def start_unit_submission(
+    unit_id: int,
+    submission_in: SubmissionCreate,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """
+    Declare the file to submit for an assignment unit of one of your courses. Upload it
+    with `PUT /submissions/{id}/chunks/{index}` in `chunk_size` pieces, starting at chunk 0,
+    each with its SHA-256 (hex) in the `X-Chunk-SHA256` header.
+    """
+    return await submission_service.start_submission(db, unit_id=unit_id, submission_in=submission_in, user=current_user)
+
+@router.get("/{unit_id}/submissions", response_model=List[SubmissionOut], summary="List my submissions for a unit")
+async def list_my_unit_submissions(
+    unit_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentIdentity = Depends(deps.get_current_identity)
+):
+    """Your submissions for the unit, newest first, including uploads still in progress."""
+    return await submission_service.list_submissions_for_user(db, unit_id=unit_id, user=current_user)
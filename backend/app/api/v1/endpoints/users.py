@@ -1,11 +1,11 @@
 # backend/app/api/v1/endpoints/users.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app.db.session import get_db_session
 from app.models.user import User as UserModel
-from app.schemas.user_schemas import UserOut, UserUpdate 
+from app.schemas.user_schemas import CurrentIdentity, UserOut, UserUpdate
 from app.api import deps
 from app.services.user_service import user_service
 # from app.models.enums import UserRoleEnum # If using for role checks
@@ -18,7 +18,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserOut, summary="Get current user")
 async def read_users_me(
-    current_user: UserModel = Depends(deps.get_current_active_user)
+    current_user: CurrentIdentity = Depends(deps.get_current_identity) # From the token; no user row loaded
 ):
     print(f"DEBUG: GET /api/v1/users/me endpoint hit by user: {current_user.email if current_user else 'None'}")
     return current_user
@@ -75,13 +75,17 @@ async def update_user_profile_endpoint(
 @router.get("", response_model=List[UserOut], summary="List all users (Admin Only - Placeholder)")
 # @router.get("/", response_model=List[UserOut], include_in_schema=False) # Alias
 async def list_all_users(
+    response: Response,
     db: AsyncSession = Depends(get_db_session),
     current_user: UserModel = Depends(deps.get_current_active_user), # For authorization
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    include_total: bool = False
 ):
     """
     Retrieve a list of all users.
+    With `include_total`, the total is returned in X-Total-Count; X-Total-Count-Exact is "false"
+    when it is an estimate (more than LIST_TOTAL_EXACT_THRESHOLD users).
     **Note: This endpoint should be strictly protected and accessible only by administrators.**
     The authorization logic is currently a placeholder in the service.
     """
@@ -93,6 +97,9 @@ async def list_all_users(
 
     try:
         users = await user_service.get_all_users(db, current_user=current_user, skip=skip, limit=limit)
+        if include_total:
+            total, is_exact = await user_service.count_all_users(db, current_user=current_user)
+            deps.set_total_count_headers(response, total, is_exact)
         return users
     except HTTPException:
         raise
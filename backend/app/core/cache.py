@@ -0,0 +1,372 @@
+# backend/app/core/cache.py
+"""
+Shared read cache with invalidation across workers.
+
+One `Cache` is used by the whole app (see `get_cache()`); the CRUD layer caches
+rows read by primary key (CRUDBase.cache_ttl, e.g. the current user on every
+request) and invalidates them after its writes commit. Values are JSON-compatible
+and stored as JSON text, so any backend can hold them.
+
+Backends (CACHE_BACKEND):
+    memory - a per-process TTL + LRU map
+    redis  - one shared copy in a Redis-protocol server (Redis, Valkey, ...), optionally
+             fronted by a short-lived per-process near cache (CACHE_NEAR_TTL_SECONDS)
+
+Invalidation: `invalidate(keys)` deletes from the backend and broadcasts the keys on
+CACHE_INVALIDATION_CHANNEL, over Postgres NOTIFY or Redis pub/sub
+(CACHE_INVALIDATION_TRANSPORT). Every process (the sender included) listens and drops
+the keys from its own in-process tier. The in-process tier is only filled while the
+listener is connected and is cleared whenever it (re)connects, so a missed broadcast
+cannot leave a stale copy behind; a fill racing with an invalidation is discarded
+(see `generation`). TTLs bound whatever is left, e.g. a broadcast lost in flight.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+
+from app.core import metrics
+from app.core.config import settings
+
+_MAX_NOTIFY_BYTES = 7900 # pg_notify payloads must stay under 8000 bytes
+
+
+def _metric_name(key: str) -> str:
+    return f"shared_{key.partition(':')[0]}" # "users:42" -> shared_users
+
+
+class InMemoryCacheBackend:
+    """Per-process entries with a TTL each; the least recently used are evicted past `max_entries`."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict() # key -> (expires at (monotonic), JSON)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        now = time.monotonic()
+        found: List[Optional[str]] = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                found.append(None)
+            else:
+                self._entries.move_to_end(key)
+                found.append(entry[1])
+        return found
+
+    async def set_many(self, items: Dict[str, str], ttl: float) -> None:
+        expires_at = time.monotonic() + ttl
+        for key, value in items.items():
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        self.discard(keys)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Entries in a Redis-protocol server, shared by every worker: MGET for reads, one pipeline for writes."""
+
+    def __init__(self, client: Any, prefix: str = "lms:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        values = await self.client.mget([self.prefix + key for key in keys])
+        return [value.decode("utf-8") if isinstance(value, bytes) else value for value in values]
+
+    async def set_many(self, items: Dict[str, str], ttl: float) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+        await pipe.execute()
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            await self.client.delete(*keys)
+
+
+class PostgresInvalidationTransport:
+    """Broadcasts invalidated keys with pg_notify; LISTENs on a dedicated pooled connection."""
+
+    def __init__(self, channel: str, heartbeat_seconds: float = 15.0):
+        self.channel = channel
+        self.heartbeat_seconds = heartbeat_seconds
+
+    async def publish(self, keys: List[str]) -> None:
+        from app.db.session import async_engine # The cache module is imported by the CRUD layer; keep the engine import lazy
+        async with async_engine.connect() as conn:
+            for payload in _notify_payloads(keys):
+                await conn.execute(select(func.pg_notify(self.channel, payload)))
+            await conn.commit()
+
+    async def listen(self, on_keys: Callable[[List[str]], None], on_connected: Callable[[], None]) -> None:
+        """Returns (raises) when the connection is lost; the caller reconnects."""
+        from app.db.session import async_engine
+
+        def on_notify(connection, pid, channel, payload) -> None:
+            on_keys(json.loads(payload))
+
+        async with async_engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection # asyncpg.Connection
+            lost = asyncio.Event()
+            driver.add_termination_listener(lambda _conn: lost.set())
+            await driver.add_listener(self.channel, on_notify)
+            on_connected()
+            try:
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=self.heartbeat_seconds)
+                    except asyncio.TimeoutError:
+                        await asyncio.wait_for(driver.execute("SELECT 1"), timeout=self.heartbeat_seconds)
+            finally:
+                if not driver.is_closed():
+                    await driver.remove_listener(self.channel, on_notify)
+        raise ConnectionError("invalidation listener connection lost")
+
+
+class RedisInvalidationTransport:
+    """Broadcasts invalidated keys with Redis PUBLISH; SUBSCRIBEs on its own pub/sub connection."""
+
+    def __init__(self, client: Any, channel: str, heartbeat_seconds: float = 15.0):
+        self.client = client
+        self.channel = channel
+        self.heartbeat_seconds = heartbeat_seconds
+
+    async def publish(self, keys: List[str]) -> None:
+        await self.client.publish(self.channel, json.dumps(keys))
+
+    async def listen(self, on_keys: Callable[[List[str]], None], on_connected: Callable[[], None]) -> None:
+        pubsub = self.client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            on_connected()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.heartbeat_seconds)
+                if message is None:
+                    await pubsub.ping() # Surfaces a dead connection while the channel is quiet
+                elif message["type"] == "message":
+                    on_keys(json.loads(message["data"]))
+        finally:
+            await pubsub.aclose()
+
+
+def _notify_payloads(keys: List[str]) -> Iterable[str]:
+    """JSON key lists, each small enough for one NOTIFY."""
+    batch: List[str] = []
+    size = 2
+    for key in keys:
+        if batch and size + len(key.encode("utf-8")) + 4 > _MAX_NOTIFY_BYTES:
+            yield json.dumps(batch)
+            batch, size = [], 2
+        batch.append(key)
+        size += len(key.encode("utf-8")) + 4
+    if batch:
+        yield json.dumps(batch)
+
+
+class Cache:
+    def __init__(
+        self,
+        backend: Any,
+        *,
+        transport: Any = None,
+        near_cache: Optional[InMemoryCacheBackend] = None,
+        near_ttl: float = 0.0,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.transport = transport
+        self.near_cache = near_cache # Only in front of a shared backend
+        self.near_ttl = near_ttl
+        self.enabled = enabled
+        # The tier that lives in this process and must be dropped on broadcasts.
+        self._local = backend if isinstance(backend, InMemoryCacheBackend) else near_cache
+        self._generation = 0 # Bumped on every invalidation seen by this process
+        self._listening = False
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def generation(self) -> int:
+        """Read before loading what will be cached; `set_many(..., generation=...)` skips the fill if it changed."""
+        return self._generation
+
+    @property
+    def _local_fill_allowed(self) -> bool:
+        # Without a connected listener this process would miss other workers' invalidations.
+        return self.transport is None or self._listening
+
+    # --- Reads and fills ---
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Decoded values of the keys that are cached; misses are left out. Backend errors count as misses."""
+        if not self.enabled or not keys:
+            return {}
+        found: Dict[str, Any] = {}
+        remaining = list(keys)
+        try:
+            if self.near_cache is not None:
+                for key, value in zip(remaining, await self.near_cache.get_many(remaining)):
+                    if value is not None:
+                        found[key] = json.loads(value)
+                remaining = [key for key in remaining if key not in found]
+            if remaining:
+                shared = await self.backend.get_many(remaining)
+                near_fill = {}
+                for key, value in zip(remaining, shared):
+                    if value is not None:
+                        found[key] = json.loads(value)
+                        near_fill[key] = value
+                if near_fill and self.near_cache is not None and self._local_fill_allowed:
+                    await self.near_cache.set_many(near_fill, self.near_ttl)
+        except Exception as e:
+            print(f"ERROR: Cache read failed, treating {len(keys)} keys as misses: {e}")
+            metrics.CACHE_ERRORS.labels("get").inc()
+        for key in keys:
+            metrics.record_cache_access(_metric_name(key), key in found)
+        return found
+
+    async def set_many(self, items: Dict[str, Any], ttl: float, *, generation: Optional[int] = None) -> None:
+        if not self.enabled or not items:
+            return
+        if generation is not None and generation != self._generation:
+            return # An invalidation arrived while the values were being read; they may be stale
+        if self.backend is self._local and not self._local_fill_allowed:
+            return
+        encoded = {key: json.dumps(value, separators=(",", ":")) for key, value in items.items()}
+        try:
+            await self.backend.set_many(encoded, ttl)
+            if self.near_cache is not None and self._local_fill_allowed:
+                await self.near_cache.set_many(encoded, min(ttl, self.near_ttl))
+        except Exception as e:
+            print(f"ERROR: Cache write failed for {len(items)} keys: {e}")
+            metrics.CACHE_ERRORS.labels("set").inc()
+
+    # --- Invalidation ---
+
+    async def invalidate(self, keys: Iterable[str]) -> None:
+        """
+        Drops the keys here, from the shared backend and (by broadcast) from every other
+        process. Call it after the write is committed. Never raises; failures are logged.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not self.enabled or not keys:
+            return
+        self._drop_local(keys)
+        try:
+            if self.backend is not self._local:
+                await self.backend.delete_many(keys)
+        except Exception as e:
+            print(f"ERROR: Could not delete {len(keys)} keys from the shared cache (stale until their TTL): {e}")
+            metrics.CACHE_ERRORS.labels("delete").inc()
+        if self.transport is None or self._local is None:
+            return
+        try:
+            await self.transport.publish(keys)
+            metrics.CACHE_INVALIDATIONS.labels("sent").inc(len(keys))
+        except Exception as e:
+            print(f"ERROR: Could not broadcast invalidation of {len(keys)} cache keys: {e}")
+            metrics.CACHE_ERRORS.labels("publish").inc()
+
+    def _drop_local(self, keys: Iterable[str]) -> None:
+        self._generation += 1
+        if self._local is not None:
+            self._local.discard(keys)
+
+    def _on_invalidated(self, keys: List[str]) -> None:
+        self._drop_local(keys)
+        metrics.CACHE_INVALIDATIONS.labels("received").inc(len(keys))
+
+    def _on_connected(self) -> None:
+        # Anything could have been invalidated while we were not listening.
+        self._generation += 1
+        if self._local is not None:
+            self._local.clear()
+        self._listening = True
+        print(f"Cache: listening for invalidations on {type(self.transport).__name__} channel {self.transport.channel!r}.")
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self.transport.listen(self._on_invalidated, self._on_connected)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._listening:
+                    delay = 1.0
+                print(f"ERROR: Cache invalidation listener failed, retrying in {delay:.0f}s: {e}")
+            finally:
+                self._listening = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        if self.enabled and self.transport is not None and self._local is not None:
+            self._listener = asyncio.create_task(self._listen(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self._listening = False
+
+
+_cache: Optional[Cache] = None
+
+
+def get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        near_cache = None
+        if settings.CACHE_BACKEND == "redis":
+            from app.core.redis_client import get_redis
+            backend: Any = RedisCacheBackend(get_redis())
+            if settings.CACHE_NEAR_TTL_SECONDS > 0:
+                near_cache = InMemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+        elif settings.CACHE_BACKEND == "memory":
+            backend = InMemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND {settings.CACHE_BACKEND!r} (memory, redis)")
+
+        if settings.CACHE_INVALIDATION_TRANSPORT == "postgres":
+            transport: Any = PostgresInvalidationTransport(settings.CACHE_INVALIDATION_CHANNEL)
+        elif settings.CACHE_INVALIDATION_TRANSPORT == "redis":
+            from app.core.redis_client import get_redis
+            transport = RedisInvalidationTransport(get_redis(), settings.CACHE_INVALIDATION_CHANNEL)
+        else:
+            raise ValueError(f"Unknown CACHE_INVALIDATION_TRANSPORT {settings.CACHE_INVALIDATION_TRANSPORT!r} (postgres, redis)")
+
+        _cache = Cache(
+            backend, transport=transport, near_cache=near_cache,
+            near_ttl=settings.CACHE_NEAR_TTL_SECONDS, enabled=settings.CACHE_ENABLED,
+        )
+    return _cache
+
+
+def set_cache(cache: Optional[Cache]) -> None:
+    """Replaces the cache (e.g. a RedisCacheBackend over a local stand-in in tests); None rebuilds from settings."""
+    global _cache
+    _cache = cache
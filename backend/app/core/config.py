@@ -44,11 +44,17 @@ class Settings(BaseSettings):
     # --- API Configuration ---
     API_V1_STR: str = "/api/v1"
     SHOW_DOCS: bool = True
+    BATCH_MAX_REQUESTS: int = 20 # Sub-requests accepted by one POST /batch
 
     # --- Security and JWT ---
     JWT_SECRET: str = "JWT_secert"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # Revoked tokens and "log out everywhere" epochs are checked in memory; each worker is
+    # updated over LISTEN/NOTIFY and re-reads recent changes as a safety net.
+    TOKEN_REVOCATION_CHANNEL: str = "lms_token_revocations"
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 30.0 # Longest a missed broadcast goes unnoticed
+    TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS: float = 60.0 # Re-read window for late-committing writes
 
     # --- Frontend URL ---
     FRONTEND_URL: Optional[AnyHttpUrl] = None
@@ -98,6 +104,19 @@ class Settings(BaseSettings):
 
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
+    DB_POOL_SIZE: int = 5 # Connections kept open by the pool
+    DB_MAX_OVERFLOW: int = 10 # Extra connections allowed under burst, closed when returned
+    # Per-connection LRU of asyncpg prepared statements kept by SQLAlchemy's asyncpg dialect.
+    # Sized to hold every distinct statement the app issues (default upstream is 100).
+    # Set to 0 behind PgBouncer in transaction-pooling mode, where prepared statements break.
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Rows removed per transaction by the set-based cascading deletes (users, courses):
+    # each chunk commits on its own so row locks and WAL bursts stay short.
+    DB_DELETE_CHUNK_SIZE: int = 5000
+    # Paginated lists report their total (X-Total-Count) exactly up to this many rows;
+    # past it the total is the planner's estimate and X-Total-Count-Exact is "false".
+    LIST_TOTAL_EXACT_THRESHOLD: int = 10000
+
     @model_validator(mode='after')
     def assemble_db_connection(self) -> 'Settings':
         if self.SQLALCHEMY_DATABASE_URI:
@@ -118,6 +137,105 @@ class Settings(BaseSettings):
     # --- Google OAuth ---
     GOOGLE_CLIENT_ID: Optional[str] = None
 
+    # --- Startup warm-up ---
+    # Opens pool connections, configures mappers and primes hot queries/schemas before /health reports ready.
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5 # Capped at DB_POOL_SIZE (overflow connections would be closed right away)
+    WARMUP_BLOCKING: bool = True # False: serve immediately, /health returns 503 until warm-up finishes
+
+    # --- Course export / import (JSON Lines) ---
+    COURSE_EXPORT_BATCH_SIZE: int = 500 # Rows fetched per server-side cursor round trip
+    COURSE_IMPORT_BATCH_SIZE: int = 1000 # Modules or units per batched INSERT
+    COURSE_IMPORT_MAX_LINE_BYTES: int = 8 * 1024 * 1024 # Longest accepted record (unit content included)
+
+    # --- Unit progress write-behind buffer ---
+    # Progress events are coalesced per (user, unit) in memory and upserted in batches.
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = 2.0
+    PROGRESS_FLUSH_THRESHOLD: int = 5000 # Pending (user, unit) pairs that trigger an early flush
+    PROGRESS_MAX_PENDING: int = 100_000 # Beyond this, recording waits for a flush (backpressure)
+
+    # --- Activity event log ---
+    # Learning activity events are queued in memory and appended to the monthly-partitioned
+    # activity_events table in batches; old partitions are dropped after the retention period.
+    ACTIVITY_LOG_ENABLED: bool = True
+    ACTIVITY_LOG_QUEUE_SIZE: int = 50_000 # Events held in memory before recording waits (backpressure)
+    ACTIVITY_LOG_BATCH_SIZE: int = 1000 # Events per INSERT transaction
+    ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0 # Longest an event waits for its batch to fill
+    ACTIVITY_LOG_ENQUEUE_TIMEOUT_SECONDS: float = 0.5 # Wait for room in a full queue, then drop the event
+    ACTIVITY_LOG_RETENTION_MONTHS: int = 13 # Full months kept before the current one
+    ACTIVITY_LOG_PREMAKE_MONTHS: int = 2 # Future monthly partitions created ahead of time
+    ACTIVITY_LOG_MAINTENANCE_INTERVAL_SECONDS: float = 3600
+
+    # --- Real-time course events (Server-Sent Events) ---
+    # Fan-out to subscribers in each worker; across workers via Postgres LISTEN/NOTIFY
+    # (the listener holds one connection of the pool).
+    COURSE_EVENTS_ENABLED: bool = True
+    COURSE_EVENTS_CHANNEL: str = "lms_course_events"
+    COURSE_EVENTS_HEARTBEAT_SECONDS: float = 15.0 # Keepalive comments on idle streams
+    COURSE_EVENTS_QUEUE_SIZE: int = 100 # Undelivered events per connection before it gets a `resync`
+    COURSE_EVENTS_MAX_CONNECTIONS: int = 5000 # Per worker; beyond this new streams get 503
+
+    # --- Rate limiting (token buckets, app/core/rate_limit.py) ---
+    # Limits are "N/period" (second, minute, hour, day): bursts of N, refilled at N per period,
+    # per authenticated user or, for anonymous requests, per client IP.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory" # "memory" (per worker) or "redis" (shared; see REDIS_URL)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False # Only behind a proxy that appends X-Forwarded-For
+    RATE_LIMIT_AUTH_GOOGLE: str = "10/minute" # POST /auth/google (token verification + user upsert)
+    RATE_LIMIT_COURSE_CREATE: str = "30/hour" # POST /courses, /courses/import, /courses/{id}/clone
+    RATE_LIMIT_COURSE_ENROLL: str = "120/minute" # POST /courses/enroll
+
+    # --- Redis (shared backends) ---
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1.0
+
+    # --- Shared cache (app/core/cache.py) ---
+    # Rows read by primary key (users, courses) are cached and invalidated in every worker
+    # after CRUD writes commit, by a broadcast over Postgres NOTIFY or Redis pub/sub.
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory" # "memory" (per worker) or "redis" (shared; see REDIS_URL)
+    CACHE_MAX_ENTRIES: int = 10_000 # Per process, for the memory backend and the near cache
+    CACHE_NEAR_TTL_SECONDS: float = 0 # redis backend: also keep a per-worker copy this long (0 = off)
+    CACHE_INVALIDATION_TRANSPORT: str = "postgres" # "postgres" (LISTEN/NOTIFY) or "redis" (pub/sub)
+    CACHE_INVALIDATION_CHANNEL: str = "lms_cache_invalidation"
+    CACHE_USER_TTL_SECONDS: float = 300 # Upper bound on staleness if a broadcast is lost
+    CACHE_COURSE_TTL_SECONDS: float = 300
+
+    # --- Assignment submissions (resumable chunked uploads) ---
+    # Files are streamed to local disk chunk by chunk (never held whole in memory); an
+    # interrupted upload resumes at the first chunk the server has not acknowledged.
+    SUBMISSIONS_DIR: str = "data/submissions"
+    SUBMISSION_CHUNK_SIZE: int = 5 * 1024 * 1024 # Fixed per submission when its upload starts
+    SUBMISSION_MAX_BYTES: int = 100 * 1024 * 1024
+
+    # --- Background jobs ---
+    # In-process asyncio workers (started from the lifespan) that claim rows from the jobs
+    # table with SKIP LOCKED, so several app instances share the queue.
+    JOBS_ENABLED: bool = True
+    JOBS_CONCURRENCY: int = 2 # Worker tasks per process
+    JOBS_POLL_INTERVAL_SECONDS: float = 2.0 # Idle polling; jobs enqueued in-process wake a worker at once
+    JOBS_LEASE_SECONDS: int = 60 # A running job not heartbeated for this long is reclaimed
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_BACKOFF_SECONDS: float = 5.0 # Doubled after every failed attempt
+    JOBS_SHUTDOWN_GRACE_SECONDS: float = 10.0 # Running jobs past this are re-queued on shutdown
+
+    # --- Observability ---
+    # Per-request SQL statement counting, Server-Timing headers and N+1 warnings.
+    # Off by default; set SQL_INSTRUMENTATION_ENABLED=True for benchmarks and profiling.
+    SQL_INSTRUMENTATION_ENABLED: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 3 # Same statement this many times in one request is flagged
+    # Prometheus text-format /metrics endpoint (route latency, pool waits, statement counts, caches).
+    METRICS_ENABLED: bool = True
+    # Slow-query log: statements slower than the threshold are logged (parameters redacted)
+    # and, for reads, an EXPLAIN (ANALYZE, BUFFERS) plan is captured to a rotating file. 0 disables.
+    SLOW_QUERY_THRESHOLD_MS: float = 0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 30_000
+    SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS: float = 300 # Per distinct statement
+    SLOW_QUERY_PLAN_FILE: str = "logs/slow_query_plans.log"
+    SLOW_QUERY_PLAN_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_PLAN_FILE_BACKUPS: int = 5
+
     model_config = SettingsConfigDict(
         env_file=effective_env_files,
         env_file_encoding='utf-8',
@@ -0,0 +1,273 @@
+# backend/app/core/metrics.py
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format (0.0.4).
+
+Kept dependency-free and cheap on the hot path: every labelled series is a small
+object looked up by a tuple key, updates are plain attribute arithmetic (the app
+runs on a single event loop per worker), and cumulative histogram buckets are
+only computed at scrape time. Each uvicorn worker keeps its own registry; scrape
+every worker (or aggregate per instance) the same way as any multi-process app.
+"""
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1) # Last slot is the +Inf bucket
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Returns the series for these label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_label_str(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["Registry"] = None):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), child.counts):
+                cumulative += count
+                labels = _label_str(self.labelnames, values, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _label_str(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Callbacks run just before rendering, e.g. to sample pool sizes into gauges."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"ERROR: Metrics collector {collector!r} failed: {e}")
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- HTTP ---
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"))
+HTTP_REQUEST_DURATION = Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+HTTP_REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests currently being served.", ("method",))
+
+# --- Database ---
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed.")
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for (or opening) a pooled DB connection.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS = Gauge("db_pool_connections", "Pooled DB connections by state, sampled at scrape time.", ("state",))
+
+# --- Lifecycle ---
+APP_WARMUP_DURATION = Gauge("app_warmup_duration_seconds", "Duration of the startup warm-up, by phase.", ("phase",))
+
+# --- Background jobs ---
+JOBS_FINISHED = Counter("jobs_finished_total", "Background job attempts by kind and outcome (succeeded/retried/failed).", ("kind", "outcome"))
+JOB_DURATION = Histogram(
+    "job_duration_seconds", "Background job attempt duration by kind.", ("kind",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+JOBS_RUNNING = Gauge("jobs_running", "Background jobs currently running in this process.")
+
+# --- Unit progress (write-behind) ---
+PROGRESS_EVENTS = Counter("progress_events_total", "Unit progress events received, by event.", ("event",))
+PROGRESS_ROWS_FLUSHED = Counter("progress_rows_flushed_total", "Coalesced (user, unit) rows upserted by the write-behind buffer.")
+PROGRESS_FLUSH_DURATION = Histogram("progress_flush_duration_seconds", "Duration of write-behind progress flushes.")
+PROGRESS_PENDING = Gauge("progress_pending_entries", "Coalesced progress entries waiting to be flushed, sampled at scrape time.")
+
+# --- Activity event log ---
+ACTIVITY_EVENTS_WRITTEN = Counter("activity_events_written_total", "Activity events inserted into activity_events.")
+ACTIVITY_EVENTS_DROPPED = Counter("activity_events_dropped_total", "Activity events dropped because the queue stayed full.")
+ACTIVITY_BATCH_DURATION = Histogram("activity_batch_duration_seconds", "Duration of activity event batch inserts.")
+ACTIVITY_QUEUE_DEPTH = Gauge("activity_queue_depth", "Activity events waiting in the in-memory queue, sampled at scrape time.")
+
+# --- Real-time course events ---
+COURSE_EVENTS_PUBLISHED = Counter("course_events_published_total", "Course events published, by type.", ("type",))
+COURSE_EVENTS_DELIVERED = Counter("course_events_delivered_total", "Course event frames queued to subscribers in this process.")
+COURSE_EVENT_OVERFLOWS = Counter("course_event_overflows_total", "Subscribers that fell behind and were sent a resync.")
+COURSE_EVENT_SUBSCRIBERS = Gauge("course_event_subscribers", "Open course event streams, sampled at scrape time.")
+
+# --- Rate limiting ---
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected with 429, by limited route.", ("route",))
+RATE_LIMIT_BACKEND_ERRORS = Counter("rate_limit_backend_errors_total", "Rate limit checks that failed and let the request through.")
+
+# --- Token revocation ---
+TOKEN_REVOCATIONS = Counter("token_revocations_total", "Access tokens revoked, one token (logout) or all of a user's (logout-all).", ("kind",))
+REVOKED_TOKENS_REJECTED = Counter("revoked_tokens_rejected_total", "Requests presenting a revoked access token.")
+ACCESS_TOKENS_REFRESHED = Counter("access_tokens_refreshed_total", "Access tokens silently reissued because their identity snapshot was outdated.")
+IDENTITY_FROM_TOKEN = Counter("identity_resolutions_total", "Identity-only authentications, from the token snapshot or by loading the user.", ("source",))
+TOKEN_REVOCATION_LIST_SIZE = Gauge("token_revocation_list_entries", "Entries in this process's in-memory revocation list.", ("kind",))
+
+# --- Caches ---
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache name and result (hit/miss).", ("cache", "result"))
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Lifetime hit ratio per cache, computed at scrape time.", ("cache",))
+CACHE_INVALIDATIONS = Counter("cache_invalidations_total", "Shared cache keys invalidated, broadcast (sent) or applied from other processes (received).", ("direction",))
+CACHE_ERRORS = Counter("cache_errors_total", "Shared cache backend or broadcast failures by operation.", ("operation",))
+
+# --- Assignment submissions ---
+SUBMISSION_CHUNKS = Counter("submission_chunks_total", "Submission chunk uploads by result (stored, duplicate, rejected).", ("result",))
+SUBMISSION_BYTES = Counter("submission_bytes_total", "Bytes of submission chunks written to storage.")
+SUBMISSIONS_COMPLETED = Counter("submissions_completed_total", "Submission uploads completed.")
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """Every cache the app maintains reports its lookups here."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _collect_cache_hit_ratios() -> None:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), child in list(CACHE_REQUESTS._children.items()):
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        if result == "hit":
+            hits_and_total[0] += child.value
+        hits_and_total[1] += child.value
+    for cache, (hits, total) in totals.items():
+        CACHE_HIT_RATIO.labels(cache).set(hits / total if total else 0.0)
+
+
+REGISTRY.add_collector(_collect_cache_hit_ratios)
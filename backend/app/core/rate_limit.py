@@ -0,0 +1,150 @@
+# backend/app/core/rate_limit.py
+"""
+Token-bucket rate limiting.
+
+Every limited route has a limit "N/period" (RATE_LIMIT_<ROUTE> in Settings): a
+bucket holds up to N tokens, refills at N per period, and each request takes one.
+Buckets are keyed per authenticated user, or per client IP for anonymous requests
+(see app/api/deps.py:rate_limit), so a busy classroom behind one NAT address is not
+throttled as one client once signed in.
+
+Backends (RATE_LIMIT_BACKEND):
+    memory - per-process buckets; fine for a single instance (each worker limits separately)
+    redis  - one bucket per key shared by every worker and host, updated atomically by a Lua script
+"""
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int # Burst size
+    per_seconds: float # Time to refill a full bucket
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.per_seconds
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """'10/minute', '100/hour', '5/second', '1000/day'."""
+        count, _, period = value.strip().partition("/")
+        period = period.strip().lower().rstrip("s") or "second"
+        if not count.strip().isdigit() or int(count) < 1 or period not in _PERIODS:
+            raise ValueError(f"Invalid rate limit {value!r}; expected e.g. '10/minute'")
+        return cls(capacity=int(count), per_seconds=_PERIODS[period])
+
+
+class InMemoryRateLimitBackend:
+    """Per-process buckets; the least recently used are evicted past `max_keys` (a full bucket is the default anyway)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict() # key -> [tokens, last refill (monotonic)]
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(limit.capacity), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(limit.capacity), bucket[0] + (now - bucket[1]) * limit.refill_per_second)
+            bucket[1] = now
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return True, 0.0
+        return False, (cost - bucket[0]) / limit.refill_per_second
+
+
+# KEYS[1] bucket; ARGV capacity, refill per second, cost. Uses the server clock, so hosts need not agree on time.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets in a Redis-protocol server, shared by all workers; one round trip (EVALSHA) per check."""
+
+    def __init__(self, client: Any, prefix: str = "lms:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[self.prefix + key], args=[limit.capacity, limit.refill_per_second, cost]
+        )
+        return bool(int(allowed)), float(retry_after)
+
+
+class RateLimiter:
+    def __init__(self, backend: Any, limits: Dict[str, str]):
+        self.backend = backend
+        self.limits = {route: RateLimit.parse(value) for route, value in limits.items()}
+
+    async def check(self, route: str, key: str) -> Tuple[bool, float]:
+        """(allowed, seconds until a token is available). Unknown routes are not limited."""
+        limit = self.limits.get(route)
+        if limit is None:
+            return True, 0.0
+        return await self.backend.take(f"{route}:{key}", limit)
+
+    @staticmethod
+    def retry_after_header(seconds: float) -> str:
+        return str(max(1, math.ceil(seconds)))
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            from app.core.redis_client import get_redis
+            backend: Any = RedisRateLimitBackend(get_redis())
+        elif settings.RATE_LIMIT_BACKEND == "memory":
+            backend = InMemoryRateLimitBackend()
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r} (memory, redis)")
+        _limiter = RateLimiter(backend, {
+            "auth_google": settings.RATE_LIMIT_AUTH_GOOGLE,
+            "course_create": settings.RATE_LIMIT_COURSE_CREATE,
+            "course_enroll": settings.RATE_LIMIT_COURSE_ENROLL,
+        })
+    return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replaces the limiter (e.g. a RedisRateLimitBackend over a local stand-in in tests); None rebuilds from settings."""
+    global _limiter
+    _limiter = limiter
@@ -0,0 +1,38 @@
+# backend/app/core/redis_client.py
+"""
+Shared Redis-protocol client (Redis, Valkey, KeyDB, ...), created on first use.
+
+Only features that opt into a shared backend use it, so single-instance setups
+need no Redis server. `set_redis` swaps in another client implementing the
+redis.asyncio API (e.g. a local stand-in in tests).
+"""
+from typing import Any, Optional
+
+from app.core.config import settings
+
+_client: Optional[Any] = None
+
+
+def get_redis() -> Any:
+    global _client
+    if _client is None:
+        import redis.asyncio as redis # Imported lazily: only needed when a Redis backend is configured
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=30,
+        )
+    return _client
+
+
+def set_redis(client: Any) -> None:
+    global _client
+    _client = client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
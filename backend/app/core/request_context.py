@@ -0,0 +1,38 @@
+# backend/app/core/request_context.py
+"""
+Ambient access to the HTTP request currently being served.
+
+RequestContextMiddleware binds the ASGI scope to a ContextVar for the lifetime of
+each request, so code far from the endpoint (SQL event hooks, background loggers)
+can tell which route it is working for without threading the request through.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import Scope
+
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("lms_request_scope", default=None)
+
+
+def bind_scope(scope: Scope):
+    return _current_scope.set(scope)
+
+
+def reset_scope(token) -> None:
+    _current_scope.reset(token)
+
+
+def current_scope() -> Optional[Scope]:
+    return _current_scope.get()
+
+
+def current_route_label(default: str = "<no request>") -> str:
+    """
+    'METHOD /route/{template}' for the current request. The router stores the matched
+    route in the scope while dispatching, so the template is available inside endpoints.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return default
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', None) or scope.get('path', '')}".strip()
@@ -1,6 +1,7 @@
 # backend/app/core/security.py
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
+import uuid
 
 import jwt
 # from passlib.context import CryptContext
@@ -31,19 +32,41 @@ COOKIE_PATH = "/"
 COOKIE_DOMAIN = None # For localhost, None is correct. For production, set your domain if needed.
 
 
+def set_access_token_cookie(response: Any, access_token: str) -> None:
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=COOKIE_HTTPONLY,
+        secure=COOKIE_SECURE,
+        samesite=COOKIE_SAMESITE,
+        max_age=COOKIE_MAX_AGE,
+        path=COOKIE_PATH,
+        # domain=COOKIE_DOMAIN,
+    )
+
+
+def identity_claims(user: Any) -> Dict[str, Any]:
+    """The signed identity snapshot carried by access tokens (see deps.get_current_identity)."""
+    return {"email": user.email, "name": user.name, "ver": user.token_version}
+
+
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any], expires_delta: Optional[timedelta] = None, identity: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     Generates a JWT access token.
+    `jti` identifies the token for server-side logout; `iat` (with sub-second precision)
+    is compared with the user's "log out everywhere" epoch (app/services/token_revocation.py).
+    `identity` (see identity_claims) lets identity-only endpoints skip loading the user.
     """
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
+        expire = now + timedelta(
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex, "sub": str(subject), **(identity or {})}
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,103 @@
+# backend/app/core/warmup.py
+"""
+Startup warm-up, run from the application lifespan before the app reports ready.
+
+Pays the one-off costs that would otherwise land on the first requests after a
+deploy or a cold start: opening pool connections, configuring the ORM mappers,
+compiling (and asyncpg-preparing) the hot queries, and exercising the response
+schemas, including their from-ORM validation paths.
+"""
+import asyncio
+import time
+import uuid
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from app.core import metrics
+from app.crud.crud_course import crud_course
+from app.crud.crud_user import crud_user
+from app.db.session import AsyncSessionLocal
+from app.models.course import Course as CourseModel
+from app.models.enums import UnitTypeEnum, UserCourseRoleEnum
+from app.models.module_model import Module as ModuleModel
+from app.models.unit import Unit as UnitModel
+from app.models.user import User as UserModel
+from app.models.user_course import UserCourse as UserCourseModel
+from app.schemas import CourseOut, UserCourseOut, UserOut
+
+
+def exercise_schemas() -> None:
+    """Validates and serializes a representative ORM object graph through the hot response schemas."""
+    user = UserModel(id=0, google_sub="warmup", email="warmup@example.com", name="Warm Up")
+    course = CourseModel(id=uuid.UUID(int=0), name="Warm-up course", description=None)
+    course.user_associations = [UserCourseModel(user_id=0, course_id=course.id, role=UserCourseRoleEnum.teacher, user=user)]
+    module = ModuleModel(id=0, title="Module", description=None, order=0, course_id=course.id)
+    module.units = [UnitModel(id=0, title="Unit", unit_type=UnitTypeEnum.MATERIAL, content="", order=0, module_id=0)]
+    course.modules = [module]
+
+    CourseOut.model_validate(course).model_dump_json()
+    UserOut.model_validate(user).model_dump_json()
+    UserCourseOut.model_validate(course.user_associations[0]).model_dump_json()
+
+
+async def exercise_hot_queries(db: AsyncSession) -> None:
+    """Runs the per-request queries against ids that cannot exist, priming SQLAlchemy's compiled cache."""
+    await crud_user.get(db, record_id=0)
+    await crud_course.get_multi_for_user(db, user_id=0, limit=1)
+    await crud_course.get_with_details(db, course_uuid=uuid.UUID(int=0))
+
+
+async def warm_connections(engine: AsyncEngine, count: int) -> None:
+    """
+    Checks out `count` connections at once (so the pool really grows to that size) and
+    runs the hot queries on each: asyncpg prepares statements per connection, so every
+    pooled connection gets its own prepared copy before real traffic arrives.
+    If some connections fail to open or warm, the others are still warmed; every opened
+    connection is returned to the pool, then the first error is raised.
+    """
+    if count <= 0:
+        async with AsyncSessionLocal() as db:
+            await exercise_hot_queries(db)
+        return
+
+    async def warm(conn: AsyncConnection) -> None:
+        await conn.execute(text("SELECT 1"))
+        async with AsyncSession(bind=conn, expire_on_commit=False, autoflush=False) as db:
+            await exercise_hot_queries(db)
+
+    opened = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+    connections = [conn for conn in opened if not isinstance(conn, BaseException)]
+    try:
+        warmed = await asyncio.gather(*(warm(conn) for conn in connections), return_exceptions=True)
+    finally:
+        closed = await asyncio.gather(*(conn.close() for conn in connections), return_exceptions=True)
+    errors = [result for result in (*opened, *warmed, *closed) if isinstance(result, BaseException)]
+    if errors:
+        print(f"ERROR: Warm-up: {len(errors)} error(s) warming {count} connections; first: {errors[0]!r}")
+        raise errors[0]
+
+
+async def run_warmup(engine: AsyncEngine, *, db_connections: int) -> Dict[str, float]:
+    """Returns the duration of each phase in seconds (plus 'total')."""
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    phase_started = time.perf_counter()
+    configure_mappers()
+    timings["mappers"] = time.perf_counter() - phase_started
+
+    phase_started = time.perf_counter()
+    exercise_schemas()
+    timings["schemas"] = time.perf_counter() - phase_started
+
+    phase_started = time.perf_counter()
+    await warm_connections(engine, db_connections)
+    timings["db"] = time.perf_counter() - phase_started
+
+    timings["total"] = time.perf_counter() - started
+    for phase, seconds in timings.items():
+        metrics.APP_WARMUP_DURATION.labels(phase).set(seconds)
+    return timings
@@ -1,29 +1,145 @@
 # backend/app/crud/base_crud.py
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
+import datetime
+import decimal
+import enum
 import traceback
+import uuid
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel as PydanticBaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, Select, bindparam, column, delete, func, insert, inspect as sa_inspect, text, tuple_, update, values
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import get_cache
+from app.crud.batch_loader import get_loader
 from app.models.base_class import Base as SABase
 
 ModelType = TypeVar("ModelType", bound=SABase)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=PydanticBaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=PydanticBaseModel)
 
+# Rows per statement for the bulk methods. Also capped so a chunk never exceeds
+# PostgreSQL's 32767 bind parameters per statement.
+BULK_CHUNK_SIZE = 1000
+MAX_BIND_PARAMS = 32767
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def delete_where_in_chunks(db: AsyncSession, model: Type[SABase], *criteria: Any, chunk_size: int) -> int:
+    """
+    Deletes every `model` row matching `criteria`, at most `chunk_size` rows per
+    statement, committing after each chunk so no single transaction holds many row
+    locks for long. Runs set-based in the database (nothing is loaded into the
+    session) and returns the number of rows deleted.
+    """
+    primary_key = sa_inspect(model).primary_key
+    victims = select(*primary_key).where(*criteria).limit(chunk_size)
+    condition = primary_key[0].in_(victims) if len(primary_key) == 1 else tuple_(*primary_key).in_(victims)
+    stmt = delete(model).where(condition).execution_options(synchronize_session=False)
+    total = 0
+    while True:
+        result = await db.execute(stmt)
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < chunk_size:
+            return total
+
+def _cache_decoder(sa_column: Any) -> Optional[Callable[[Any], Any]]:
+    """Turns a column's JSON-encoded value (see jsonable_encoder) back into its Python type."""
+    try:
+        python_type = sa_column.type.python_type
+    except NotImplementedError:
+        return None
+    if issubclass(python_type, enum.Enum):
+        return python_type
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat
+    if python_type in (uuid.UUID, decimal.Decimal):
+        return python_type
+    return None
+
+
+async def count_rows(
+    db: AsyncSession, stmt: Select, *, exact_threshold: int, table: Optional[str] = None
+) -> Tuple[int, bool]:
+    """
+    Total rows of `stmt` for list endpoints, as (total, is_exact). Counting stops after
+    `exact_threshold` + 1 rows, so totals up to the threshold are exact and cost at most
+    that many rows. Past it the total is estimated: for a whole table (`table`, unfiltered)
+    from pg_class.reltuples, otherwise from the planner's row estimate for `stmt`. Either
+    way the estimate is only as fresh as the table's last ANALYZE.
+    """
+    bounded = select(func.count()).select_from(stmt.limit(exact_threshold + 1).subquery())
+    counted = (await db.execute(bounded)).scalar_one()
+    if counted <= exact_threshold:
+        return counted, True
+    estimate = -1
+    if table is not None:
+        estimate = (await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        )).scalar_one_or_none() or -1 # -1: never analyzed
+    if estimate < 0:
+        # Literal binds: EXPLAIN has no bind parameters. Only ids and enums reach here, never user text.
+        sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+    return max(estimate, counted), False # Never below what was actually counted
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Seconds to keep rows read through load()/load_many() in the shared cache
+    # (app/core/cache.py); None disables it. Writes made through this class invalidate
+    # the rows in every worker; subclasses that write with raw statements must call
+    # _invalidate_cached() themselves.
+    cache_ttl: Optional[float] = None
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
         # Use bltns.id() if you ever shadow 'id' locally and need the built-in
         # import builtins as bltns
         print(f"DEBUG: CRUDBase instance {id(self)} initialized for model: {model.__name__}")
 
+        # Fixed-shape statements are built once and executed with bound parameters.
+        # Rebuilding select() per call costs construction plus a fresh cache-key walk;
+        # a reused statement object keeps its memoized cache key, so SQLAlchemy goes
+        # straight to the compiled-statement cache (and asyncpg to its prepared statement).
+        primary_key = sa_inspect(self.model).primary_key
+        self._pk_column = primary_key[0] if len(primary_key) == 1 else None # Composite keys: no get()
+        self._get_stmt = (
+            select(self.model).where(self._pk_column == bindparam("record_id"))
+            if self._pk_column is not None else None
+        )
+        self._get_many_stmt = (
+            select(self.model).where(self._pk_column.in_(bindparam("record_ids", expanding=True)))
+            if self._pk_column is not None else None
+        )
+        self._get_multi_stmt = (
+            select(self.model)
+            .order_by(*primary_key)
+            .offset(bindparam("skip"))
+            .limit(bindparam("limit"))
+        )
+        # Column attribute -> decoder for rows kept in the shared cache (see cache_ttl).
+        self._cache_columns = [
+            (attr.key, _cache_decoder(attr.columns[0])) for attr in sa_inspect(self.model).column_attrs
+        ]
+        # Column attribute -> its column, for bulk statements: attribute keys (what schemas
+        # dump) can differ from column names, e.g. Unit.unit_type is column "type".
+        self._attr_columns = {attr.key: attr.columns[0] for attr in sa_inspect(self.model).column_attrs}
+
     async def get(self, db: AsyncSession, record_id: Any) -> Optional[ModelType]: # Renamed 'id' to 'record_id'
-        # Use builtins.id if 'id' is ever shadowed in this scope and you need the function
-        # import builtins as bltns
-        print(f"DEBUG: ***** INSIDE CRUDBase.get (instance {id(self)}) for model {self.model.__name__} with record_id: {record_id} (type: {type(record_id)}) *****")
+        # Hot path (runs for the current user on every authenticated request): no per-call
+        # statement building and no debug output beyond warnings/errors.
         try:
             current_id_param = record_id # Use the renamed parameter
 
@@ -37,28 +153,83 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                      print(f"ERROR: Cannot convert record_id '{current_id_param}' to int for User model query.")
                      return None
 
-            stmt = select(self.model).filter(self.model.id == current_id_param) # Use current_id_param
-            print(f"DEBUG: CRUDBase.get - Executing statement: {str(stmt)}")
-            result = await db.execute(stmt)
-            scalar_result = result.scalars().first()
-            print(f"DEBUG: ***** CRUDBase.get query result for record_id {current_id_param}: {'Found object with ID ' + str(scalar_result.id) if scalar_result and hasattr(scalar_result, 'id') else 'None'} *****")
-            if scalar_result:
-                print(f"DEBUG: Object details from CRUDBase.get: {scalar_result}")
-            return scalar_result
+            result = await db.execute(self._get_stmt, {"record_id": current_id_param})
+            return result.scalars().first()
         except Exception as e:
             print(f"CRITICAL ERROR in CRUDBase.get (instance {id(self)} for model {self.model.__name__}, record_id {record_id}): {e}")
             traceback.print_exc()
             return None
 
+    async def get_many(self, db: AsyncSession, record_ids: Sequence[Any]) -> List[Optional[ModelType]]:
+        """
+        Fetches several records with a single IN query.
+        Returns one entry per requested id, in the same order (None where no row exists).
+        With cache_ttl set, rows found in the shared cache are attached to the session
+        without a query and only the misses are fetched (and then cached).
+        """
+        unique_ids = list(dict.fromkeys(record_ids))
+        if not unique_ids:
+            return []
+        by_id: Dict[Any, ModelType] = {}
+        missing = unique_ids
+        cache = get_cache() if self.cache_ttl else None
+        if cache is not None:
+            generation = cache.generation
+            cached = await cache.get_many([self._cache_key(record_id) for record_id in unique_ids])
+            for record_id in unique_ids:
+                data = cached.get(self._cache_key(record_id))
+                if data is not None:
+                    by_id[record_id] = await self._from_cache(db, data)
+            missing = [record_id for record_id in unique_ids if record_id not in by_id]
+        if missing:
+            result = await db.execute(self._get_many_stmt, {"record_ids": missing})
+            fetched = {getattr(obj, self._pk_column.key): obj for obj in result.scalars().all()}
+            by_id.update(fetched)
+            if cache is not None and fetched:
+                await cache.set_many(
+                    {self._cache_key(record_id): self._to_cache(obj) for record_id, obj in fetched.items()},
+                    self.cache_ttl, generation=generation,
+                )
+        return [by_id.get(record_id) for record_id in record_ids]
+
+    # --- Shared cache helpers ---
+
+    def _cache_key(self, record_id: Any) -> str:
+        return f"{self.model.__tablename__}:{record_id}"
+
+    def _to_cache(self, obj: ModelType) -> Dict[str, Any]:
+        return {key: jsonable_encoder(getattr(obj, key)) for key, _ in self._cache_columns}
+
+    async def _from_cache(self, db: AsyncSession, data: Dict[str, Any]) -> ModelType:
+        values = {
+            key: decode(data[key]) if decode is not None and data.get(key) is not None else data.get(key)
+            for key, decode in self._cache_columns
+        }
+        obj = self.model(**values)
+        make_transient_to_detached(obj) # Persistent state without a SELECT; an instance already in the session wins
+        return await db.merge(obj, load=False)
+
+    async def _invalidate_cached(self, record_ids: Iterable[Any]) -> None:
+        """Call after the write commits; drops the rows from the shared cache in every worker."""
+        if self.cache_ttl:
+            await get_cache().invalidate(self._cache_key(record_id) for record_id in record_ids)
+
+    async def load(self, db: AsyncSession, record_id: Any) -> Optional[ModelType]:
+        """
+        Like get(), but batched with other load() calls in the same event-loop tick and
+        memoized for the lifetime of the session (see app/crud/batch_loader.py).
+        """
+        return await get_loader(self, db).load(record_id)
+
+    async def load_many(self, db: AsyncSession, record_ids: Sequence[Any]) -> List[Optional[ModelType]]:
+        return await get_loader(self, db).load_many(record_ids)
+
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         print(f"DEBUG: CRUDBase.get_multi (instance {id(self)}) called for model {self.model.__name__}.")
         try:
-            stmt = select(self.model).offset(skip).limit(limit)
-            if hasattr(self.model, 'id'):
-                stmt = stmt.order_by(self.model.id)
-            result = await db.execute(stmt)
+            result = await db.execute(self._get_multi_stmt, {"skip": skip, "limit": limit})
             return result.scalars().all()
         except Exception as e:
             print(f"ERROR in CRUDBase.get_multi: {e}")
@@ -66,6 +237,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             return []
 
 
+    async def count(self, db: AsyncSession, *, exact_threshold: int) -> Tuple[int, bool]:
+        """Total rows of the table as (total, is_exact); see count_rows."""
+        return await count_rows(db, select(self.model), exact_threshold=exact_threshold, table=self.model.__tablename__)
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         print(f"DEBUG: CRUDBase.create (instance {id(self)}) called for model {self.model.__name__}.")
         try:
@@ -102,6 +277,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.add(db_obj)
             await db.commit()
             await db.refresh(db_obj)
+            if self._pk_column is not None:
+                get_loader(self, db).prime(getattr(db_obj, self._pk_column.key), db_obj)
+                await self._invalidate_cached([getattr(db_obj, self._pk_column.key)])
             return db_obj
         except Exception as e:
             print(f"ERROR in CRUDBase.update: {e}")
@@ -115,9 +293,158 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if obj:
                 await db.delete(obj)
                 await db.commit()
+                get_loader(self, db).prime(record_id, None)
+                await self._invalidate_cached([record_id])
                 return obj
             return None
         except Exception as e:
             print(f"ERROR in CRUDBase.remove: {e}")
             traceback.print_exc()
-            return None
\ No newline at end of file
+            return None
+
+    # --- Set-based bulk operations ---
+    # One transaction for the whole call (a single commit at the end, rollback on any
+    # error), chunked multi-row statements with RETURNING, and no per-object refresh.
+    # return_orm=True returns model instances (placed in the session's identity map);
+    # return_orm=False returns lightweight Row tuples of the table's columns.
+
+    def _returning(self, stmt, return_orm: bool):
+        return stmt.returning(self.model) if return_orm else stmt.returning(*self.model.__table__.columns)
+
+    def _chunk_size(self, chunk_size: int, params_per_row: int) -> int:
+        return max(1, min(chunk_size, MAX_BIND_PARAMS // max(params_per_row, 1)))
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        return_orm: bool = True,
+    ) -> List[Union[ModelType, Row]]:
+        """Inserts all rows in one transaction; results are in input order."""
+        print(f"DEBUG: CRUDBase.create_many (instance {id(self)}) called for model {self.model.__name__}, {len(objs_in)} rows.")
+        rows = [obj if isinstance(obj, dict) else obj.model_dump() for obj in objs_in]
+        if not rows:
+            return []
+        size = self._chunk_size(chunk_size, max(len(row) for row in rows))
+        created: List[Union[ModelType, Row]] = []
+        try:
+            for chunk in chunked(rows, size):
+                # ORM bulk INSERT: applies Python-side column defaults (e.g. Course.id = uuid4)
+                # and sends each chunk as multi-row INSERT ... VALUES ... RETURNING.
+                stmt = self._returning(insert(self.model), return_orm)
+                result = await db.execute(stmt.execution_options(sort_by_parameter_order=True), list(chunk))
+                created.extend(result.scalars().all() if return_orm else result.all())
+            await db.commit()
+        except Exception as e:
+            print(f"ERROR in CRUDBase.create_many: {e}")
+            traceback.print_exc()
+            await db.rollback()
+            raise
+        if return_orm and self._pk_column is not None:
+            loader = get_loader(self, db)
+            for obj in created:
+                loader.prime(getattr(obj, self._pk_column.key), obj)
+        return created
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        updates: Mapping[Any, Union[UpdateSchemaType, Dict[str, Any]]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        return_orm: bool = True,
+    ) -> List[Union[ModelType, Row]]:
+        """
+        Applies per-row changes keyed by primary key, e.g. {1: UserUpdate(name="A"), 2: {"name": "B"}}.
+        Schemas contribute only their explicitly set fields. Rows changing the same set of
+        columns are sent together as `UPDATE ... FROM (VALUES ...) RETURNING`. Ids with no
+        matching row are skipped; the result holds only the rows actually updated.
+        """
+        print(f"DEBUG: CRUDBase.update_many (instance {id(self)}) called for model {self.model.__name__}, {len(updates)} rows.")
+        if self._pk_column is None:
+            raise NotImplementedError(f"update_many requires a single-column primary key ({self.model.__name__})")
+        attr_columns = self._attr_columns
+        pk_key = next(key for key, col in attr_columns.items() if col is self._pk_column)
+
+        # Group by the set of changed attributes: one VALUES shape per statement.
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for record_id, obj_in in updates.items():
+            data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+            data.pop(pk_key, None)
+            if not data:
+                continue
+            unknown = set(data) - set(attr_columns)
+            if unknown:
+                raise ValueError(f"Unknown columns for {self.model.__name__}: {sorted(unknown)}")
+            groups.setdefault(tuple(sorted(data)), []).append({pk_key: record_id, **data})
+
+        updated: List[Union[ModelType, Row]] = []
+        try:
+            for keys, rows in groups.items():
+                value_columns = [column(pk_key, self._pk_column.type)] + [column(key, attr_columns[key].type) for key in keys]
+                size = self._chunk_size(chunk_size, len(value_columns))
+                for chunk in chunked(rows, size):
+                    data_rows = [tuple(row[c.name] for c in value_columns) for row in chunk]
+                    new_values = values(*value_columns, name="new_values").data(data_rows)
+                    stmt = (
+                        update(self.model)
+                        .where(self._pk_column == new_values.c[pk_key])
+                        .values({attr_columns[key]: new_values.c[key] for key in keys})
+                        # Refresh instances already in the identity map instead of leaving them stale.
+                        .execution_options(synchronize_session=False, populate_existing=True)
+                    )
+                    result = await db.execute(self._returning(stmt, return_orm))
+                    updated.extend(result.scalars().all() if return_orm else result.all())
+            await db.commit()
+        except Exception as e:
+            print(f"ERROR in CRUDBase.update_many: {e}")
+            traceback.print_exc()
+            await db.rollback()
+            raise
+        loader = get_loader(self, db)
+        for record_id in updates:
+            loader.clear(record_id)
+        await self._invalidate_cached(updates)
+        return updated
+
+    async def remove_many(
+        self,
+        db: AsyncSession,
+        *,
+        record_ids: Sequence[Any],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        return_orm: bool = False,
+    ) -> List[Union[ModelType, Row]]:
+        """
+        Deletes by primary key with chunked `DELETE ... WHERE pk IN (...) RETURNING`.
+        Returns the deleted rows (lightweight rows by default: they no longer exist).
+        Related rows are left to the database's ON DELETE rules; ORM-level cascades
+        on relationships do not run for bulk statements.
+        """
+        print(f"DEBUG: CRUDBase.remove_many (instance {id(self)}) called for model {self.model.__name__}, {len(record_ids)} ids.")
+        if self._pk_column is None:
+            raise NotImplementedError(f"remove_many requires a single-column primary key ({self.model.__name__})")
+        unique_ids = list(dict.fromkeys(record_ids))
+        removed: List[Union[ModelType, Row]] = []
+        try:
+            for chunk in chunked(unique_ids, self._chunk_size(chunk_size, 1)):
+                stmt = (
+                    delete(self.model)
+                    .where(self._pk_column.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                result = await db.execute(self._returning(stmt, return_orm))
+                removed.extend(result.scalars().all() if return_orm else result.all())
+            await db.commit()
+        except Exception as e:
+            print(f"ERROR in CRUDBase.remove_many: {e}")
+            traceback.print_exc()
+            await db.rollback()
+            raise
+        loader = get_loader(self, db)
+        for record_id in unique_ids:
+            loader.prime(record_id, None)
+        await self._invalidate_cached(unique_ids)
+        return removed
@@ -0,0 +1,108 @@
+# backend/app/crud/batch_loader.py
+"""
+Request-scoped, DataLoader-style batching of primary-key lookups.
+
+A `BatchLoader` lives in `AsyncSession.info`, so it has exactly the lifetime of the
+request's session. `load()` calls made in the same event-loop tick (e.g. under
+`asyncio.gather`) are collected and resolved with one `WHERE pk IN (...)` query per
+model, and every result (including "not found") is memoized for the rest of the
+session, so repeated lookups of the same id never reach the database again.
+
+Use it through the CRUD layer:
+
+    user, course = await asyncio.gather(
+        crud_user.load(db, user_id), crud_course.load(db, course_id)
+    )
+    authors = await crud_user.load_many(db, author_ids) # One query, input order kept
+"""
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+
+if TYPE_CHECKING:
+    from app.crud.base_crud import CRUDBase
+
+_SESSION_INFO_KEY = "lms_batch_loaders"
+_SESSION_LOCK_KEY = "lms_batch_loader_lock"
+_MISSING = object()
+
+
+class BatchLoader:
+    """Batches and memoizes `crud.get_many()` lookups for one model on one session."""
+
+    def __init__(self, crud: "CRUDBase", db: AsyncSession, lock: asyncio.Lock):
+        self.crud = crud
+        self.db = db
+        self._lock = lock # Shared by every loader on the session: an AsyncSession runs one statement at a time
+        self._memo: Dict[Hashable, Any] = {} # id -> object, or None when the row does not exist
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._dispatch_scheduled = False
+        self._tasks: set = set() # The loop only keeps weak references to tasks
+
+    @property
+    def cache_name(self) -> str:
+        return f"batch_loader_{self.crud.model.__tablename__}"
+
+    async def load(self, record_id: Hashable) -> Optional[Any]:
+        cached = self._memo.get(record_id, _MISSING)
+        if cached is not _MISSING:
+            metrics.record_cache_access(self.cache_name, True)
+            return cached
+        metrics.record_cache_access(self.cache_name, False)
+
+        future = self._pending.get(record_id)
+        if future is None:
+            future = self._pending[record_id] = asyncio.get_running_loop().create_future()
+            if not self._dispatch_scheduled:
+                # The dispatch task first runs on the next loop iteration, after every
+                # coroutine started in this tick has registered its id.
+                self._dispatch_scheduled = True
+                task = asyncio.get_running_loop().create_task(self._dispatch())
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        return await future
+
+    async def load_many(self, record_ids: Sequence[Hashable]) -> List[Optional[Any]]:
+        return list(await asyncio.gather(*(self.load(record_id) for record_id in record_ids)))
+
+    def prime(self, record_id: Hashable, obj: Optional[Any]) -> None:
+        """Seeds the memo with an object the caller already holds (e.g. the current user)."""
+        self._memo[record_id] = obj
+
+    def clear(self, record_id: Optional[Hashable] = None) -> None:
+        """Forgets one id (after an update or delete) or everything."""
+        if record_id is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(record_id, None)
+
+    async def _dispatch(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            self._dispatch_scheduled = False
+            if not batch:
+                return
+            try:
+                found = await self.crud.get_many(self.db, list(batch.keys()))
+            except Exception as e:
+                for future in batch.values():
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for record_id, obj in zip(batch.keys(), found):
+                self._memo[record_id] = obj
+                if not batch[record_id].done():
+                    batch[record_id].set_result(obj)
+
+
+def get_loader(crud: "CRUDBase", db: AsyncSession) -> BatchLoader:
+    """Returns the session's loader for this CRUD object, creating it on first use."""
+    loaders = db.info.setdefault(_SESSION_INFO_KEY, {})
+    loader = loaders.get(crud)
+    if loader is None:
+        lock = db.info.setdefault(_SESSION_LOCK_KEY, asyncio.Lock())
+        loader = loaders[crud] = BatchLoader(crud, db, lock)
+    return loader
@@ -0,0 +1,105 @@
+# backend/app/crud/crud_activity.py
+"""
+Writes and partition maintenance for the append-only activity_events table.
+
+One partition per calendar month (UTC), named activity_events_YYYYMM. There is no
+DEFAULT partition: rows in it would block creating the matching monthly partition
+later, so a missing partition is created on demand instead (see ActivityLog).
+"""
+from datetime import date
+from typing import Any, Dict, List, Sequence, Tuple
+import re
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.activity_event import ActivityEvent as ActivityEventModel
+
+_PARTITION_NAME = re.compile(r"^activity_events_(\d{4})(\d{2})$")
+_MAINTENANCE_LOCK_ID = 0x4C4D535F41435456 # pg advisory lock key: one maintainer at a time across workers
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{ActivityEventModel.__tablename__}_{month.year:04d}{month.month:02d}"
+
+
+class CRUDActivityEvent:
+    async def insert_many(self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]) -> int:
+        """Appends a batch of events (executemany, sent as multi-row INSERTs) and commits."""
+        if not rows:
+            return 0
+        await db.execute(insert(ActivityEventModel), list(rows))
+        await db.commit()
+        return len(rows)
+
+    async def list_partitions(self, db: AsyncSession) -> List[Tuple[str, date]]:
+        """(name, month) of every monthly partition, oldest first."""
+        result = await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ), {"parent": ActivityEventModel.__tablename__})
+        partitions = []
+        for name in result.scalars():
+            match = _PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    async def ensure_partitions(self, db: AsyncSession, *, months: Sequence[date]) -> List[str]:
+        """Creates the monthly partitions that do not exist yet; does not commit. Returns the created names."""
+        existing = {name for name, _ in await self.list_partitions(db)}
+        created = []
+        for month in sorted({month_start(m) for m in months}):
+            name = partition_name(month)
+            if name in existing:
+                continue
+            # Bounds are literals: DDL takes no bind parameters. Both come from date objects, never from input.
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {ActivityEventModel.__tablename__} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+            ))
+            created.append(name)
+        return created
+
+    async def drop_partitions_before(self, db: AsyncSession, *, cutoff: date) -> List[str]:
+        """Drops the partitions of months before `cutoff` (whole tables, no row deletes); does not commit."""
+        dropped = []
+        for name, month in await self.list_partitions(db):
+            if month < cutoff:
+                await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        return dropped
+
+    async def _lock_maintenance(self, db: AsyncSession) -> None:
+        # Serializes partition DDL across workers (held until commit / rollback).
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MAINTENANCE_LOCK_ID})
+
+    async def create_partitions(self, db: AsyncSession, *, months: Sequence[date]) -> List[str]:
+        """ensure_partitions() under the maintenance lock, committed; for events that found no partition."""
+        await self._lock_maintenance(db)
+        created = await self.ensure_partitions(db, months=months)
+        await db.commit()
+        return created
+
+    async def maintain(self, db: AsyncSession, *, today: date, premake_months: int, retention_months: int) -> Dict[str, List[str]]:
+        """
+        Creates this month's and the next `premake_months` partitions and drops those of months
+        more than `retention_months` before the current one, then commits.
+        """
+        await self._lock_maintenance(db)
+        current = month_start(today)
+        created = await self.ensure_partitions(db, months=[add_months(current, n) for n in range(premake_months + 1)])
+        dropped = await self.drop_partitions_before(db, cutoff=add_months(current, -retention_months))
+        await db.commit()
+        return {"created": created, "dropped": dropped}
+
+crud_activity_event = CRUDActivityEvent()
@@ -0,0 +1,211 @@
+# backend/app/crud/crud_completion.py
+"""
+Course and module completion summaries (course_completion / module_completion).
+
+Both tables are rollups of unit_progress per user. They are kept current
+incrementally: every progress flush reports which (user, unit) rows just became
+opened or completed, and `apply_transitions` adds those deltas in the same
+transaction, so the summaries never disagree with a committed flush. Reads for a
+whole class then scan one summary row per student instead of every (user, unit)
+pair. `rebuild` recomputes them from unit_progress (e.g. after units were deleted,
+whose progress rows cascade away without a delta).
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import uuid
+
+from sqlalchemy import and_, delete, false, func, insert, or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.base_crud import MAX_BIND_PARAMS, chunked
+from app.models.course_completion import CourseCompletion as CourseCompletionModel
+from app.models.enums import UserCourseRoleEnum
+from app.models.module_completion import ModuleCompletion as ModuleCompletionModel
+from app.models.module_model import Module as ModuleModel
+from app.models.unit import Unit as UnitModel
+from app.models.unit_progress import UnitProgress as UnitProgressModel
+from app.models.user import User as UserModel
+from app.models.user_course import UserCourse as UserCourseModel
+
+class CRUDCompletion:
+    async def apply_transitions(self, db: AsyncSession, *, transitions: Sequence[Dict[str, Any]]) -> None:
+        """
+        Adds progress deltas to both summaries; does not commit (the caller's flush does).
+        Each transition: user_id, module_id, course_id, opened (0/1: the unit was opened for the
+        first time), completed (0/1: completed for the first time), activity_at.
+        """
+        if not transitions:
+            return
+        modules: Dict[Tuple, Dict[str, Any]] = {}
+        courses: Dict[Tuple, Dict[str, Any]] = {}
+        for t in transitions:
+            for rollup, key, row in (
+                (modules, (t["module_id"], t["user_id"]), {"module_id": t["module_id"], "user_id": t["user_id"], "course_id": t["course_id"]}),
+                (courses, (t["course_id"], t["user_id"]), {"course_id": t["course_id"], "user_id": t["user_id"]}),
+            ):
+                entry = rollup.get(key)
+                if entry is None:
+                    entry = rollup[key] = dict(row, units_opened=0, units_completed=0, last_activity_at=None)
+                entry["units_opened"] += t["opened"]
+                entry["units_completed"] += t["completed"]
+                if t["activity_at"] and (entry["last_activity_at"] is None or t["activity_at"] > entry["last_activity_at"]):
+                    entry["last_activity_at"] = t["activity_at"]
+        # Key order: concurrent flushes from several workers lock summary rows in the same order (no deadlocks).
+        await self._add(db, ModuleCompletionModel, [modules[k] for k in sorted(modules)], ("module_id", "user_id"))
+        await self._add(db, CourseCompletionModel, [courses[k] for k in sorted(courses, key=lambda k: (str(k[0]), k[1]))], ("course_id", "user_id"))
+
+    async def _add(self, db: AsyncSession, model, rows: List[Dict[str, Any]], key: Tuple[str, ...]) -> None:
+        table = model.__table__
+        for chunk in chunked(rows, MAX_BIND_PARAMS // len(rows[0])):
+            stmt = pg_insert(table).values(list(chunk))
+            excluded = stmt.excluded
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c[name] for name in key],
+                set_={
+                    "units_opened": table.c.units_opened + excluded.units_opened,
+                    "units_completed": table.c.units_completed + excluded.units_completed,
+                    "last_activity_at": func.greatest(table.c.last_activity_at, excluded.last_activity_at),
+                    "updated_at": func.now(),
+                },
+            ))
+
+    async def rebuild(self, db: AsyncSession, *, course_id: Optional[uuid.UUID] = None) -> Dict[str, int]:
+        """
+        Recomputes the summaries of one course (or of every course) from unit_progress and commits.
+        Holds a SHARE lock on unit_progress meanwhile: progress flushes wait (events keep
+        buffering in memory) so no delta is applied to rows being recomputed.
+        """
+        mc, cc, up = ModuleCompletionModel, CourseCompletionModel, UnitProgressModel
+        try:
+            await db.execute(text("LOCK TABLE unit_progress IN SHARE MODE"))
+            module_filter = [ModuleModel.course_id == course_id] if course_id else []
+            await db.execute(delete(mc).where(*([mc.course_id == course_id] if course_id else [])))
+            await db.execute(delete(cc).where(*([cc.course_id == course_id] if course_id else [])))
+
+            per_module = (
+                select(
+                    UnitModel.module_id, up.user_id, ModuleModel.course_id,
+                    func.count().filter(up.open_count > 0),
+                    func.count().filter(up.completed_at.isnot(None)),
+                    func.max(func.greatest(up.last_opened_at, up.completed_at)),
+                )
+                .join(UnitModel, UnitModel.id == up.unit_id)
+                .join(ModuleModel, ModuleModel.id == UnitModel.module_id)
+                .where(*module_filter)
+                .group_by(UnitModel.module_id, up.user_id, ModuleModel.course_id)
+            )
+            modules = await db.execute(
+                insert(mc).from_select(
+                    ["module_id", "user_id", "course_id", "units_opened", "units_completed", "last_activity_at"], per_module
+                )
+            )
+            per_course = (
+                select(mc.course_id, mc.user_id, func.sum(mc.units_opened), func.sum(mc.units_completed), func.max(mc.last_activity_at))
+                .where(*([mc.course_id == course_id] if course_id else []))
+                .group_by(mc.course_id, mc.user_id)
+            )
+            courses = await db.execute(
+                insert(cc).from_select(["course_id", "user_id", "units_opened", "units_completed", "last_activity_at"], per_course)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return {"module_completion": modules.rowcount, "course_completion": courses.rowcount}
+
+    async def get_course_analytics(
+        self, db: AsyncSession, *, course_id: uuid.UUID, skip: int = 0, limit: int = 100
+    ) -> Dict[str, Any]:
+        """Class-wide completion of a course, per module, and one page of students (by name)."""
+        mc, cc = ModuleCompletionModel, CourseCompletionModel
+        students = (
+            select(UserCourseModel.user_id)
+            .where(UserCourseModel.course_id == course_id, UserCourseModel.role == UserCourseRoleEnum.student)
+        )
+        student_count = (await db.execute(select(func.count()).select_from(students.subquery()))).scalar_one()
+
+        unit_counts = (
+            select(UnitModel.module_id, func.count().label("unit_count"))
+            .join(ModuleModel, ModuleModel.id == UnitModel.module_id)
+            .where(ModuleModel.course_id == course_id)
+            .group_by(UnitModel.module_id)
+            .subquery()
+        )
+        module_rows = (await db.execute(
+            select(ModuleModel.id, ModuleModel.title, ModuleModel.order, func.coalesce(unit_counts.c.unit_count, 0))
+            .outerjoin(unit_counts, unit_counts.c.module_id == ModuleModel.id)
+            .where(ModuleModel.course_id == course_id)
+            .order_by(ModuleModel.order, ModuleModel.id)
+        )).all()
+        module_stats = {
+            row.module_id: row
+            for row in (await db.execute(
+                select(
+                    mc.module_id,
+                    func.count().filter(or_(mc.units_opened > 0, mc.units_completed > 0)).label("started"),
+                    func.count().filter(mc.units_completed >= unit_counts.c.unit_count).label("completed"),
+                    func.sum(func.least(mc.units_completed, unit_counts.c.unit_count)).label("units_completed"),
+                )
+                .join(unit_counts, unit_counts.c.module_id == mc.module_id)
+                .where(mc.course_id == course_id, mc.user_id.in_(students))
+                .group_by(mc.module_id)
+            )).all()
+        }
+
+        def average(units_completed, unit_count: int) -> float:
+            return float(units_completed or 0) / (student_count * unit_count) if student_count and unit_count else 0.0
+
+        modules = []
+        for module_id, title, order, unit_count in module_rows:
+            stats = module_stats.get(module_id)
+            modules.append({
+                "module_id": module_id, "title": title, "order": order, "unit_count": unit_count,
+                "students_started": stats.started if stats else 0,
+                "students_completed": stats.completed if stats else 0,
+                "average_completion": average(stats.units_completed if stats else 0, unit_count),
+            })
+        course_units = sum(module["unit_count"] for module in modules)
+        completed_all = cc.units_completed >= course_units if course_units else false()
+
+        course_stats = (await db.execute(
+            select(
+                func.count().filter(or_(cc.units_opened > 0, cc.units_completed > 0)).label("started"),
+                func.count().filter(completed_all).label("completed"),
+                func.sum(func.least(cc.units_completed, course_units)).label("units_completed"),
+            )
+            .where(cc.course_id == course_id, cc.user_id.in_(students))
+        )).one()
+
+        page = (await db.execute(
+            select(UserModel.id, UserModel.name, UserModel.email, cc.units_opened, cc.units_completed, cc.last_activity_at)
+            .select_from(UserCourseModel)
+            .join(UserModel, UserModel.id == UserCourseModel.user_id)
+            .outerjoin(cc, and_(cc.course_id == UserCourseModel.course_id, cc.user_id == UserCourseModel.user_id))
+            .where(UserCourseModel.course_id == course_id, UserCourseModel.role == UserCourseRoleEnum.student)
+            .order_by(UserModel.name, UserModel.id)
+            .offset(skip)
+            .limit(limit)
+        )).all()
+
+        return {
+            "course_id": course_id,
+            "unit_count": course_units,
+            "student_count": student_count,
+            "students_started": course_stats.started,
+            "students_completed": course_stats.completed,
+            "average_completion": average(course_stats.units_completed, course_units),
+            "modules": modules,
+            "students": [
+                {
+                    "user_id": row.id, "name": row.name, "email": row.email,
+                    "units_opened": row.units_opened or 0, "units_completed": row.units_completed or 0,
+                    "completion": min((row.units_completed or 0) / course_units, 1.0) if course_units else 0.0,
+                    "last_activity_at": row.last_activity_at,
+                }
+                for row in page
+            ],
+        }
+
+crud_completion = CRUDCompletion()
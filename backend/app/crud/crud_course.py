@@ -1,69 +1,141 @@
 # backend/app/crud/crud_course.py
-from typing import List, Optional, Union, Dict, Any, Type
+from typing import List, Optional, Union, Dict, Any, FrozenSet, Tuple, Type, Awaitable, Callable
+import asyncio
 import uuid
 import traceback
 
+from sqlalchemy import bindparam, func, insert, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm import selectinload, joinedload, noload
 
-from app.crud.base_crud import CRUDBase
+from app.core.config import settings
+from app.crud.base_crud import CRUDBase, count_rows, delete_where_in_chunks
+from app.crud.batch_loader import get_loader
+from app.crud.crud_user import crud_user
 from app.models.course import Course as CourseModel
 from app.models.user_course import UserCourse as UserCourseModel
 from app.models.user import User as UserModel
 from app.models.module_model import Module as ModuleModel
 from app.models.unit import Unit as UnitModel
-from app.schemas.course_schemas import CourseCreate, CourseUpdate
+from app.schemas.course_schemas import CourseCreate, CourseUpdate, CourseView
 from app.schemas.user_course_schemas import UserCourseRole
+from app.models.enums import UserCourseRoleEnum
 
 class CRUDCourse(CRUDBase[CourseModel, CourseCreate, CourseUpdate]):
+    cache_ttl = settings.CACHE_COURSE_TTL_SECONDS # Course rows behind load(), e.g. enrollment and teacher checks
+
     def __init__(self, model: Type[CourseModel]):
         super().__init__(model)
         # Use builtins.id() if you ever shadow 'id' locally and need the built-in
         # import builtins as bltns
         print(f"DEBUG: CRUDCourse instance {id(self)} initialized with model: {model.__name__}")
 
-    # ... (get_multi_for_user method remains the same) ...
+        # The two course read paths have a fixed shape per CourseView (their eager-load options),
+        # so each shape is built once, on first use; see CRUDBase.__init__.
+        self._multi_for_user_stmts: Dict[FrozenSet[str], Any] = {}
+        self._with_details_stmts: Dict[FrozenSet[str], Any] = {}
+        self._multi_for_user_stmt = self._multi_for_user_stmt_for(CourseView())
+        self._with_details_stmt = self._with_details_stmt_for(CourseView())
+        self._enrolled_course_ids_stmt = select(UserCourseModel.course_id).filter(UserCourseModel.user_id == bindparam("user_id"))
+        # One page of a course's members: by role in enum order (teachers first), then by name;
+        # id breaks ties so pages are stable.
+        self._roster_stmt = (
+            select(UserCourseModel)
+            .join(UserModel, UserModel.id == UserCourseModel.user_id)
+            # Every row is the same course: leave it unloaded (None) rather than lazy-loading it per row.
+            .options(joinedload(UserCourseModel.user), noload(UserCourseModel.course))
+            .filter(UserCourseModel.course_id == bindparam("course_id"))
+            .order_by(UserCourseModel.role, UserModel.name, UserModel.id)
+            .offset(bindparam("skip"))
+            .limit(bindparam("limit"))
+        )
+
+    def _load_options(self, view: CourseView, user_loader: Callable) -> list:
+        """
+        Eager loads for the relationships in `view.include`; the others are noloaded (left
+        empty), so serializing them can neither lazy-load nor query.
+        """
+        options = []
+        if "user_associations" in view.include:
+            options.append(selectinload(self.model.user_associations).options(user_loader(UserCourseModel.user)))
+        else:
+            options.append(noload(self.model.user_associations))
+        if "modules.units" in view.include:
+            options.append(selectinload(self.model.modules).selectinload(ModuleModel.units))
+        elif "modules" in view.include:
+            options.append(selectinload(self.model.modules).noload(ModuleModel.units))
+        else:
+            options.append(noload(self.model.modules))
+        return options
+
+    def _multi_for_user_stmt_for(self, view: CourseView):
+        stmt = self._multi_for_user_stmts.get(view.include)
+        if stmt is None:
+            stmt = self._multi_for_user_stmts[view.include] = (
+                select(self.model)
+                .join(UserCourseModel, self.model.id == UserCourseModel.course_id)
+                .filter(UserCourseModel.user_id == bindparam("user_id"))
+                .options(*self._load_options(view, joinedload))
+                .offset(bindparam("skip"))
+                .limit(bindparam("limit"))
+                .order_by(self.model.name)
+            )
+        return stmt
+
+    def _with_details_stmt_for(self, view: CourseView):
+        stmt = self._with_details_stmts.get(view.include)
+        if stmt is None:
+            stmt = self._with_details_stmts[view.include] = (
+                select(self.model)
+                .options(*self._load_options(view, selectinload))
+                .filter(self.model.id == bindparam("course_id"))
+            )
+        return stmt
+
     async def get_multi_for_user(
-        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100, view: Optional[CourseView] = None
     ) -> List[CourseModel]:
+        """One page of the user's courses, by name; `view` limits the relationships loaded (default: all)."""
         print(f"DEBUG: CRUDCourse.get_multi_for_user called for user_id: {user_id}")
-        stmt = (
-            select(self.model)
-            .join(UserCourseModel, self.model.id == UserCourseModel.course_id)
-            .filter(UserCourseModel.user_id == user_id)
-            .options(
-                selectinload(self.model.user_associations).joinedload(UserCourseModel.user),
-                selectinload(self.model.modules).selectinload(ModuleModel.units)
-            )
-            .offset(skip)
-            .limit(limit)
-            .order_by(self.model.name)
-        )
-        result = await db.execute(stmt)
+        stmt = self._multi_for_user_stmt_for(view) if view is not None else self._multi_for_user_stmt
+        result = await db.execute(stmt, {"user_id": user_id, "skip": skip, "limit": limit})
         courses = result.scalars().unique().all()
         print(f"DEBUG: CRUDCourse.get_multi_for_user found {len(courses)} courses")
         return courses
 
-    async def get_with_details(self, db: AsyncSession, *, course_uuid: uuid.UUID) -> Optional[CourseModel]: # Renamed 'id' to 'course_uuid'
+    async def get_enrolled_course_ids(self, db: AsyncSession, *, user_id: int) -> List[uuid.UUID]:
+        """Ids of every course the user is enrolled in (any role); no course rows are loaded."""
+        result = await db.execute(self._enrolled_course_ids_stmt, {"user_id": user_id})
+        return result.scalars().all()
+
+    async def get_roster(
+        self, db: AsyncSession, *, course_id: uuid.UUID, skip: int = 0, limit: int = 100
+    ) -> List[UserCourseModel]:
+        """One page of the course's enrollments, each with its user loaded."""
+        result = await db.execute(self._roster_stmt, {"course_id": course_id, "skip": skip, "limit": limit})
+        return result.scalars().all()
+
+    async def count_roster(self, db: AsyncSession, *, course_id: uuid.UUID, exact_threshold: int) -> Tuple[int, bool]:
+        """Members of the course as (total, is_exact); see count_rows."""
+        stmt = select(UserCourseModel.user_id).filter(UserCourseModel.course_id == course_id)
+        return await count_rows(db, stmt, exact_threshold=exact_threshold)
+
+    async def get_with_details(
+        self, db: AsyncSession, *, course_uuid: uuid.UUID, view: Optional[CourseView] = None
+    ) -> Optional[CourseModel]: # Renamed 'id' to 'course_uuid'
         """
         Get a single course by ID with all its details:
         user associations (and their users), modules (and their units).
+        `view` limits the relationships loaded; those it leaves out are empty.
         """
         # Use builtins.id() if 'id' is ever shadowed in this scope and you need the function
         # import builtins as bltns
         print(f"DEBUG: ***** ENTERING CRUDCourse.get_with_details (instance {id(self)}) for course_uuid: {course_uuid} *****")
         try:
-            stmt = (
-                select(self.model)
-                .options(
-                    selectinload(self.model.user_associations).selectinload(UserCourseModel.user),
-                    selectinload(self.model.modules).selectinload(ModuleModel.units)
-                )
-                .filter(self.model.id == course_uuid) # Use renamed parameter course_uuid
-            )
-            print(f"DEBUG: CRUDCourse.get_with_details - Executing statement: {str(stmt)}")
-            result = await db.execute(stmt)
+            stmt = self._with_details_stmt_for(view) if view is not None else self._with_details_stmt
+            result = await db.execute(stmt, {"course_id": course_uuid})
             course = result.scalars().first()
 
             if course:
@@ -110,17 +182,12 @@ class CRUDCourse(CRUDBase[CourseModel, CourseCreate, CourseUpdate]):
         self, db: AsyncSession, *, user_id: int, course_id: uuid.UUID, role: UserCourseRole # Changed course_id to course_uuid if used internally
     ) -> Union[UserCourseModel, str, None]:
         print(f"DEBUG: CRUDCourse.enroll_user called: user_id={user_id}, course_id={course_id}, role={role.value}")
-        # Using course_id as it's specific to the UserCourseModel context
-        user_exists_stmt = select(UserModel).filter_by(id=user_id)
-        user_res = await db.execute(user_exists_stmt)
-        if not user_res.scalars().first():
+        # Batched and memoized per session: when the service already loaded both rows
+        # (or the user is the current user), these are answered without a query.
+        user, course = await asyncio.gather(crud_user.load(db, user_id), self.load(db, course_id))
+        if not user:
             return "user_not_found"
-
-        # Using self.get (from CRUDBase) which expects 'record_id' if we were to use it here for course
-        # For consistency, let's use a direct select for course existence check
-        course_exists_stmt = select(CourseModel).filter_by(id=course_id) # Use course_id for this specific query
-        course_res = await db.execute(course_exists_stmt)
-        if not course_res.scalars().first():
+        if not course:
             return "course_not_found"
 
         existing_stmt = select(UserCourseModel).filter_by(user_id=user_id, course_id=course_id)
@@ -160,5 +227,118 @@ class CRUDCourse(CRUDBase[CourseModel, CourseCreate, CourseUpdate]):
         print(f"DEBUG: Course created and refreshed with details: ID {refreshed_course.id if refreshed_course else db_course.id}")
         return refreshed_course if refreshed_course else db_course
 
+    async def clone_course(
+        self, db: AsyncSession, *, source_id: uuid.UUID, name: Optional[str], description: Optional[str],
+        copy_teachers: bool, creator_id: int
+    ) -> Optional[CourseModel]:
+        """
+        Copies a course with all its modules and units entirely inside PostgreSQL
+        (INSERT ... SELECT, one transaction, a fixed number of statements whatever
+        the course size). New module ids are drawn from the modules sequence in
+        (order, id) order and used to remap each unit's module_id; `order` values
+        are copied as-is. Teacher enrollments are copied when asked; the creator is
+        always enrolled as a teacher of the copy. Returns None if the source is gone.
+        """
+        print(f"DEBUG: CRUDCourse.clone_course called for source course {source_id} by user {creator_id}")
+        new_id = uuid.uuid4()
+        courses = CourseModel.__table__
+        modules = ModuleModel.__table__
+        units = UnitModel.__table__
+        user_courses = UserCourseModel.__table__
+        try:
+            copy_course = insert(courses).from_select(
+                ["id", "name", "description"],
+                select(
+                    literal(new_id, type_=courses.c.id.type),
+                    func.coalesce(literal(name, type_=courses.c.name.type), courses.c.name),
+                    func.coalesce(literal(description, type_=courses.c.description.type), courses.c.description),
+                ).where(courses.c.id == source_id)
+            )
+            if (await db.execute(copy_course)).rowcount == 0:
+                await db.rollback()
+                return None
+
+            # Old -> new module id map. nextval() runs over the already sorted subquery,
+            # so new ids follow the source modules' order.
+            ordered_modules = (
+                select(modules.c.id, modules.c.title, modules.c.description, modules.c.order)
+                .where(modules.c.course_id == source_id)
+                .order_by(modules.c.order, modules.c.id)
+                .subquery("ordered_modules")
+            )
+            module_map = select(
+                ordered_modules.c.id.label("old_id"),
+                func.nextval(func.pg_get_serial_sequence("modules", "id")).label("new_id"),
+                ordered_modules.c.title,
+                ordered_modules.c.description,
+                ordered_modules.c.order,
+            ).cte("module_map")
+            copy_modules = insert(modules).from_select(
+                ["id", "title", "description", "order", "course_id"],
+                select(
+                    module_map.c.new_id, module_map.c.title, module_map.c.description, module_map.c.order,
+                    literal(new_id, type_=modules.c.course_id.type),
+                ).order_by(module_map.c.new_id)
+            ).cte("copied_modules")
+            # One statement: the modules CTE and the units insert share the id map
+            # (foreign keys are checked at the end of the statement).
+            copy_units = insert(units).from_select(
+                ["title", "type", "content", "order", "module_id"],
+                select(units.c.title, units.c.type, units.c.content, units.c.order, module_map.c.new_id)
+                .join(module_map, units.c.module_id == module_map.c.old_id)
+                .order_by(module_map.c.new_id, units.c.order, units.c.id)
+            ).add_cte(copy_modules)
+            await db.execute(copy_units)
+
+            if copy_teachers:
+                await db.execute(
+                    pg_insert(user_courses).from_select(
+                        ["user_id", "course_id", "role"],
+                        select(user_courses.c.user_id, literal(new_id, type_=user_courses.c.course_id.type), user_courses.c.role)
+                        .where(user_courses.c.course_id == source_id, user_courses.c.role == UserCourseRoleEnum.teacher)
+                    ).on_conflict_do_nothing()
+                )
+            await db.execute(
+                pg_insert(user_courses)
+                .values(user_id=creator_id, course_id=new_id, role=UserCourseRoleEnum.teacher)
+                .on_conflict_do_nothing()
+            )
+            await db.commit()
+        except Exception as e:
+            print(f"ERROR in CRUDCourse.clone_course (source {source_id}): {e}")
+            traceback.print_exc()
+            await db.rollback()
+            raise
+        return await self.get_with_details(db, course_uuid=new_id)
+
+    async def remove_with_cascade(
+        self, db: AsyncSession, *, course_id: uuid.UUID, chunk_size: int,
+        on_progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Deletes a course and everything under it with set-based, chunked deletes
+        (units, then modules, then enrollments, then the course row) instead of the
+        ORM cascade, which loads the whole tree into the session first.
+        The foreign keys also cascade in the database; deleting children first in
+        chunks just keeps each transaction short. Safe to re-run if interrupted.
+        `on_progress(table, rows)` is awaited after each table is done.
+        """
+        print(f"DEBUG: CRUDCourse.remove_with_cascade called for course_id: {course_id}")
+        module_ids = select(ModuleModel.id).where(ModuleModel.course_id == course_id)
+        steps = [
+            ("units", UnitModel, UnitModel.module_id.in_(module_ids)),
+            ("modules", ModuleModel, ModuleModel.course_id == course_id),
+            ("enrollments", UserCourseModel, UserCourseModel.course_id == course_id),
+            ("courses", CourseModel, CourseModel.id == course_id),
+        ]
+        counts: Dict[str, int] = {}
+        for name, model, criterion in steps:
+            counts[name] = await delete_where_in_chunks(db, model, criterion, chunk_size=chunk_size)
+            if on_progress is not None:
+                await on_progress(name, counts[name])
+        get_loader(self, db).prime(course_id, None)
+        await self._invalidate_cached([course_id])
+        return counts
+
 crud_course = CRUDCourse(CourseModel)
 print(f"DEBUG: crud_course instance (ID: {id(crud_course)}) created in crud_course.py with model {CourseModel.__name__}")
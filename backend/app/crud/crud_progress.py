@@ -0,0 +1,107 @@
+# backend/app/crud/crud_progress.py
+from typing import Any, Dict, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.base_crud import CRUDBase, MAX_BIND_PARAMS, chunked
+from app.crud.crud_completion import crud_completion
+from app.models.module_model import Module as ModuleModel
+from app.models.unit import Unit as UnitModel
+from app.models.unit_progress import UnitProgress as UnitProgressModel
+from app.models.user_course import UserCourse as UserCourseModel
+from app.schemas.progress_schemas import ProgressEventIn
+
+class CRUDUnitProgress(CRUDBase[UnitProgressModel, ProgressEventIn, ProgressEventIn]):
+    def __init__(self, model):
+        super().__init__(model)
+        # Runs for every progress event: prebuilt, one indexed join.
+        self._enrolled_course_for_unit_stmt = (
+            select(ModuleModel.course_id)
+            .select_from(UnitModel)
+            .join(ModuleModel, UnitModel.module_id == ModuleModel.id)
+            .join(UserCourseModel, UserCourseModel.course_id == ModuleModel.course_id)
+            .where(UnitModel.id == bindparam("unit_id"), UserCourseModel.user_id == bindparam("user_id"))
+        )
+        self._for_user_in_course_stmt = (
+            select(self.model)
+            .join(UnitModel, UnitModel.id == self.model.unit_id)
+            .join(ModuleModel, UnitModel.module_id == ModuleModel.id)
+            .where(self.model.user_id == bindparam("user_id"), ModuleModel.course_id == bindparam("course_id"))
+            .order_by(ModuleModel.order, UnitModel.order, UnitModel.id)
+        )
+
+    async def get_enrolled_course_id_for_unit(self, db: AsyncSession, *, user_id: int, unit_id: int) -> Optional[uuid.UUID]:
+        """The unit's course id if the user is enrolled in that course, else None."""
+        result = await db.execute(self._enrolled_course_for_unit_stmt, {"user_id": user_id, "unit_id": unit_id})
+        return result.scalar_one_or_none()
+
+    async def get_for_user_in_course(self, db: AsyncSession, *, user_id: int, course_id: uuid.UUID) -> List[UnitProgressModel]:
+        result = await db.execute(self._for_user_in_course_stmt, {"user_id": user_id, "course_id": course_id})
+        return result.scalars().all()
+
+    async def unit_ids_in_course(self, db: AsyncSession, *, course_id: uuid.UUID, unit_ids: Sequence[int]) -> List[int]:
+        """The given units that belong to the course, in course order (as get_for_user_in_course)."""
+        stmt = (
+            select(UnitModel.id)
+            .join(ModuleModel, UnitModel.module_id == ModuleModel.id)
+            .where(ModuleModel.course_id == course_id, UnitModel.id.in_(unit_ids))
+            .order_by(ModuleModel.order, UnitModel.order, UnitModel.id)
+        )
+        return (await db.execute(stmt)).scalars().all()
+
+    async def upsert_many(self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Merges already-coalesced per-(user, unit) deltas into unit_progress with chunked
+        multi-row `INSERT ... ON CONFLICT DO UPDATE`, in one transaction:
+        open_count is added, first/last opened take the min/max, and completed_at keeps
+        the first completion. Rows: user_id, unit_id, open_count, first_opened_at,
+        last_opened_at, completed_at. Rows for units deleted meanwhile are dropped.
+        The completion summaries (crud_completion) are updated in the same transaction.
+        """
+        if not rows:
+            return 0
+        table = self.model.__table__
+        units_stmt = (
+            select(UnitModel.id, UnitModel.module_id, ModuleModel.course_id)
+            .join(ModuleModel, UnitModel.module_id == ModuleModel.id)
+            .where(UnitModel.id.in_({row["unit_id"] for row in rows}))
+        )
+        units = {unit.id: unit for unit in (await db.execute(units_stmt)).all()}
+        # Key order: concurrent flushes from several workers lock rows in the same order (no deadlocks).
+        rows = sorted((row for row in rows if row["unit_id"] in units), key=lambda row: (row["user_id"], row["unit_id"]))
+        transitions = []
+        for chunk in chunked(rows, MAX_BIND_PARAMS // 7):
+            stmt = pg_insert(table).values(list(chunk))
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.unit_id],
+                set_={
+                    "open_count": table.c.open_count + excluded.open_count,
+                    "first_opened_at": func.least(table.c.first_opened_at, excluded.first_opened_at),
+                    "last_opened_at": func.greatest(table.c.last_opened_at, excluded.last_opened_at),
+                    "completed_at": func.coalesce(table.c.completed_at, excluded.completed_at),
+                    "updated_at": func.now(),
+                },
+            ).returning(table.c.user_id, table.c.unit_id, table.c.open_count, table.c.last_opened_at, table.c.completed_at)
+            written = {(r.user_id, r.unit_id): r for r in (await db.execute(stmt)).all()}
+            for row in chunk:
+                new = written[(row["user_id"], row["unit_id"])]
+                unit = units[row["unit_id"]]
+                transitions.append({
+                    "user_id": row["user_id"], "module_id": unit.module_id, "course_id": unit.course_id,
+                    # RETURNING only shows the merged row; a count equal to this batch's delta means it was 0 before,
+                    # and a completed_at equal to this batch's means there was none (the first completion wins).
+                    "opened": int(row["open_count"] > 0 and new.open_count == row["open_count"]),
+                    "completed": int(row["completed_at"] is not None and new.completed_at == row["completed_at"]),
+                    # From the stored row, so a rebuild (crud_completion.rebuild) arrives at the same value.
+                    "activity_at": max(filter(None, (new.last_opened_at, new.completed_at)), default=None),
+                })
+        await crud_completion.apply_transitions(db, transitions=transitions)
+        await db.commit()
+        return len(rows)
+
+crud_unit_progress = CRUDUnitProgress(UnitProgressModel)
@@ -0,0 +1,83 @@
+# backend/app/crud/crud_revocation.py
+"""
+Access-token revocations: single tokens (revoked_tokens) and per-user epochs
+(user_token_epochs), plus per-user identity versions. Reads here are for synchronizing the
+in-memory revocation list (app/services/token_revocation.py); requests never query these tables.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.base_crud import delete_where_in_chunks
+from app.models.revoked_token import RevokedToken as RevokedTokenModel
+from app.models.user_token_epoch import UserTokenEpoch as UserTokenEpochModel
+
+class CRUDTokenRevocation:
+    async def revoke_token(self, db: AsyncSession, *, jti: str, user_id: int, expires_at: datetime) -> None:
+        """Idempotent: revoking the same token twice keeps the first row."""
+        await db.execute(
+            pg_insert(RevokedTokenModel)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        await db.commit()
+
+    async def revoke_all_for_user(self, db: AsyncSession, *, user_id: int, not_before: datetime) -> datetime:
+        """Moves the user's epoch forward (never back) and returns the epoch now in effect."""
+        return await self._upsert_epoch(db, user_id=user_id, column="not_before", value=not_before)
+
+    async def set_token_version(self, db: AsyncSession, *, user_id: int, token_version: int) -> int:
+        """Records that the user's identity changed (never moves back); returns the version now in effect."""
+        return await self._upsert_epoch(db, user_id=user_id, column="token_version", value=token_version)
+
+    async def _upsert_epoch(self, db: AsyncSession, *, user_id: int, column: str, value: Any) -> Any:
+        stmt = pg_insert(UserTokenEpochModel).values({"user_id": user_id, column: value})
+        current = getattr(UserTokenEpochModel, column)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={column: func.greatest(current, stmt.excluded[column]), "updated_at": func.now()}, # GREATEST skips NULLs
+        ).returning(current)
+        effective = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+        return effective
+
+    async def get_changes(
+        self, db: AsyncSession, *, since: Optional[datetime]
+    ) -> Tuple[List[Tuple[str, datetime]], List[Tuple[int, Optional[datetime], Optional[int], datetime]], datetime]:
+        """
+        Unexpired revoked tokens (jti, expires_at) and user epochs (user_id, not_before,
+        token_version, updated_at) written at or after `since` (everything when None),
+        plus the database time of the read.
+        """
+        now = (await db.execute(select(func.now()))).scalar_one()
+        tokens_stmt = select(RevokedTokenModel.jti, RevokedTokenModel.expires_at).where(RevokedTokenModel.expires_at > now)
+        epochs_stmt = select(
+            UserTokenEpochModel.user_id, UserTokenEpochModel.not_before,
+            UserTokenEpochModel.token_version, UserTokenEpochModel.updated_at,
+        )
+        if since is not None:
+            tokens_stmt = tokens_stmt.where(RevokedTokenModel.revoked_at >= since)
+            epochs_stmt = epochs_stmt.where(UserTokenEpochModel.updated_at >= since)
+        tokens = [tuple(row) for row in (await db.execute(tokens_stmt)).all()]
+        epochs = [tuple(row) for row in (await db.execute(epochs_stmt)).all()]
+        return tokens, epochs, now
+
+    async def prune_expired(self, db: AsyncSession, *, chunk_size: int, token_lifetime: timedelta) -> int:
+        """
+        Deletes revocations of tokens that have expired anyway, and user epochs unchanged for
+        longer than a token lives (every token they could apply to has expired).
+        """
+        now = datetime.now(timezone.utc)
+        return (
+            await delete_where_in_chunks(db, RevokedTokenModel, RevokedTokenModel.expires_at <= now, chunk_size=chunk_size)
+            + await delete_where_in_chunks(
+                db, UserTokenEpochModel, UserTokenEpochModel.updated_at <= now - token_lifetime, chunk_size=chunk_size
+            )
+        )
+
+
+crud_token_revocation = CRUDTokenRevocation()
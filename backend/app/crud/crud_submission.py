@@ -0,0 +1,88 @@
+# backend/app/crud/crud_submission.py
+"""
+Assignment submissions: the metadata rows of chunked uploads. The files themselves are
+written by app/services/submission_storage.py; a row's upload state (received_bytes,
+chunk_checksums) only moves forward under a row lock, so concurrent retries of the same
+chunk cannot both append it.
+"""
+from typing import List, Optional, Tuple
+import uuid
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.base_crud import CRUDBase
+from app.models.enums import UnitTypeEnum
+from app.models.module_model import Module as ModuleModel
+from app.models.submission import Submission as SubmissionModel
+from app.models.unit import Unit as UnitModel
+from app.models.user_course import UserCourse as UserCourseModel
+from app.schemas.submission_schemas import SubmissionCreate
+
+class CRUDSubmission(CRUDBase[SubmissionModel, SubmissionCreate, SubmissionCreate]):
+    def __init__(self, model):
+        super().__init__(model)
+        # The unit's type and course, if the user is enrolled in that course: one indexed join.
+        self._enrolled_unit_stmt = (
+            select(UnitModel.unit_type, ModuleModel.course_id)
+            .select_from(UnitModel)
+            .join(ModuleModel, UnitModel.module_id == ModuleModel.id)
+            .join(UserCourseModel, UserCourseModel.course_id == ModuleModel.course_id)
+            .where(UnitModel.id == bindparam("unit_id"), UserCourseModel.user_id == bindparam("user_id"))
+        )
+
+    async def get_enrolled_unit(
+        self, db: AsyncSession, *, user_id: int, unit_id: int
+    ) -> Optional[Tuple[UnitTypeEnum, uuid.UUID]]:
+        """(unit type, course id) if the user is enrolled in the unit's course, else None."""
+        row = (await db.execute(self._enrolled_unit_stmt, {"user_id": user_id, "unit_id": unit_id})).first()
+        return (row.unit_type, row.course_id) if row is not None else None
+
+    async def create_for_user(
+        self, db: AsyncSession, *, obj_in: SubmissionCreate, submission_id: uuid.UUID,
+        unit_id: int, user_id: int, chunk_size: int, storage_path: str
+    ) -> SubmissionModel:
+        db_obj = self.model(
+            id=submission_id, unit_id=unit_id, user_id=user_id, chunk_size=chunk_size,
+            storage_path=storage_path, received_bytes=0, chunk_checksums=[],
+            **obj_in.model_dump(),
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def get_for_update(self, db: AsyncSession, submission_id: uuid.UUID) -> Optional[SubmissionModel]:
+        """The row, locked until the transaction ends, with its current state (not the identity map's)."""
+        stmt = select(self.model).where(self.model.id == submission_id).with_for_update()
+        result = await db.execute(stmt.execution_options(populate_existing=True))
+        return result.scalar_one_or_none()
+
+    async def record_chunk(
+        self, db: AsyncSession, *, submission: SubmissionModel, length: int, checksum: str,
+        sha256: Optional[str] = None
+    ) -> SubmissionModel:
+        """
+        Appends one acknowledged chunk to a row locked by get_for_update and commits; with
+        `sha256` (the last chunk) the submission is also marked complete.
+        """
+        submission.received_bytes = submission.received_bytes + length
+        submission.chunk_checksums = [*submission.chunk_checksums, checksum] # New list: JSONB is not mutation-tracked
+        submission.updated_at = func.now()
+        if sha256 is not None:
+            submission.sha256 = sha256
+            submission.completed_at = func.now()
+        await db.commit()
+        await db.refresh(submission)
+        return submission
+
+    async def get_multi_for_user_in_unit(self, db: AsyncSession, *, user_id: int, unit_id: int) -> List[SubmissionModel]:
+        stmt = (
+            select(self.model)
+            .where(self.model.unit_id == unit_id, self.model.user_id == user_id)
+            .order_by(self.model.created_at.desc())
+        )
+        return (await db.execute(stmt)).scalars().all()
+
+crud_submission = CRUDSubmission(SubmissionModel)
@@ -1,28 +1,55 @@
 # backend/app/crud/crud_user.py
-from typing import Optional, Any, Type
+from typing import Optional, Any, Dict, Type, Union
 
+from sqlalchemy import bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.crud.base_crud import CRUDBase # Import the new base class
+from app.core.config import settings
+from app.crud.base_crud import CRUDBase, delete_where_in_chunks # Import the new base class
+from app.crud.batch_loader import get_loader
 from app.models.user import User as UserModel
+from app.models.user_course import UserCourse as UserCourseModel
 from app.schemas.user_schemas import UserCreate, UserUpdate
 
+# Fields copied into access tokens (app/core/security.py:identity_claims)
+IDENTITY_FIELDS = ("email", "name")
+
 class CRUDUser(CRUDBase[UserModel, UserCreate, UserUpdate]):
+    cache_ttl = settings.CACHE_USER_TTL_SECONDS # The current user is loaded on every authenticated request
+
+    def __init__(self, model: Type[UserModel]):
+        super().__init__(model)
+        # Prebuilt like CRUDBase._get_stmt; the google_sub lookup runs on every login.
+        self._by_email_stmt = select(self.model).where(self.model.email == bindparam("email"))
+        self._by_google_sub_stmt = select(self.model).where(self.model.google_sub == bindparam("google_sub"))
+
     async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[UserModel]:
         """
         Get a user by email.
         """
-        result = await db.execute(select(self.model).filter(self.model.email == email))
+        result = await db.execute(self._by_email_stmt, {"email": email})
         return result.scalars().first()
 
     async def get_by_google_sub(self, db: AsyncSession, *, google_sub: str) -> Optional[UserModel]:
         """
         Get a user by Google subject ID.
         """
-        result = await db.execute(select(self.model).filter(self.model.google_sub == google_sub))
+        result = await db.execute(self._by_google_sub_stmt, {"google_sub": google_sub})
         return result.scalars().first()
 
+    async def update(
+        self, db: AsyncSession, *, db_obj: UserModel, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> UserModel:
+        """
+        CRUDBase.update, plus a token_version bump (computed in the UPDATE, so concurrent
+        changes each count) when an identity field actually changes.
+        """
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        if any(field in update_data and update_data[field] != getattr(db_obj, field) for field in IDENTITY_FIELDS):
+            update_data["token_version"] = self.model.token_version + 1
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
     async def create_with_google(
         self, db: AsyncSession, *, google_sub: str, email: str, name: Optional[str] = None
     ) -> UserModel:
@@ -77,6 +104,20 @@ class CRUDUser(CRUDBase[UserModel, UserCreate, UserUpdate]):
             user = await self.create_with_google(db, google_sub=google_sub, email=email, name=name)
         return user
 
+    async def remove_with_cascade(self, db: AsyncSession, *, user_id: int, chunk_size: int) -> Dict[str, int]:
+        """
+        Deletes a user and their enrollments with set-based, chunked deletes instead
+        of the ORM cascade (which loads every enrollment first). A long-lived user's
+        enrollments go in short transactions before the user row itself.
+        """
+        counts = {
+            "enrollments": await delete_where_in_chunks(db, UserCourseModel, UserCourseModel.user_id == user_id, chunk_size=chunk_size),
+            "users": await delete_where_in_chunks(db, UserModel, UserModel.id == user_id, chunk_size=chunk_size),
+        }
+        get_loader(self, db).prime(user_id, None)
+        await self._invalidate_cached([user_id])
+        return counts
+
     # The generic create method from CRUDBase will be used if you call crud_user.create(db, obj_in=user_create_schema)
     # Ensure your UserCreate schema has all fields required by the UserModel constructor
     # or that your UserModel has appropriate defaults.
@@ -0,0 +1,137 @@
+# backend/app/db/instrumentation.py
+"""
+Per-request SQL instrumentation.
+
+SQLAlchemy cursor events on the engine count every statement and the time spent
+in the database, and attribute them to the `QueryStats` bound to the current
+context (one per HTTP request, see app/middleware/server_timing.py, or any block
+wrapped in `track_queries()` such as a benchmark).
+
+Structurally identical statements repeated within one unit of work are the
+signature of N+1 access patterns; `QueryStats.repeated_statements()` reports them.
+
+The same hooks feed the process-wide counters in app/core/metrics.py, and
+`InstrumentedAsyncQueuePool` times how long callers wait for a pooled connection.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+
+
+@dataclass
+class QueryStats:
+    """Statements issued (and DB time spent) by a single request or tracked block."""
+    label: str = ""
+    statement_count: int = 0
+    db_time: float = 0.0 # Seconds
+    statements: Dict[str, int] = field(default_factory=dict) # SQL text (with placeholders) -> executions
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statement_count += 1
+        self.db_time += elapsed
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most repeated first (likely N+1 patterns)."""
+        if threshold <= 0:
+            return []
+        repeated = [(sql, count) for sql, count in self.statements.items() if count >= threshold]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("lms_query_stats", default=None)
+
+_START_ATTR = "_lms_query_started_at"
+
+
+def get_current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    """
+    Collects statement counts for everything executed inside the block.
+
+        with track_queries("enroll") as stats:
+            await course_service.enroll_new_user_in_course(...)
+        print(stats.statement_count, stats.db_time)
+    """
+    stats = QueryStats(label=label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, _START_ATTR, None) if context is not None else None
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    metrics.DB_STATEMENTS.inc()
+    metrics.DB_STATEMENT_DURATION.observe(elapsed)
+    # SQLAlchemy's compiled-statement cache is the first cache on every query path.
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is CacheStats.CACHE_HIT or cache_hit is CacheStats.CACHE_MISS:
+        metrics.record_cache_access("sqlalchemy_compiled", cache_hit is CacheStats.CACHE_HIT)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """
+    Registers the cursor event listeners on the engine (idempotent).
+    SQLAlchemy runs the async engine's sync core inside greenlets that share the
+    calling task's context, so the ContextVar lookup sees the request's stats.
+    """
+    sync_engine: Engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def install_pool_metrics(engine: AsyncEngine) -> None:
+    """Samples pool occupancy into the db_pool_connections gauge at every scrape."""
+    def collect() -> None:
+        pool = engine.sync_engine.pool # Looked up per scrape: dispose() swaps in a new pool
+        if not isinstance(pool, AsyncAdaptedQueuePool):
+            return
+        metrics.DB_POOL_CONNECTIONS.labels("checked_out").set(pool.checkedout())
+        metrics.DB_POOL_CONNECTIONS.labels("checked_in").set(pool.checkedin())
+        metrics.DB_POOL_CONNECTIONS.labels("overflow").set(max(pool.overflow(), 0))
+        metrics.DB_POOL_CONNECTIONS.labels("size").set(pool.size())
+
+    metrics.REGISTRY.add_collector(collect)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited for a free
+    connection (including opening a new one when the pool is still growing).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
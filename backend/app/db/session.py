@@ -1,9 +1,11 @@
 # backend/app/db/session.py
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from typing import AsyncGenerator
 
 from app.core.config import settings # Import your Pydantic settings
+from app.db.instrumentation import InstrumentedAsyncQueuePool
 
 # Create an asynchronous SQLAlchemy engine
 # The SQLALCHEMY_DATABASE_URI is now constructed and validated in your Settings model
@@ -11,6 +13,14 @@ from app.core.config import settings # Import your Pydantic settings
 async_engine = create_async_engine(
     str(settings.SQLALCHEMY_DATABASE_URI), # Ensure it's a string
     pool_pre_ping=True,  # Check connections before use
+    poolclass=InstrumentedAsyncQueuePool, # AsyncAdaptedQueuePool + checkout wait-time metrics
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        # With the dialect's cache off (PgBouncer transaction pooling), asyncpg's own cache must be off too.
+        **({"statement_cache_size": 0} if settings.DB_PREPARED_STATEMENT_CACHE_SIZE == 0 else {}),
+    },
     # echo=True, # Set to True for debugging SQL queries (can be noisy)
     # pool_recycle=3600, # Optional: recycle connections after 1 hour
     # connect_args={"options": "-c timezone=utc"} # Example: set timezone for connection
@@ -25,11 +35,23 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+# Scope key under which a request carries a session opened by its caller (POST /batch sub-requests)
+SHARED_SESSION_SCOPE_KEY = "lms.db_session"
+
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get an SQLAlchemy asynchronous database session.
     Ensures the session is closed after the request.
+    A batch sub-request reuses its batch's session, which the batch closes.
     """
+    shared: AsyncSession = request.scope.get(SHARED_SESSION_SCOPE_KEY)
+    if shared is not None:
+        try:
+            yield shared
+        except Exception:
+            await shared.rollback() # Keep the session usable for the batch's next sub-request
+            raise
+        return
     async with AsyncSessionLocal() as session:
         try:
             print('yielding db session')
@@ -0,0 +1,174 @@
+# backend/app/db/slow_query.py
+"""
+Slow-query log with automatic EXPLAIN capture.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their parameters
+redacted and the route that issued them. For read-only statements an
+`EXPLAIN (ANALYZE, BUFFERS)` plan is then captured in the background on a
+separate, unpooled connection (inside a rolled-back transaction, with a statement
+timeout) and appended to a size-rotated plan file for later analysis.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from logging.handlers import RotatingFileHandler
+from typing import Any, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.request_context import current_route_label
+
+_START_ATTR = "_lms_slow_query_started_at"
+_READ_ONLY_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_DATA_MODIFYING_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+_PLAN_LITERAL_RE = re.compile(r"'(?:[^']|'')*'") # Plans inline bound values as quoted literals
+_EXPLAINED_MAX_ENTRIES = 1000 # Statements remembered for the cooldown (texts vary with inlined values)
+
+
+def redact_parameters(parameters: Any) -> str:
+    """Keeps the shape of the parameters (count and types) but never their values."""
+    if parameters is None:
+        return "()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: <{type(v).__name__}>" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        type_names = [type(v).__name__ for v in parameters]
+        if len(type_names) > 3 and len(set(type_names)) == 1: # Expanded IN lists
+            return f"(<{type_names[0]}> x{len(type_names)})"
+        return "(" + ", ".join(f"<{name}>" for name in type_names) + ")"
+    return f"<{type(parameters).__name__}>"
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        *,
+        database_url: str,
+        threshold_ms: float,
+        explain: bool = True,
+        plan_file: str = "logs/slow_query_plans.log",
+        plan_file_max_bytes: int = 10 * 1024 * 1024,
+        plan_file_backups: int = 5,
+        explain_timeout_ms: int = 30_000,
+        explain_cooldown_seconds: float = 300.0,
+    ):
+        self.database_url = database_url
+        self.threshold = threshold_ms / 1000.0
+        self.explain = explain
+        self.explain_timeout_ms = explain_timeout_ms
+        self.explain_cooldown = explain_cooldown_seconds
+        self._plan_file = plan_file
+        self._plan_file_max_bytes = plan_file_max_bytes
+        self._plan_file_backups = plan_file_backups
+        self._plan_logger: Optional[logging.Logger] = None
+        self._explain_engine: Optional[AsyncEngine] = None
+        self._explain_lock = asyncio.Lock() # One EXPLAIN at a time: never pile extra load onto a slow DB
+        self._last_explained: "OrderedDict[str, float]" = OrderedDict() # Oldest capture first
+        self._pending: Set[asyncio.Task] = set()
+
+    # --- Event hooks ---
+
+    def install(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        if event.contains(sync_engine, "after_cursor_execute", self._after_cursor_execute):
+            return
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, _START_ATTR, time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, _START_ATTR, None) if context is not None else None
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < self.threshold:
+            return
+        route = current_route_label()
+        sql = " ".join(statement.split())
+        print(f"WARNING: SLOW QUERY {elapsed * 1000:.1f} ms [{route}]: {sql[:1000]} params={redact_parameters(parameters)}")
+        if self.explain and not executemany:
+            self._schedule_explain(statement, parameters, elapsed, route)
+
+    # --- EXPLAIN capture ---
+
+    def _schedule_explain(self, statement: str, parameters: Any, elapsed: float, route: str) -> None:
+        if not _READ_ONLY_RE.match(statement) or _DATA_MODIFYING_RE.search(statement):
+            return # ANALYZE executes the statement; only replay reads
+        now = time.monotonic()
+        if now - self._last_explained.get(statement, float("-inf")) < self.explain_cooldown:
+            return
+        if self._explain_lock.locked():
+            return # A capture is already running; skip rather than queue
+        self._remember_explained(statement, now)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return # Executed outside an event loop (e.g. a sync script); nothing to schedule on
+        params = tuple(parameters) if isinstance(parameters, (list, tuple)) else ()
+        task = loop.create_task(self._capture_plan(statement, params, elapsed, route))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _remember_explained(self, statement: str, now: float) -> None:
+        """Records a capture; entries past their cooldown, and the oldest beyond the cap, are dropped."""
+        self._last_explained.pop(statement, None)
+        self._last_explained[statement] = now
+        while self._last_explained:
+            oldest_statement, explained_at = next(iter(self._last_explained.items()))
+            if now - explained_at < self.explain_cooldown and len(self._last_explained) <= _EXPLAINED_MAX_ENTRIES:
+                break
+            del self._last_explained[oldest_statement]
+
+    async def _capture_plan(self, statement: str, params: tuple, elapsed: float, route: str) -> None:
+        async with self._explain_lock:
+            try:
+                if self._explain_engine is None:
+                    self._explain_engine = create_async_engine(self.database_url, poolclass=NullPool)
+                async with self._explain_engine.connect() as conn:
+                    raw_connection = await conn.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection # asyncpg: statement uses $n placeholders
+                    transaction = driver_connection.transaction()
+                    await transaction.start()
+                    try:
+                        await driver_connection.execute(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                        rows = await driver_connection.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", *params)
+                    finally:
+                        await transaction.rollback()
+                plan = _PLAN_LITERAL_RE.sub("'<redacted>'", "\n".join(row[0] for row in rows))
+                self._write_plan(statement, params, elapsed, route, plan)
+            except Exception as e:
+                print(f"ERROR: Could not capture EXPLAIN for slow query [{route}]: {e}")
+
+    def _write_plan(self, statement: str, params: tuple, elapsed: float, route: str, plan: str) -> None:
+        if self._plan_logger is None:
+            directory = os.path.dirname(self._plan_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(self._plan_file, maxBytes=self._plan_file_max_bytes, backupCount=self._plan_file_backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            plan_logger = logging.getLogger("app.slow_query_plans")
+            plan_logger.setLevel(logging.INFO)
+            plan_logger.propagate = False
+            plan_logger.addHandler(handler)
+            self._plan_logger = plan_logger
+        self._plan_logger.info(
+            "duration_ms=%.1f route=%s params=%s\n%s\n%s\n%s",
+            elapsed * 1000, route, redact_parameters(params), " ".join(statement.split()), plan, "-" * 80,
+        )
+
+    async def shutdown(self) -> None:
+        for task in list(self._pending):
+            task.cancel()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._explain_engine is not None:
+            await self._explain_engine.dispose()
+            self._explain_engine = None
@@ -0,0 +1,31 @@
+# backend/app/jobs/course_jobs.py
+"""Background job handlers for course-level operations too heavy for a request."""
+from typing import Any, Dict
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.crud_course import crud_course
+from app.jobs.registry import JobContext, job_handler
+from app.services.course_events import COURSE_DELETED, course_events
+
+COURSE_DELETE = "course.delete"
+
+
+@job_handler(COURSE_DELETE)
+async def delete_course(db: AsyncSession, ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload: {"course_id": "<uuid>"}. Authorization is checked when the job is enqueued."""
+    course_id = uuid.UUID(payload["course_id"])
+    tables_done = 0
+
+    async def report(table: str, rows: int) -> None:
+        nonlocal tables_done
+        tables_done += 1
+        await ctx.report_progress(tables_done / 4, f"{table}: {rows} rows deleted")
+
+    counts = await crud_course.remove_with_cascade(
+        db, course_id=course_id, chunk_size=settings.DB_DELETE_CHUNK_SIZE, on_progress=report
+    )
+    await course_events.publish(COURSE_DELETED, course_id=course_id)
+    return {"course_id": str(course_id), "deleted": counts}
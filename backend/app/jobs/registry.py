@@ -0,0 +1,68 @@
+# backend/app/jobs/registry.py
+"""
+Job handlers by kind.
+
+A handler is an async function taking a session dedicated to the job, the job's
+context (for progress reports) and its JSON payload, and returning a JSON-able
+result (or None). Raising marks the attempt failed; it is retried with backoff
+until max_attempts is reached.
+
+    @job_handler("course.delete")
+    async def delete_course(db: AsyncSession, ctx: JobContext, payload: dict) -> dict:
+        ...
+        await ctx.report_progress(0.5, "modules deleted")
+"""
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import func, update
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import Job as JobModel
+
+
+@dataclass
+class JobContext:
+    job_id: uuid.UUID
+    kind: str
+    attempt: int
+    max_attempts: int
+    worker_id: str
+
+    async def report_progress(self, progress: float, message: Optional[str] = None) -> None:
+        """
+        Stores progress (0.0 - 1.0) for pollers. Committed on its own short session, so
+        it is visible immediately whatever the handler's own transaction is doing; it
+        also renews the job's lease.
+        """
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(JobModel)
+                .where(JobModel.id == self.job_id, JobModel.locked_by == self.worker_id)
+                .values(
+                    progress=max(0.0, min(1.0, progress)),
+                    progress_message=message,
+                    locked_at=func.now(),
+                    updated_at=func.now(),
+                )
+            )
+            await db.commit()
+
+
+JobHandler = Callable[[Any, JobContext, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(func: JobHandler) -> JobHandler:
+        if kind in _handlers:
+            raise ValueError(f"A job handler for {kind!r} is already registered")
+        _handlers[kind] = func
+        return func
+    return register
+
+
+def get_handler(kind: str) -> Optional[JobHandler]:
+    return _handlers.get(kind)
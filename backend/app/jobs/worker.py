@@ -0,0 +1,222 @@
+# backend/app/jobs/worker.py
+"""
+In-process background job runner.
+
+`JobWorker.start()` (called from the application lifespan) spawns a few asyncio
+worker tasks. Each one claims the oldest runnable row of the jobs table with
+`SELECT ... FOR UPDATE SKIP LOCKED` inside a single UPDATE, so any number of app
+instances can share the queue without double-running a job. A claimed job carries
+a lease (locked_by / locked_at) that a heartbeat renews while it runs; when an
+instance dies, its jobs are reclaimed once the lease expires.
+
+Failed attempts are retried with exponential backoff until max_attempts. On
+shutdown, workers stop claiming, running jobs get a grace period, and whatever is
+still running afterwards is put back in the queue for another instance.
+"""
+import asyncio
+import os
+import socket
+import time
+import traceback
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.jobs.registry import JobContext, get_handler
+from app.models.enums import JobStatusEnum
+from app.models.job import Job as JobModel
+
+
+class JobWorker:
+    def __init__(
+        self,
+        *,
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        lease_seconds: int = 60,
+        retry_backoff_seconds: float = 5.0,
+    ):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._run(n), name=f"job-worker-{n}") for n in range(self.concurrency)]
+        print(f"Job worker {self.worker_id} started with {self.concurrency} task(s).")
+
+    async def stop(self, grace_seconds: float = 10.0) -> None:
+        """Stops claiming; waits up to `grace_seconds` for running jobs, then cancels (re-queues) them."""
+        self._stopping = True
+        self._wakeup.set()
+        if not self._tasks:
+            return
+        _, still_running = await asyncio.wait(self._tasks, timeout=grace_seconds)
+        for task in still_running:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print(f"Job worker {self.worker_id} stopped.")
+
+    def notify(self) -> None:
+        """Wakes an idle worker right away (called after a job is enqueued in this process)."""
+        self._wakeup.set()
+
+    # --- Worker loop ---
+
+    async def _run(self, n: int) -> None:
+        while not self._stopping:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"ERROR: Job worker {n} could not claim a job: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            await self._execute(job)
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        # Queued jobs that are due, plus running jobs whose lease expired (dead worker).
+        claimable = (
+            select(JobModel.id)
+            .where(
+                or_(
+                    and_(JobModel.status == JobStatusEnum.queued, JobModel.run_after <= func.now()),
+                    and_(JobModel.status == JobStatusEnum.running, JobModel.locked_at < func.now() - self.lease),
+                )
+            )
+            .order_by(JobModel.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(JobModel)
+            .where(JobModel.id == claimable)
+            .values(
+                status=JobStatusEnum.running,
+                attempts=JobModel.attempts + 1,
+                locked_by=self.worker_id,
+                locked_at=func.now(),
+                started_at=func.coalesce(JobModel.started_at, func.now()),
+                updated_at=func.now(),
+            )
+            .returning(JobModel.id, JobModel.kind, JobModel.payload, JobModel.attempts, JobModel.max_attempts)
+        )
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(stmt)).mappings().first()
+            await db.commit()
+        return dict(row) if row else None
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        ctx = JobContext(
+            job_id=job["id"], kind=job["kind"], attempt=job["attempts"],
+            max_attempts=job["max_attempts"], worker_id=self.worker_id,
+        )
+        if ctx.attempt > ctx.max_attempts: # Reclaimed after its last attempt's worker died
+            await self._finish(ctx, JobStatusEnum.failed, error="Lease expired on the final attempt (worker lost).")
+            metrics.JOBS_FINISHED.labels(ctx.kind, "failed").inc()
+            return
+        handler = get_handler(ctx.kind)
+        if handler is None:
+            await self._finish(ctx, JobStatusEnum.failed, error=f"No handler registered for job kind {ctx.kind!r}.")
+            metrics.JOBS_FINISHED.labels(ctx.kind, "failed").inc()
+            return
+
+        print(f"DEBUG: Job {ctx.job_id} ({ctx.kind}) attempt {ctx.attempt}/{ctx.max_attempts} started on {self.worker_id}")
+        heartbeat = asyncio.create_task(self._heartbeat(ctx))
+        metrics.JOBS_RUNNING.inc()
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await handler(db, ctx, job["payload"] or {})
+            await self._finish(ctx, JobStatusEnum.succeeded, result=result)
+            metrics.JOBS_FINISHED.labels(ctx.kind, "succeeded").inc()
+            print(f"DEBUG: Job {ctx.job_id} ({ctx.kind}) succeeded in {time.perf_counter() - started:.2f}s")
+        except asyncio.CancelledError:
+            # Shutdown past the grace period: hand the job back without using up an attempt.
+            await asyncio.shield(self._release(ctx))
+            raise
+        except Exception as e:
+            print(f"ERROR: Job {ctx.job_id} ({ctx.kind}) attempt {ctx.attempt} failed: {e}")
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+            if ctx.attempt < ctx.max_attempts:
+                await self._retry_later(ctx, error)
+                metrics.JOBS_FINISHED.labels(ctx.kind, "retried").inc()
+            else:
+                await self._finish(ctx, JobStatusEnum.failed, error=error)
+                metrics.JOBS_FINISHED.labels(ctx.kind, "failed").inc()
+        finally:
+            heartbeat.cancel()
+            metrics.JOBS_RUNNING.dec()
+            metrics.JOB_DURATION.labels(ctx.kind).observe(time.perf_counter() - started)
+
+    async def _heartbeat(self, ctx: JobContext) -> None:
+        interval = max(self.lease.total_seconds() / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._update_own(ctx, locked_at=func.now())
+            except Exception as e:
+                print(f"ERROR: Heartbeat for job {ctx.job_id} failed: {e}")
+
+    # --- State transitions (only while this worker still holds the lease) ---
+
+    async def _update_own(self, ctx: JobContext, **values: Any) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(JobModel)
+                .where(JobModel.id == ctx.job_id, JobModel.locked_by == self.worker_id)
+                .values(updated_at=func.now(), **values)
+            )
+            await db.commit()
+
+    async def _finish(self, ctx: JobContext, status: JobStatusEnum, *, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        values: Dict[str, Any] = dict(status=status, locked_by=None, locked_at=None, finished_at=func.now())
+        if status == JobStatusEnum.succeeded:
+            values.update(progress=1.0, result=result, error=None)
+        else:
+            values.update(error=error)
+        await self._update_own(ctx, **values)
+
+    async def _retry_later(self, ctx: JobContext, error: str) -> None:
+        delay = timedelta(seconds=self.retry_backoff_seconds * 2 ** (ctx.attempt - 1))
+        await self._update_own(
+            ctx, status=JobStatusEnum.queued, error=error,
+            locked_by=None, locked_at=None, run_after=func.now() + delay,
+        )
+
+    async def _release(self, ctx: JobContext) -> None:
+        try:
+            await self._update_own(
+                ctx, status=JobStatusEnum.queued, attempts=JobModel.attempts - 1,
+                locked_by=None, locked_at=None, run_after=func.now(),
+            )
+        except Exception as e:
+            print(f"ERROR: Could not re-queue job {ctx.job_id} on shutdown (its lease will expire instead): {e}")
+
+
+job_worker = JobWorker(
+    concurrency=settings.JOBS_CONCURRENCY,
+    poll_interval=settings.JOBS_POLL_INTERVAL_SECONDS,
+    lease_seconds=settings.JOBS_LEASE_SECONDS,
+    retry_backoff_seconds=settings.JOBS_RETRY_BACKOFF_SECONDS,
+) # Started from the application lifespan when JOBS_ENABLED
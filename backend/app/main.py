@@ -1,9 +1,27 @@
 # backend/app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
+import asyncio
+import traceback
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from contextlib import asynccontextmanager
 from app.api.v1.api_v1 import api_router as api_v1_router
+from app.db.session import async_engine
+from app.core import metrics
+from app.core.warmup import run_warmup
+from app.core.cache import get_cache
+from app.core.redis_client import close_redis
+from app.jobs import course_jobs # Registers the course job handlers
+from app.jobs.worker import job_worker
+from app.services.progress_buffer import progress_buffer
+from app.services.activity_log import activity_log
+from app.services.course_events import course_events
+from app.services.token_revocation import token_revocations
+from app.db import instrumentation
+from app.db.slow_query import SlowQueryLog
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
 
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI):
@@ -13,13 +31,64 @@ async def lifespan(app_instance: FastAPI):
         print("API docs are disabled.")
     else:
         print(f"API docs available at: {settings.API_V1_STR}/docs and {settings.API_V1_STR}/redoc")
-    
+
+    app_instance.state.ready = False
+    app_instance.state.warmup_seconds = None
+    warmup_task = None
+    if not settings.WARMUP_ENABLED:
+        app_instance.state.ready = True
+    elif settings.WARMUP_BLOCKING:
+        await warm_up(app_instance)
+    else:
+        warmup_task = asyncio.create_task(warm_up(app_instance))
+        print("Warm-up running in the background; /health reports 503 until it finishes.")
+
+    get_cache().start() # Invalidation listener
+    await token_revocations.start() # Tokens are rejected (503) until its first load succeeds
+    if settings.JOBS_ENABLED:
+        job_worker.start()
+    progress_buffer.start()
+    if settings.ACTIVITY_LOG_ENABLED:
+        activity_log.start()
+    if settings.COURSE_EVENTS_ENABLED:
+        course_events.start()
+
     print(f"--- Lifespan Event: Startup Complete. Application is ready. ---")
     yield # This is where the application runs
     
     print(f"--- Lifespan Event: Application Shutdown ---")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    if settings.COURSE_EVENTS_ENABLED:
+        await course_events.stop()
+    if settings.JOBS_ENABLED:
+        await job_worker.stop(grace_seconds=settings.JOBS_SHUTDOWN_GRACE_SECONDS)
+    await progress_buffer.stop() # Final flush: buffered progress events are written before exit
+    if settings.ACTIVITY_LOG_ENABLED:
+        await activity_log.stop() # Writes the events still queued
+    await get_cache().stop()
+    await token_revocations.stop()
+    if slow_query_log is not None:
+        await slow_query_log.shutdown()
+    await close_redis()
     print(f"--- Lifespan Event: Shutdown Complete. ---")
 
+async def warm_up(app_instance: FastAPI):
+    """Runs the startup warm-up and flips the readiness flag. Failures are logged, never fatal."""
+    print(f"--- Lifespan Event: Warm-up started ---")
+    try:
+        timings = await run_warmup(
+            async_engine, db_connections=min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)
+        )
+        app_instance.state.warmup_seconds = round(timings["total"], 3)
+        phases = ", ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in timings.items() if phase != "total")
+        print(f"--- Lifespan Event: Warm-up finished in {timings['total'] * 1000:.0f} ms ({phases}) ---")
+    except Exception as e:
+        print(f"ERROR: Warm-up failed, continuing without it: {e}")
+        traceback.print_exc()
+    finally:
+        app_instance.state.ready = True
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.SHOW_DOCS else None,
@@ -39,18 +108,63 @@ if settings.BACKEND_CORS_ORIGINS_STR_LIST:
         allow_headers=[
             "Accept", "Accept-Language", "Content-Language", "Content-Type",
             "Authorization", "X-Requested-With",
+            "X-Chunk-SHA256", # PUT /submissions/{id}/chunks/{index}
         ],
-        expose_headers=["Content-Disposition"],
+        expose_headers=["Content-Disposition", "Server-Timing", "X-DB-Repeated-Statements", "X-Total-Count", "X-Total-Count-Exact"],
         max_age=600,
     )
 else:
     print("CORS: No specific origins configured. CORSMiddleware not added with specific origins.")
 
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    instrumentation.install_query_hooks(async_engine)
+    app.add_middleware(ServerTimingMiddleware, n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD)
+    print(f"SQL instrumentation enabled (N+1 threshold: {settings.SQL_N_PLUS_ONE_THRESHOLD}).")
+
+if settings.METRICS_ENABLED:
+    instrumentation.install_query_hooks(async_engine)
+    instrumentation.install_pool_metrics(async_engine)
+    app.add_middleware(MetricsMiddleware)
+
+slow_query_log = None
+if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    slow_query_log = SlowQueryLog(
+        database_url=str(settings.SQLALCHEMY_DATABASE_URI),
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        plan_file=settings.SLOW_QUERY_PLAN_FILE,
+        plan_file_max_bytes=settings.SLOW_QUERY_PLAN_FILE_MAX_BYTES,
+        plan_file_backups=settings.SLOW_QUERY_PLAN_FILE_BACKUPS,
+        explain_timeout_ms=settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+        explain_cooldown_seconds=settings.SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS,
+    )
+    slow_query_log.install(async_engine)
+    print(f"Slow-query log enabled (threshold: {settings.SLOW_QUERY_THRESHOLD_MS} ms, plans: {settings.SLOW_QUERY_PLAN_FILE}).")
+
+app.add_middleware(RequestContextMiddleware) # Outermost: lets SQL hooks see the current route
+
 app.include_router(api_v1_router, prefix=settings.API_V1_STR)
 
 @app.get("/health", tags=["Health"])
-async def health_check():
-    return {"status": "ok", "message": f"{settings.PROJECT_NAME} is healthy!"}
+async def health_check(response: Response):
+    if not getattr(app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting", "message": f"{settings.PROJECT_NAME} is warming up."}
+    if not token_revocations.loaded:
+        # Tokens are rejected until the revocation list loads (app/services/token_revocation.py).
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting", "message": f"{settings.PROJECT_NAME} is loading token revocations."}
+    return {
+        "status": "ok",
+        "message": f"{settings.PROJECT_NAME} is healthy!",
+        "warmup_seconds": getattr(app.state, "warmup_seconds", None), # None if the warm-up failed
+    }
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics_endpoint():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.get("/", tags=["Root"], include_in_schema=False)
 async def read_root():
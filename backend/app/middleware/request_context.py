@@ -0,0 +1,21 @@
+# backend/app/middleware/request_context.py
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import request_context
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware binding the current HTTP scope (see app/core/request_context.py)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_context.bind_scope(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_context.reset_scope(token)
@@ -0,0 +1,55 @@
+# backend/app/middleware/server_timing.py
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db import instrumentation
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware that binds a QueryStats to every HTTP request and reports it:
+    - a `Server-Timing` header with DB time / statement count and total app time,
+    - an `X-DB-Repeated-Statements` header plus a log line when the same statement
+      runs `n_plus_one_threshold` times or more within the request (likely N+1).
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 3):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with instrumentation.track_queries(label=f"{scope['method']} {scope['path']}") as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statement_count} statements", app;dur={total_ms:.2f}',
+                    )
+                    repeated = stats.repeated_statements(self.n_plus_one_threshold)
+                    if repeated:
+                        headers.append("X-DB-Repeated-Statements", str(len(repeated)))
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        self._report_repeated_statements(scope, stats)
+
+    def _report_repeated_statements(self, scope: Scope, stats: instrumentation.QueryStats) -> None:
+        repeated = stats.repeated_statements(self.n_plus_one_threshold)
+        if not repeated:
+            return
+        route = scope.get("route")
+        route_path = getattr(route, "path", scope["path"])
+        print(f"WARNING: Possible N+1 in {scope['method']} {route_path}: {stats.statement_count} statements, {len(repeated)} repeated")
+        for sql, count in repeated:
+            print(f"  x{count}: {' '.join(sql.split())[:200]}")
@@ -1,8 +1,16 @@
 # backend/app/models/__init__.py
 from .base_class import Base
-from .enums import UserRoleEnum, UnitTypeEnum, UserCourseRoleEnum
+from .enums import UserRoleEnum, UnitTypeEnum, UserCourseRoleEnum, JobStatusEnum
 from .user import User
 from .course import Course
 from .user_course import UserCourse
 from .module_model import Module
-from .unit import Unit
\ No newline at end of file
+from .unit import Unit
+from .job import Job
+from .unit_progress import UnitProgress
+from .course_completion import CourseCompletion
+from .module_completion import ModuleCompletion
+from .activity_event import ActivityEvent
+from .revoked_token import RevokedToken
+from .user_token_epoch import UserTokenEpoch
+from .submission import Submission
\ No newline at end of file
@@ -0,0 +1,32 @@
+# backend/app/models/activity_event.py
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from .base_class import Base
+
+class ActivityEvent(Base):
+    """
+    Append-only learning activity trail (logins, views, enrollments, submissions).
+
+    Range-partitioned by month on occurred_at: inserts only touch the current month's
+    partition and retention drops whole partitions instead of deleting rows. Partitions
+    are created and dropped by app/services/activity_log.py. No foreign keys on purpose:
+    the trail outlives the users, courses and units it mentions.
+    """
+    __tablename__ = "activity_events"
+    __table_args__ = (
+        Index("ix_activity_events_user_id_occurred_at", "user_id", "occurred_at"),
+        Index("ix_activity_events_course_id_occurred_at", "course_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime(timezone=True), primary_key=True) # Partition key, so part of the primary key
+    event_type = Column(String(64), nullable=False)
+    user_id = Column(Integer, nullable=True)
+    course_id = Column(UUID(as_uuid=True), nullable=True)
+    unit_id = Column(Integer, nullable=True)
+    data = Column(JSONB, nullable=True)
+
+    def __repr__(self):
+        return f"<ActivityEvent(id={self.id}, event_type={self.event_type!r}, user_id={self.user_id}, occurred_at={self.occurred_at})>"
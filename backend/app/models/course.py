@@ -1,5 +1,5 @@
 # backend/app/models/course.py
-from sqlalchemy import Column, Text, ForeignKey, Integer # Added ForeignKey, Integer for example
+from sqlalchemy import Column, Index, Text, ForeignKey, Integer # Added ForeignKey, Integer for example
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -9,6 +9,9 @@ from .base_class import Base
 
 class Course(Base):
     __tablename__ = 'courses'
+    __table_args__ = (
+        Index("ix_courses_name", "name"), # Course lists are ordered by name
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(Text, nullable=False)
@@ -19,13 +22,15 @@ class Course(Base):
     user_associations = relationship(
         "UserCourse",
         back_populates="course",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True # Enrollments go with ON DELETE CASCADE; don't load them just to delete them
     )
 
     modules = relationship(
         "Module",
         back_populates="course",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Module.order"
     )
 
@@ -0,0 +1,24 @@
+# backend/app/models/course_completion.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base_class import Base
+
+class CourseCompletion(Base):
+    """
+    Per-(course, user) rollup of unit_progress: how many of the course's units the user has
+    opened and completed. Maintained incrementally in the same transaction as each progress
+    flush (app/crud/crud_completion.py) and recomputable with scripts/rebuild_completion_summaries.py.
+    Totals are not stored; percentages divide by the live unit count.
+    """
+    __tablename__ = "course_completion"
+
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    units_opened = Column(Integer, nullable=False, default=0)
+    units_completed = Column(Integer, nullable=False, default=0)
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<CourseCompletion(course_id={self.course_id}, user_id={self.user_id}, units_completed={self.units_completed})>"
@@ -18,4 +18,11 @@ class UnitTypeEnum(enum.Enum):
 class UserCourseRoleEnum(enum.Enum):
     teacher = "teacher"
     student = "student"
-    # Add other roles if needed, e.g., teaching_assistant
\ No newline at end of file
+    # Add other roles if needed, e.g., teaching_assistant
+
+# Lifecycle of a row in the jobs table (app/jobs/worker.py)
+class JobStatusEnum(enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
@@ -0,0 +1,54 @@
+# backend/app/models/job.py
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, Enum as SQLAlchemyEnum, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+import uuid
+
+from .base_class import Base
+from .enums import JobStatusEnum
+
+class Job(Base):
+    """
+    A unit of background work, claimed by the in-process workers (app/jobs/worker.py)
+    of any app instance with SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(100), nullable=False) # Handler name, see app/jobs/registry.py
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(
+        SQLAlchemyEnum(JobStatusEnum, name="job_status_enum", create_type=False),
+        nullable=False,
+        default=JobStatusEnum.queued
+    )
+
+    attempts = Column(Integer, nullable=False, default=0) # Incremented on every claim
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now()) # Retry backoff
+    progress = Column(Float, nullable=False, default=0.0) # 0.0 - 1.0
+    progress_message = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True) # Last failure, kept while retrying
+
+    # Lease: a running job whose locked_at is older than JOBS_LEASE_SECONDS is reclaimed
+    # (its worker died); workers refresh it while the job runs.
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The claim query only ever looks at unfinished jobs.
+        Index(
+            "ix_jobs_claimable", "status", "run_after",
+            postgresql_where=status.in_([JobStatusEnum.queued, JobStatusEnum.running])
+        ),
+    )
+
+    def __repr__(self):
+        status_value = self.status.value if self.status else None
+        return f"<Job(id={self.id}, kind={self.kind!r}, status={status_value!r}, attempts={self.attempts})>"
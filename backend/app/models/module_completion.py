@@ -0,0 +1,21 @@
+# backend/app/models/module_completion.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base_class import Base
+
+class ModuleCompletion(Base):
+    """Per-(module, user) rollup of unit_progress; see CourseCompletion."""
+    __tablename__ = "module_completion"
+
+    module_id = Column(Integer, ForeignKey("modules.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    # Denormalized so a course's analytics read one index range instead of joining modules
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
+    units_opened = Column(Integer, nullable=False, default=0)
+    units_completed = Column(Integer, nullable=False, default=0)
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<ModuleCompletion(module_id={self.module_id}, user_id={self.user_id}, units_completed={self.units_completed})>"
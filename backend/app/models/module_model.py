@@ -1,5 +1,5 @@
 # backend/app/models/module_model.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -7,19 +7,24 @@ from .base_class import Base
 
 class Module(Base):
     __tablename__ = "modules"
+    __table_args__ = (
+        # A course's outline: modules by course, already in display order
+        Index("ix_modules_course_id_order", "course_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     order = Column(Integer, nullable=False, default=0)
 
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     course = relationship("Course", back_populates="modules")
 
     units = relationship(
         "Unit",
         back_populates="module",
         cascade="all, delete-orphan",
+        passive_deletes=True, # Units go with ON DELETE CASCADE; don't load them just to delete them
         order_by="Unit.order"
     )
 
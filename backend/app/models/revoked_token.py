@@ -0,0 +1,20 @@
+# backend/app/models/revoked_token.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+
+from .base_class import Base
+
+class RevokedToken(Base):
+    """
+    One access token revoked before it expired (server-side logout), by its `jti` claim.
+    Rows are only needed until the token would have expired anyway and are pruned after
+    that. Requests check an in-memory copy (app/services/token_revocation.py), never this table.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti!r}, user_id={self.user_id})>"
@@ -0,0 +1,55 @@
+# backend/app/models/submission.py
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+import uuid
+
+from .base_class import Base
+
+class Submission(Base):
+    """
+    A student's file for an ASSIGNMENT unit, uploaded in fixed-size chunks
+    (app/services/submission_service.py). The file itself lives on local disk under
+    SUBMISSIONS_DIR; this row records who submitted it, for which unit, where it is
+    stored and how far the upload got, so an interrupted upload resumes at next_chunk.
+    """
+    __tablename__ = "submissions"
+    __table_args__ = (
+        # A unit's submissions, and one student's submissions for a unit
+        Index("ix_submissions_unit_id_user_id", "unit_id", "user_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    unit_id = Column(Integer, ForeignKey("units.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    filename = Column(String(255), nullable=False) # As named by the student; never used as a path
+    content_type = Column(String(255), nullable=True)
+    size_bytes = Column(BigInteger, nullable=False) # Declared when the upload starts
+    chunk_size = Column(Integer, nullable=False) # Every chunk but the last has exactly this size
+    storage_path = Column(Text, nullable=False) # Relative to SUBMISSIONS_DIR
+
+    # Upload state: chunks are accepted in order, so received_bytes is always
+    # len(chunk_checksums) * chunk_size (the last chunk may be shorter).
+    received_bytes = Column(BigInteger, nullable=False, default=0)
+    chunk_checksums = Column(JSONB, nullable=False, default=list) # SHA-256 (hex) of each chunk received
+    sha256 = Column(String(64), nullable=True) # Of the whole file, once complete
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.size_bytes // self.chunk_size)
+
+    @property
+    def next_chunk(self) -> int:
+        """Index of the chunk to send next (== chunk_count once complete)."""
+        return len(self.chunk_checksums or [])
+
+    @property
+    def completed(self) -> bool:
+        return self.completed_at is not None
+
+    def __repr__(self):
+        return f"<Submission(id={self.id}, unit_id={self.unit_id}, user_id={self.user_id}, received={self.received_bytes}/{self.size_bytes})>"
@@ -1,5 +1,5 @@
 # backend/app/models/unit.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Index, Integer, String, Text, ForeignKey, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 
 from .base_class import Base
@@ -7,6 +7,10 @@ from .enums import UnitTypeEnum
 
 class Unit(Base):
     __tablename__ = "units"
+    __table_args__ = (
+        # A module's units, already in display order
+        Index("ix_units_module_id_order", "module_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -18,7 +22,7 @@ class Unit(Base):
     content = Column(Text, nullable=True)
     order = Column(Integer, nullable=False, default=0)
 
-    module_id = Column(Integer, ForeignKey("modules.id"), nullable=False)
+    module_id = Column(Integer, ForeignKey("modules.id", ondelete="CASCADE"), nullable=False)
     module = relationship("Module", back_populates="units")
 
     def __repr__(self):
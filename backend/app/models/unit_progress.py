@@ -0,0 +1,22 @@
+# backend/app/models/unit_progress.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+
+from .base_class import Base
+
+class UnitProgress(Base):
+    """
+    One row per (user, unit) the user has interacted with. Written in coalesced batches
+    by the progress write-behind buffer (app/services/progress_buffer.py), never per event.
+    """
+    __tablename__ = "unit_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unit_id = Column(Integer, ForeignKey("units.id", ondelete="CASCADE"), primary_key=True, index=True)
+    open_count = Column(Integer, nullable=False, default=0)
+    first_opened_at = Column(DateTime(timezone=True), nullable=True)
+    last_opened_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True) # Set once, by the first completion
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<UnitProgress(user_id={self.user_id}, unit_id={self.unit_id}, completed={self.completed_at is not None})>"
@@ -11,13 +11,17 @@ class User(Base):
     google_sub = Column(String(255), unique=True, index=True, nullable=False)
     email = Column(String(255), unique=True, index=True, nullable=False)
     name = Column(String(255), nullable=True)
+    # Bumped whenever a field copied into access tokens (email, name) changes; tokens with an
+    # older snapshot are reissued on their next use (see app/services/token_revocation.py).
+    token_version = Column(Integer, nullable=False, default=1, server_default="1")
     # is_active = Column(Boolean, default=True) # Example
     # is_superuser = Column(Boolean, default=False) # Example
 
     course_associations = relationship(
         "UserCourse",
         back_populates="user",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True # Enrollments go with ON DELETE CASCADE; don't load them just to delete them
     )
 
     def __repr__(self):
@@ -1,5 +1,5 @@
 # backend/app/models/user_course.py
-from sqlalchemy import Column, Integer, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Index, Integer, ForeignKey, Enum as SQLAlchemyEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,11 @@ from .enums import UserCourseRoleEnum
 
 class UserCourse(Base):
     __tablename__ = "user_courses"
+    __table_args__ = (
+        # The primary key (user_id, course_id) serves a user's courses and enrollment checks;
+        # this one serves the course side: rosters (by role), student counts, event fan-out.
+        Index("ix_user_courses_course_id_role", "course_id", "role"),
+    )
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
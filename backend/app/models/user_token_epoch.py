@@ -0,0 +1,24 @@
+# backend/app/models/user_token_epoch.py
+from sqlalchemy import Column, DateTime, Integer, func
+
+from .base_class import Base
+
+class UserTokenEpoch(Base):
+    """
+    Per-user access-token state, one row per user who ever needed one:
+    - not_before: "log out everywhere"; every token of the user issued before it is rejected
+    - token_version: the user's identity version (users.token_version) since it last changed;
+      tokens carrying an older identity snapshot are reissued on their next use
+    Both only move forward. No foreign key on purpose: the row outlives a deleted user, so
+    that user's tokens stay rejected until they expire; rows are pruned after the longest
+    token lifetime.
+    """
+    __tablename__ = "user_token_epochs"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    not_before = Column(DateTime(timezone=True), nullable=True)
+    token_version = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<UserTokenEpoch(user_id={self.user_id}, not_before={self.not_before}, token_version={self.token_version})>"
@@ -17,6 +17,7 @@ from .user_schemas import (
     UserCreate,
     UserUpdate,
     UserOut,
+    CurrentIdentity,
     UserWithCourses,
     UserForCourseResponse,
     UserRole
@@ -27,8 +28,10 @@ from .course_schemas import (
     CourseBase,
     CourseCreate,
     CourseUpdate,
+    CourseClone,
     CourseOut,
-    CourseForUserResponse
+    CourseForUserResponse,
+    CourseView
 )
 
 # Module Schemas
@@ -57,6 +60,40 @@ from .user_course_schemas import (
     UserCourseRole
 )
 
+# Background job Schemas
+from .job_schemas import (
+    JobOut,
+    JobStatus
+)
+
+# Unit Progress Schemas
+from .progress_schemas import (
+    ProgressEvent,
+    ProgressEventIn,
+    UnitProgressOut
+)
+
+# Course Analytics Schemas
+from .analytics_schemas import (
+    CourseAnalyticsOut,
+    ModuleCompletionOut,
+    StudentCompletionOut
+)
+
+# Batch Schemas
+from .batch_schemas import (
+    BatchRequest,
+    BatchRequestItem,
+    BatchResponse,
+    BatchResponseItem
+)
+
+# Submission Schemas
+from .submission_schemas import (
+    SubmissionCreate,
+    SubmissionOut
+)
+
 # --- Update forward references for Pydantic v2 ---
 # Call .model_rebuild() on schemas that use forward references
 # or are part of nested structures that might be affected.
@@ -0,0 +1,40 @@
+# backend/app/schemas/analytics_schemas.py
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+# --- Per-student completion within one course ---
+class StudentCompletionOut(BaseModel):
+    user_id: int
+    name: Optional[str] = None
+    email: EmailStr
+    units_opened: int = 0
+    units_completed: int = 0
+    completion: float = 0.0 # units_completed / course unit count, 0.0 - 1.0
+    last_activity_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Class-wide completion of one module ---
+class ModuleCompletionOut(BaseModel):
+    module_id: int
+    title: str
+    order: int
+    unit_count: int
+    students_started: int = 0
+    students_completed: int = 0
+    average_completion: float = 0.0 # Mean over all enrolled students, 0.0 - 1.0
+
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Course analytics (teacher dashboard) ---
+class CourseAnalyticsOut(BaseModel):
+    course_id: uuid.UUID
+    unit_count: int
+    student_count: int
+    students_started: int = 0
+    students_completed: int = 0
+    average_completion: float = 0.0
+    modules: List[ModuleCompletionOut] = []
+    students: List[StudentCompletionOut] = [] # One page, ordered by name (skip / limit)
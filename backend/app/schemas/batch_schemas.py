@@ -0,0 +1,21 @@
+# backend/app/schemas/batch_schemas.py
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+# --- POST /batch: several API reads in one HTTP request ---
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = None # Echoed back on the matching response
+    method: Literal["GET"] = "GET" # Reads only
+    path: str # e.g. "/courses?include=modules", relative to the API prefix (or absolute)
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1)
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None # Decoded JSON, or text for other content types
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem] # Same order as the requests
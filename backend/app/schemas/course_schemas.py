@@ -1,6 +1,7 @@
 # backend/app/schemas/course_schemas.py
 from pydantic import BaseModel, ConfigDict # Import ConfigDict for Pydantic v2
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional
 import uuid
 
 # Assuming UserRole is the Pydantic enum defined in user_schemas.py
@@ -29,6 +30,12 @@ class CourseUpdate(BaseModel):
     # If this schema is also used with from_attributes, add model_config
     # model_config = ConfigDict(from_attributes=True)
 
+class CourseClone(BaseModel):
+    # Defaults to the source course's name/description when omitted
+    name: Optional[str] = None
+    description: Optional[str] = None
+    copy_teachers: bool = True # Enroll the source course's teachers in the copy (students are never copied)
+
 class CourseOut(CourseBase): # Inherits name, description, and model_config from CourseBase
     id: uuid.UUID
     
@@ -48,3 +55,47 @@ class CourseForUserResponse(CourseBase): # Inherits name, description, and model
     modules: List["ModuleOut"] = [] # Optionally include modules here if you want them in this specific response
 
     # model_config is inherited from CourseBase
+
+
+# --- Sparse fieldsets for CourseOut (?fields=...&include=...) ---
+COURSE_FIELDS = ("id", "name", "description", "user_associations", "modules")
+COURSE_INCLUDES = ("user_associations", "modules", "modules.units") # Relationships, in load order
+
+
+@dataclass(frozen=True)
+class CourseView:
+    """
+    Which parts of a CourseOut a request asked for. `include` names the relationships
+    crud_course loads (anything else is never queried); `fields` the top-level keys
+    serialized. A relationship is loaded only if it is both included and in `fields`.
+    """
+    fields: FrozenSet[str] = frozenset(COURSE_FIELDS)
+    include: FrozenSet[str] = frozenset(COURSE_INCLUDES)
+
+    @classmethod
+    def parse(cls, fields: Optional[str] = None, include: Optional[str] = None) -> "CourseView":
+        """Comma-separated lists; omitted means everything, an empty `include` means no relationships."""
+        def names(value: str, allowed: tuple, param: str) -> FrozenSet[str]:
+            parsed = frozenset(n.strip() for n in value.split(",") if n.strip())
+            unknown = parsed - set(allowed)
+            if unknown:
+                raise ValueError(f"Unknown {param} {sorted(unknown)}; expected any of {list(allowed)}")
+            return parsed
+        selected = names(fields, COURSE_FIELDS, "fields") | {"id"} if fields is not None else frozenset(COURSE_FIELDS)
+        included = names(include, COURSE_INCLUDES, "include") if include is not None else frozenset(COURSE_INCLUDES)
+        if "modules.units" in included:
+            included |= {"modules"}
+        # Never load what is not serialized
+        included = frozenset(n for n in included if n.split(".")[0] in selected)
+        return cls(fields=selected - (set(COURSE_INCLUDES) - included), include=included)
+
+    @property
+    def is_full(self) -> bool:
+        return self == CourseView()
+
+    def dump(self, course: Any) -> Dict[str, Any]:
+        """JSON-ready dict of `course`, whose relationships outside `include` must be noloaded (empty)."""
+        exclude: Dict[str, Any] = {name: True for name in COURSE_FIELDS if name not in self.fields}
+        if "modules" in self.include and "modules.units" not in self.include:
+            exclude["modules"] = {"__all__": {"units"}}
+        return CourseOut.model_validate(course).model_dump(mode="json", exclude=exclude)
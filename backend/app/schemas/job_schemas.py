@@ -0,0 +1,33 @@
+# backend/app/schemas/job_schemas.py
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional
+from datetime import datetime
+import uuid
+import enum
+
+# Import enums from the models package
+from app.models.enums import JobStatusEnum as ModelJobStatusEnum
+
+# Pydantic compatible Enum
+class JobStatus(str, enum.Enum):
+    QUEUED = ModelJobStatusEnum.queued.value
+    RUNNING = ModelJobStatusEnum.running.value
+    SUCCEEDED = ModelJobStatusEnum.succeeded.value
+    FAILED = ModelJobStatusEnum.failed.value
+
+# --- Schema for polling a background job ---
+class JobOut(BaseModel):
+    id: uuid.UUID
+    kind: str
+    status: JobStatus
+    progress: float
+    progress_message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
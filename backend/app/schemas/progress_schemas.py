@@ -0,0 +1,25 @@
+# backend/app/schemas/progress_schemas.py
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+import enum
+
+# Pydantic compatible Enum (events only; nothing is stored per event)
+class ProgressEvent(str, enum.Enum):
+    OPENED = "opened"
+    COMPLETED = "completed"
+
+# --- Schema for Recording an Event ---
+class ProgressEventIn(BaseModel):
+    event: ProgressEvent
+
+# --- Schema for Output/Response ---
+class UnitProgressOut(BaseModel):
+    unit_id: int
+    open_count: int = 0
+    first_opened_at: Optional[datetime] = None
+    last_opened_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    completed: bool = False
+
+    model_config = ConfigDict(from_attributes=True)
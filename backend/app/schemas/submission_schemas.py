@@ -0,0 +1,31 @@
+# backend/app/schemas/submission_schemas.py
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+# --- Schema for starting an upload ---
+class SubmissionCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: Optional[str] = Field(None, max_length=255)
+    size_bytes: int = Field(..., gt=0) # Total size of the file to be uploaded
+
+# --- Schema for Output/Response (also the resume state of an upload) ---
+class SubmissionOut(BaseModel):
+    id: uuid.UUID
+    unit_id: int
+    user_id: int
+    filename: str
+    content_type: Optional[str] = None
+    size_bytes: int
+    chunk_size: int
+    chunk_count: int
+    received_bytes: int
+    next_chunk: int # Resume the upload by sending this chunk (== chunk_count when complete)
+    chunk_checksums: List[str] = [] # SHA-256 (hex) of every chunk received, in order
+    sha256: Optional[str] = None # Of the whole file, once complete
+    completed: bool = False
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -18,9 +18,13 @@ class TokenPayload(BaseModel):
     sub: Optional[str] = None # Subject (user identifier, e.g., user ID)
     # You can add other claims you put in your JWT payload, like email, name, roles etc.
     # user_id: Optional[int] = None # Redundant if 'sub' is user_id
-    # exp: Optional[int] = None # Expiration time (handled by JWT library during creation/validation)
-    # iat: Optional[int] = None # Issued at time (handled by JWT library)
-    # jti: Optional[str] = None # JWT ID (handled by JWT library)
+    exp: Optional[float] = None # Expiration time (validated by the JWT library)
+    iat: Optional[float] = None # Issued at; checked against the user's revocation epoch
+    jti: Optional[str] = None # Token id; checked against revoked tokens (None on tokens issued before logout support)
+    # Identity snapshot (security.identity_claims); absent on older tokens
+    email: Optional[str] = None
+    name: Optional[str] = None
+    ver: Optional[int] = None # users.token_version when the token was issued
 
 class GoogleIdToken(BaseModel):
     """
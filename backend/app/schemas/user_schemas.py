@@ -31,6 +31,17 @@ class UserUpdate(BaseModel):
 class UserOut(UserBase):
     id: int
 
+class CurrentIdentity(BaseModel):
+    """
+    The authenticated user as far as an access token's identity snapshot tells
+    (deps.get_current_identity): enough for authorization by id and for /users/me,
+    without loading the User row.
+    """
+    id: int
+    email: str
+    name: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
 class UserForCourseResponse(BaseModel):
     id: int
     email: EmailStr
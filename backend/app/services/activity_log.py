@@ -0,0 +1,218 @@
+# backend/app/services/activity_log.py
+"""
+Learning activity event log: an in-process queue drained into activity_events in batches.
+
+Request handlers call `await activity_log.record(...)`, which only enqueues: the
+event is stamped and put on a bounded asyncio queue, and a writer task inserts
+queued events in batches of up to ACTIVITY_LOG_BATCH_SIZE (or whatever arrived
+within ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS), one transaction per batch.
+
+Backpressure: while the database is slow or down, the writer keeps retrying the
+same batch and stops draining, so the queue fills. Once full, `record` waits up to
+ACTIVITY_LOG_ENQUEUE_TIMEOUT_SECONDS for room and then drops the event (counted in
+activity_events_dropped_total) rather than stalling requests indefinitely.
+
+A maintenance task creates upcoming monthly partitions and drops those past
+ACTIVITY_LOG_RETENTION_MONTHS (app/crud/crud_activity.py).
+"""
+import asyncio
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core import metrics
+from app.core.config import settings
+from app.crud.crud_activity import crud_activity_event
+from app.db.session import AsyncSessionLocal
+
+# Event types (activity_events.event_type)
+LOGIN = "auth.login"
+COURSE_CREATED = "course.created"
+COURSE_VIEWED = "course.viewed"
+ENROLLMENT = "course.enrolled"
+UNIT_OPENED = "unit.opened"
+UNIT_COMPLETED = "unit.completed"
+SUBMISSION = "assignment.submitted"
+
+
+class ActivityLog:
+    def __init__(
+        self,
+        *,
+        queue_size: int = 50_000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.5,
+        retention_months: int = 13,
+        premake_months: int = 2,
+        maintenance_interval: float = 3600.0,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retention_months = retention_months
+        self.premake_months = premake_months
+        self.maintenance_interval = maintenance_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._writer: Optional[asyncio.Task] = None
+        self._maintainer: Optional[asyncio.Task] = None
+        self._inflight: List[Dict[str, Any]] = [] # Taken off the queue, not yet written
+        self._stopping = False
+
+    # --- Recording ---
+
+    async def record(
+        self,
+        event_type: str,
+        *,
+        user_id: Optional[int] = None,
+        course_id: Optional[uuid.UUID] = None,
+        unit_id: Optional[int] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Enqueues one event; returns False if it was dropped (log not running, or queue full past the timeout)."""
+        if self._writer is None:
+            return False # Not started (scripts, ACTIVITY_LOG_ENABLED=False)
+        event = {
+            "occurred_at": datetime.now(timezone.utc), "event_type": event_type,
+            "user_id": user_id, "course_id": course_id, "unit_id": unit_id, "data": data,
+        }
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                metrics.ACTIVITY_EVENTS_DROPPED.inc()
+                return False
+        return True
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    # --- Writing ---
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Waits for a first event, then collects more until batch_size or flush_interval."""
+        batch = self._inflight
+        batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                await crud_activity_event.insert_many(db, rows=batch)
+        except IntegrityError:
+            # Typically "no partition found for row": the maintenance task has not created it yet.
+            async with AsyncSessionLocal() as db:
+                created = await crud_activity_event.create_partitions(db, months=[e["occurred_at"].date() for e in batch])
+            if not created:
+                raise
+            print(f"DEBUG: Activity log created partitions on demand: {created}")
+            async with AsyncSessionLocal() as db:
+                await crud_activity_event.insert_many(db, rows=batch)
+        metrics.ACTIVITY_BATCH_DURATION.observe(time.perf_counter() - started)
+        metrics.ACTIVITY_EVENTS_WRITTEN.inc(len(batch))
+
+    async def _write_with_retry(self, batch: List[Dict[str, Any]], attempts: Optional[int] = None) -> bool:
+        """Retries the batch with capped backoff (forever unless `attempts`); the queue fills meanwhile."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await self._write(batch)
+                return True
+            except Exception as e:
+                print(f"ERROR: Activity log batch of {len(batch)} events failed (attempt {attempt}): {e}")
+                if attempts is not None and attempt >= attempts:
+                    return False
+                await asyncio.sleep(min(0.5 * 2 ** (attempt - 1), 30.0))
+
+    async def _run_writer(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            await self._write_with_retry(batch)
+            self._inflight = []
+
+    async def _run_maintenance(self) -> None:
+        while True:
+            try:
+                await self.maintain()
+            except Exception as e:
+                print(f"ERROR: Activity log partition maintenance failed: {e}")
+                traceback.print_exc()
+            await asyncio.sleep(self.maintenance_interval)
+
+    async def maintain(self) -> Dict[str, List[str]]:
+        async with AsyncSessionLocal() as db:
+            result = await crud_activity_event.maintain(
+                db, today=datetime.now(timezone.utc).date(),
+                premake_months=self.premake_months, retention_months=self.retention_months,
+            )
+        if result["created"] or result["dropped"]:
+            print(f"Activity log partitions created: {result['created']}, dropped: {result['dropped']}")
+        return result
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        self._stopping = False
+        self._maintainer = asyncio.create_task(self._run_maintenance(), name="activity-log-maintenance")
+        self._writer = asyncio.create_task(self._run_writer(), name="activity-log-writer")
+        print(f"Activity log started (batches of {self.batch_size}, every {self.flush_interval}s at most).")
+
+    async def stop(self, attempts: int = 3) -> None:
+        """Stops accepting events and writes what is still queued (a few attempts per batch)."""
+        self._stopping = True
+        for task in (self._writer, self._maintainer):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(t for t in (self._writer, self._maintainer) if t is not None), return_exceptions=True)
+        self._writer = self._maintainer = None # record() drops from here on
+        # The batch the writer held when cancelled goes first, then everything still queued.
+        written = lost = 0
+        while self._inflight or not self._queue.empty():
+            batch, self._inflight = self._inflight, []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if await self._write_with_retry(batch, attempts=attempts):
+                written += len(batch)
+            else:
+                lost += len(batch)
+        print(f"Activity log stopped; final flush wrote {written} events" + (f", {lost} lost." if lost else "."))
+
+
+def _collect_queue_depth() -> None:
+    metrics.ACTIVITY_QUEUE_DEPTH.set(activity_log.queue_depth)
+
+
+activity_log = ActivityLog(
+    queue_size=settings.ACTIVITY_LOG_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=settings.ACTIVITY_LOG_ENQUEUE_TIMEOUT_SECONDS,
+    retention_months=settings.ACTIVITY_LOG_RETENTION_MONTHS,
+    premake_months=settings.ACTIVITY_LOG_PREMAKE_MONTHS,
+    maintenance_interval=settings.ACTIVITY_LOG_MAINTENANCE_INTERVAL_SECONDS,
+) # Started and stopped (with a final flush) by the application lifespan when ACTIVITY_LOG_ENABLED
+metrics.REGISTRY.add_collector(_collect_queue_depth)
@@ -11,6 +11,9 @@ from app.core.config import settings
 from app.core import security
 from app.crud.crud_user import crud_user
 from app.models.user import User as UserModel
+from app.schemas.token_schemas import TokenPayload
+from app.services.activity_log import LOGIN, activity_log
+from app.services.token_revocation import token_revocations
 
 class AuthService:
     async def verify_google_token(self, token: str) -> dict:
@@ -99,7 +102,7 @@ class AuthService:
 
         print(f"DEBUG: Generating access token for user ID: {user.id}")
         try:
-            access_token = security.create_access_token(subject=str(user.id))
+            access_token = security.create_access_token(subject=str(user.id), identity=security.identity_claims(user))
             print(f"DEBUG: Access token generated: {access_token[:30]}...")
         except Exception as e:
             print(f"ERROR: Error generating access token: {e}")
@@ -108,7 +111,42 @@ class AuthService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error generating access token."
             )
-            
+
+        try:
+            # A changed email or name bumps token_version: the user's other sessions get fresh tokens.
+            await token_revocations.record_token_version(db, user_id=user.id, token_version=user.token_version)
+        except Exception as e:
+            print(f"ERROR: Could not record token version of user {user.id}: {e}")
+        await activity_log.record(LOGIN, user_id=user.id)
         return user, access_token
 
+    async def logout(self, db: AsyncSession, *, access_token: Optional[str]) -> None:
+        """
+        Revokes the presented token server-side, so a copy of it stops working too.
+        Invalid or expired tokens need nothing revoked. Failures are logged: the
+        cookie is cleared either way.
+        """
+        if not access_token:
+            return
+        payload = security.verify_token(access_token)
+        if payload is None:
+            return
+        try:
+            await token_revocations.revoke_token(db, TokenPayload(**payload))
+        except Exception as e:
+            print(f"ERROR: Could not revoke token on logout: {e}")
+            traceback.print_exc()
+
+    async def logout_everywhere(self, db: AsyncSession, *, user: UserModel) -> None:
+        """Revokes every access token issued to the user so far (all devices and sessions)."""
+        try:
+            await token_revocations.revoke_all_for_user(db, user_id=user.id)
+        except Exception as e:
+            print(f"ERROR: Could not revoke tokens of user {user.id}: {e}")
+            traceback.print_exc()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Could not log out other sessions."
+            )
+
 auth_service = AuthService()
\ No newline at end of file
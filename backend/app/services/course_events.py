@@ -0,0 +1,245 @@
+# backend/app/services/course_events.py
+"""
+Real-time course events pushed to clients over Server-Sent Events.
+
+Clients open one long-lived `GET /events/courses` stream for the courses they are
+enrolled in (checked once, at connect time, against user_courses) and refetch what
+an event names instead of polling.
+
+Fan-out: each event is encoded into its SSE frame once per process and the same
+bytes object is put on every matching subscriber's bounded queue, so delivering to
+thousands of connections is a dict lookup plus one put_nowait each. Connections
+hold no DB session.
+
+Across workers: `publish` sends the event with `pg_notify` on COURSE_EVENTS_CHANNEL;
+every process (the publisher included) LISTENs on a dedicated connection and fans
+the notification out to its own subscribers. After the listener reconnects, or when
+a subscriber falls behind and its queue overflows, the subscriber gets a `resync`
+event: something may have been missed, refetch.
+"""
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from sqlalchemy import func, select
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import async_engine
+
+# Event types
+ENROLLMENT_CREATED = "enrollment.created"
+COURSE_UPDATED = "course.updated"
+COURSE_DELETED = "course.deleted" # Also ends the subscription to that course
+RESYNC = "resync"
+UNAVAILABLE = "unavailable" # Sent instead of `ready` when the stream limit was reached; the stream then ends
+
+_MAX_NOTIFY_BYTES = 7900 # pg_notify payloads must stay under 8000 bytes
+
+
+def _frame(event_type: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n".encode("utf-8")
+
+
+class CourseSubscriber:
+    __slots__ = ("user_id", "course_ids", "queue", "overflowed")
+
+    def __init__(self, *, user_id: int, course_ids: Set[uuid.UUID], queue_size: int):
+        self.user_id = user_id
+        self.course_ids = course_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class CourseEventBroker:
+    def __init__(
+        self,
+        *,
+        channel: str = "lms_course_events",
+        queue_size: int = 100,
+        heartbeat_seconds: float = 15.0,
+        max_connections: int = 5000,
+    ):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_connections = max_connections
+        self._by_course: Dict[uuid.UUID, Set[CourseSubscriber]] = {}
+        self._subscriber_count = 0
+        self._listener: Optional[asyncio.Task] = None
+        self._listening = False
+
+    # --- Subscriptions ---
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscriber_count
+
+    def subscribe(self, *, user_id: int, course_ids: Iterable[uuid.UUID]) -> Optional[CourseSubscriber]:
+        """Registers a subscriber, or returns None at max_connections (checked and counted without awaiting)."""
+        if self._subscriber_count >= self.max_connections:
+            return None
+        subscriber = CourseSubscriber(user_id=user_id, course_ids=set(course_ids), queue_size=self.queue_size)
+        for course_id in subscriber.course_ids:
+            self._by_course.setdefault(course_id, set()).add(subscriber)
+        self._subscriber_count += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: CourseSubscriber) -> None:
+        for course_id in subscriber.course_ids:
+            subscribers = self._by_course.get(course_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._by_course[course_id]
+        subscriber.course_ids = set()
+        self._subscriber_count -= 1
+
+    async def stream(self, *, user_id: int, course_ids: Iterable[uuid.UUID]) -> AsyncIterator[bytes]:
+        """
+        SSE body for one subscriber; heartbeats keep proxies from closing an idle stream.
+        The subscription is made when the body starts streaming and removed when it ends, so
+        a response that is never sent (client gone before it started) leaves nothing behind.
+        """
+        retry = f"retry: {int(self.heartbeat_seconds * 1000)}\n\n".encode("utf-8")
+        subscriber = self.subscribe(user_id=user_id, course_ids=course_ids)
+        if subscriber is None: # Full since the endpoint's check; the client reconnects after `retry`
+            yield retry
+            yield _frame(UNAVAILABLE, {"reason": "too many event streams"})
+            return
+        try:
+            yield retry
+            yield _frame("ready", {"course_ids": sorted(str(c) for c in subscriber.course_ids)})
+            while True:
+                if subscriber.overflowed:
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()
+                    subscriber.overflowed = False
+                    yield _frame(RESYNC, {"reason": "overflow"})
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield frame
+        finally:
+            self.unsubscribe(subscriber)
+
+    # --- Local fan-out ---
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        course_id = event.get("course_id")
+        if course_id is None: # Broadcast (listener reconnected)
+            targets = {s for subscribers in self._by_course.values() for s in subscribers}
+        else:
+            course_id = uuid.UUID(str(course_id))
+            targets = self._by_course.get(course_id, ())
+        if not targets:
+            return
+        frame = _frame(event["type"], {k: v for k, v in event.items() if k != "type"}) # Encoded once for all
+        delivered = 0
+        for subscriber in list(targets):
+            try:
+                subscriber.queue.put_nowait(frame)
+                delivered += 1
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                metrics.COURSE_EVENT_OVERFLOWS.inc()
+        metrics.COURSE_EVENTS_DELIVERED.inc(delivered)
+        if event["type"] == COURSE_DELETED and course_id is not None:
+            for subscriber in self._by_course.pop(course_id, ()):
+                subscriber.course_ids.discard(course_id)
+
+    # --- Publishing ---
+
+    async def publish(self, event_type: str, *, course_id: uuid.UUID, data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Sends an event to every subscriber of the course, in all workers. Call it after the
+        change is committed. Never raises: a lost event only delays clients until their next refetch.
+        """
+        event = {"type": event_type, "course_id": str(course_id), **(data or {})}
+        payload = json.dumps(event, default=str)
+        if len(payload.encode("utf-8")) > _MAX_NOTIFY_BYTES:
+            event = {"type": event_type, "course_id": str(course_id)} # Clients refetch the details anyway
+            payload = json.dumps(event)
+        metrics.COURSE_EVENTS_PUBLISHED.labels(event_type).inc()
+        if not self._listening:
+            self._deliver(event) # No cross-worker delivery without the listener; serve this process at least
+            return
+        try:
+            async with async_engine.connect() as conn:
+                await conn.execute(select(func.pg_notify(self.channel, payload)))
+                await conn.commit()
+        except Exception as e:
+            print(f"ERROR: Could not publish course event {event_type} for course {course_id}: {e}")
+            self._deliver(event)
+
+    # --- Cross-worker listener ---
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self._deliver(json.loads(payload))
+        except Exception as e:
+            print(f"ERROR: Bad course event notification {payload[:200]!r}: {e}")
+
+    async def _listen(self) -> None:
+        """Holds one pooled connection with LISTEN; reconnects with backoff and broadcasts `resync`."""
+        delay = 1.0
+        first = True
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection # asyncpg.Connection
+                    lost = asyncio.Event()
+                    driver.add_termination_listener(lambda _conn: lost.set())
+                    await driver.add_listener(self.channel, self._on_notify)
+                    self._listening = True
+                    delay = 1.0
+                    print(f"Course events: listening on channel {self.channel!r}.")
+                    if not first:
+                        self._deliver({"type": RESYNC, "reason": "reconnected"})
+                    first = False
+                    try:
+                        while not lost.is_set():
+                            try:
+                                await asyncio.wait_for(lost.wait(), timeout=self.heartbeat_seconds)
+                            except asyncio.TimeoutError:
+                                await asyncio.wait_for(driver.execute("SELECT 1"), timeout=self.heartbeat_seconds)
+                    finally:
+                        self._listening = False
+                        if not driver.is_closed():
+                            await driver.remove_listener(self.channel, self._on_notify)
+                raise ConnectionError("listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR: Course events listener failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen(), name="course-events-listener")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self._listening = False
+
+
+def _collect_subscribers() -> None:
+    metrics.COURSE_EVENT_SUBSCRIBERS.set(course_events.subscriber_count)
+
+
+course_events = CourseEventBroker(
+    channel=settings.COURSE_EVENTS_CHANNEL,
+    queue_size=settings.COURSE_EVENTS_QUEUE_SIZE,
+    heartbeat_seconds=settings.COURSE_EVENTS_HEARTBEAT_SECONDS,
+    max_connections=settings.COURSE_EVENTS_MAX_CONNECTIONS,
+) # Listener started and stopped by the application lifespan when COURSE_EVENTS_ENABLED
+metrics.REGISTRY.add_collector(_collect_subscribers)
@@ -1,29 +1,39 @@
 # backend/app/services/course_service.py
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import asyncio
 import uuid
 import traceback
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from fastapi import HTTPException, status
 
+from app.crud.crud_completion import crud_completion
 from app.crud.crud_course import crud_course
 from app.crud.crud_user import crud_user
+from app.jobs.course_jobs import COURSE_DELETE
+from app.models.job import Job as JobModel
+from app.services.job_service import job_service
+from app.services.activity_log import COURSE_CREATED, COURSE_VIEWED, ENROLLMENT, activity_log
+from app.services.course_events import COURSE_DELETED, ENROLLMENT_CREATED, course_events
 from app.models.course import Course as CourseModel
 from app.models.user_course import UserCourse as UserCourseModel
-from app.schemas.course_schemas import CourseCreate
+from app.schemas.analytics_schemas import CourseAnalyticsOut
+from app.schemas.course_schemas import CourseClone, CourseCreate, CourseView
 from app.schemas.user_course_schemas import UserCourseCreate, UserCourseRole
 from app.models.user import User as UserModel
-from app.models.enums import UserRoleEnum # Assuming you might have a global admin role defined here or in UserModel
+from app.core.config import settings
+from app.models.enums import UserCourseRoleEnum, UserRoleEnum # Assuming you might have a global admin role defined here or in UserModel
 
 class CourseService:
     async def get_courses_for_user(
-        self, db: AsyncSession, *, user: UserModel, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, user: UserModel, skip: int = 0, limit: int = 100, view: Optional[CourseView] = None
     ) -> List[CourseModel]:
         print(f"DEBUG: CourseService.get_courses_for_user called for user ID: {user.id}")
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         try:
-            courses = await crud_course.get_multi_for_user(db, user_id=user.id, skip=skip, limit=limit)
+            courses = await crud_course.get_multi_for_user(db, user_id=user.id, skip=skip, limit=limit, view=view)
             print(f"DEBUG: crud_course.get_multi_for_user returned {len(courses)} courses.")
             return courses
         except Exception as e:
@@ -32,10 +42,11 @@ class CourseService:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching courses.")
 
     async def get_course_by_id_for_user(
-        self, db: AsyncSession, *, course_id: uuid.UUID, user: UserModel
+        self, db: AsyncSession, *, course_id: uuid.UUID, user: UserModel, view: Optional[CourseView] = None
     ) -> Optional[CourseModel]:
         """
         Service to get a specific course by ID.
+        `view` limits the relationships loaded (default: all).
         Authorization:
         - User must be enrolled in the course.
         - OR User must be a global admin (example, if you have such a role).
@@ -43,7 +54,7 @@ class CourseService:
         """
         print(f"DEBUG: CourseService.get_course_by_id_for_user called for course_id: {course_id}, requested by user_id: {user.id}")
         try:
-            course = await crud_course.get_with_details(db, course_uuid=course_id)
+            course = await crud_course.get_with_details(db, course_uuid=course_id, view=view)
             if not course:
                 # Return 404 if course doesn't exist at all
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
@@ -52,11 +63,17 @@ class CourseService:
             is_enrolled = False
             user_role_in_course: Optional[UserCourseRole] = None
 
-            for assoc in course.user_associations:
-                if assoc.user_id == user.id:
-                    is_enrolled = True
-                    user_role_in_course = assoc.role # Get the user's specific role in this course
-                    break
+            if view is None or "user_associations" in view.include:
+                for assoc in course.user_associations:
+                    if assoc.user_id == user.id:
+                        is_enrolled = True
+                        user_role_in_course = assoc.role # Get the user's specific role in this course
+                        break
+            else:
+                # Roster not loaded: look up just this user's enrollment
+                enrollment_stmt = select(UserCourseModel.role).filter_by(user_id=user.id, course_id=course_id)
+                user_role_in_course = (await db.execute(enrollment_stmt)).scalar_one_or_none()
+                is_enrolled = user_role_in_course is not None
             
             # Example: Check for a global admin role (if your UserModel has such a field)
             # is_global_admin = hasattr(user, 'global_role') and user.global_role == UserRoleEnum.admin
@@ -76,6 +93,7 @@ class CourseService:
             # If execution reaches here, the user is authorized
             print(f"DEBUG AuthZ: User {user.id} authorized for course {course_id}.")
             print(f"DEBUG: Course {course_id} retrieved successfully for user {user.id}.")
+            await activity_log.record(COURSE_VIEWED, user_id=user.id, course_id=course_id)
             return course
         except HTTPException:
             raise # Re-raise HTTPExceptions (like 404 or 403 from above)
@@ -101,11 +119,15 @@ class CourseService:
             #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to enroll this user.")
 
 
-            target_user = await crud_user.get(db, record_id=enrollment_data.user_id)
+            # Both lookups go through the request's batch loaders: a self-enrollment reuses the
+            # already-loaded current user, and crud_course.enroll_user's existence checks hit the memo.
+            target_user, target_course = await asyncio.gather(
+                crud_user.load(db, enrollment_data.user_id),
+                crud_course.load(db, enrollment_data.course_id),
+            )
             if not target_user:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User with id {enrollment_data.user_id} not found")
 
-            target_course = await crud_course.get(db, record_id=enrollment_data.course_id)
             if not target_course:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Course with id {enrollment_data.course_id} not found")
 
@@ -136,6 +158,14 @@ class CourseService:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to enroll user due to an unexpected issue.")
             
             print(f"DEBUG: User {enrollment_data.user_id} enrolled in course {enrollment_data.course_id} successfully.")
+            await activity_log.record(
+                ENROLLMENT, user_id=enrollment_data.user_id, course_id=enrollment_data.course_id,
+                data={"role": enrollment_data.role.value, "enrolled_by": current_user.id},
+            )
+            await course_events.publish(
+                ENROLLMENT_CREATED, course_id=enrollment_data.course_id,
+                data={"user_id": enrollment_data.user_id, "role": enrollment_data.role.value},
+            )
             return result
         except HTTPException:
             raise
@@ -152,15 +182,137 @@ class CourseService:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not identify course creator.")
         try:
             new_course = await crud_course.create_course_with_creator_enrollment(
-                db, obj_in=course_data, creator_id=creator.id, creator_role=UserCourseRole.teacher
+                db, obj_in=course_data, creator_id=creator.id, creator_role=UserCourseRole.TEACHER
             )
             if not new_course:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create course.")
             print(f"DEBUG: New course created with ID: {new_course.id}")
+            await activity_log.record(COURSE_CREATED, user_id=creator.id, course_id=new_course.id)
             return new_course
         except Exception as e:
             print(f"ERROR in CourseService.create_new_course: {e}")
             traceback.print_exc()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error creating new course.")
 
+    async def _require_course_teacher(
+        self, db: AsyncSession, *, course_id: uuid.UUID, user: UserModel, action: str
+    ) -> None:
+        """Raises 404 if the course does not exist, 403 unless the user teaches it (or is a global admin)."""
+        enrollment_stmt = select(UserCourseModel.role).filter_by(user_id=user.id, course_id=course_id)
+        role = (await db.execute(enrollment_stmt)).scalar_one_or_none()
+        is_global_admin = hasattr(user, 'is_superuser') and user.is_superuser
+        if role == UserCourseRoleEnum.teacher or is_global_admin:
+            return
+        if role is None and not await crud_course.load(db, course_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Only a teacher of this course can {action} it.")
+
+    async def get_course_roster(
+        self, db: AsyncSession, *, course_id: uuid.UUID, current_user: UserModel,
+        skip: int = 0, limit: int = 100, include_total: bool = False
+    ) -> Tuple[List[UserCourseModel], Optional[Tuple[int, bool]]]:
+        """
+        One page of the course's members with their roles, plus (with `include_total`) the
+        member count as (total, is_exact); estimated past LIST_TOTAL_EXACT_THRESHOLD.
+        Authorization: any member of the course (or a global admin).
+        """
+        print(f"DEBUG: CourseService.get_course_roster called for course_id: {course_id} by user_id: {current_user.id}")
+        enrollment_stmt = select(UserCourseModel.role).filter_by(user_id=current_user.id, course_id=course_id)
+        role = (await db.execute(enrollment_stmt)).scalar_one_or_none()
+        is_global_admin = hasattr(current_user, 'is_superuser') and current_user.is_superuser
+        if role is None and not is_global_admin:
+            if not await crud_course.load(db, course_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this course's members.")
+        members = await crud_course.get_roster(db, course_id=course_id, skip=skip, limit=limit)
+        total = None
+        if include_total:
+            total = await crud_course.count_roster(
+                db, course_id=course_id, exact_threshold=settings.LIST_TOTAL_EXACT_THRESHOLD
+            )
+        return members, total
+
+    async def delete_course(
+        self, db: AsyncSession, *, course_id: uuid.UUID, current_user: UserModel
+    ) -> None:
+        """
+        Deletes a course with its modules, units and enrollments.
+        Authorization: only a teacher of the course (or a global admin).
+        """
+        print(f"DEBUG: CourseService.delete_course called for course_id: {course_id} by user_id: {current_user.id}")
+        try:
+            await self._require_course_teacher(db, course_id=course_id, user=current_user, action="delete")
+            counts = await crud_course.remove_with_cascade(db, course_id=course_id, chunk_size=settings.DB_DELETE_CHUNK_SIZE)
+            print(f"DEBUG: Course {course_id} deleted: {counts}")
+            await course_events.publish(COURSE_DELETED, course_id=course_id)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"ERROR in CourseService.delete_course: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error deleting course.")
+
+    async def clone_course(
+        self, db: AsyncSession, *, course_id: uuid.UUID, clone_data: CourseClone, current_user: UserModel
+    ) -> CourseModel:
+        """
+        Copies a course (modules and units, optionally teacher enrollments) for a new term.
+        Authorization: only a teacher of the source course (or a global admin).
+        """
+        print(f"DEBUG: CourseService.clone_course called for course_id: {course_id} by user_id: {current_user.id}")
+        try:
+            await self._require_course_teacher(db, course_id=course_id, user=current_user, action="clone")
+            new_course = await crud_course.clone_course(
+                db,
+                source_id=course_id,
+                name=clone_data.name,
+                description=clone_data.description,
+                copy_teachers=clone_data.copy_teachers,
+                creator_id=current_user.id,
+            )
+            if not new_course:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+            print(f"DEBUG: Course {course_id} cloned to {new_course.id}")
+            return new_course
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"ERROR in CourseService.clone_course: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error cloning course.")
+
+    async def authorize_course_export(
+        self, db: AsyncSession, *, course_id: uuid.UUID, current_user: UserModel
+    ) -> None:
+        """Exports contain every unit's content, so only teachers of the course may export it."""
+        await self._require_course_teacher(db, course_id=course_id, user=current_user, action="export")
+
+    async def get_course_analytics(
+        self, db: AsyncSession, *, course_id: uuid.UUID, current_user: UserModel, skip: int = 0, limit: int = 100
+    ) -> CourseAnalyticsOut:
+        """
+        Class-wide completion for the teacher dashboard, read from the completion summary tables
+        (one row per student and module) rather than from per-unit progress.
+        Authorization: only a teacher of the course (or a global admin).
+        """
+        print(f"DEBUG: CourseService.get_course_analytics called for course_id: {course_id} by user_id: {current_user.id}")
+        await self._require_course_teacher(db, course_id=course_id, user=current_user, action="view analytics for")
+        try:
+            analytics = await crud_completion.get_course_analytics(db, course_id=course_id, skip=skip, limit=limit)
+            return CourseAnalyticsOut(**analytics)
+        except Exception as e:
+            print(f"ERROR in CourseService.get_course_analytics: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error computing course analytics.")
+
+    async def enqueue_course_delete(
+        self, db: AsyncSession, *, course_id: uuid.UUID, current_user: UserModel
+    ) -> JobModel:
+        """Same as delete_course, but runs as a background job; returns the job to poll."""
+        print(f"DEBUG: CourseService.enqueue_course_delete called for course_id: {course_id} by user_id: {current_user.id}")
+        await self._require_course_teacher(db, course_id=course_id, user=current_user, action="delete")
+        return await job_service.enqueue(
+            db, kind=COURSE_DELETE, payload={"course_id": str(course_id)}, created_by=current_user
+        )
+
 course_service = CourseService()
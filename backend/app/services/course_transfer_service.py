@@ -0,0 +1,279 @@
+# backend/app/services/course_transfer_service.py
+"""
+Course export / import as JSON Lines, for moving content between environments and archiving.
+
+Format (one JSON object per line, UTF-8):
+    {"type": "course", "format_version": 1, "id": ..., "name": ..., "description": ...}
+    {"type": "module", "id": ..., "title": ..., "description": ..., "order": ...}   (all modules, in order)
+    {"type": "unit", "id": ..., "module_id": ..., "title": ..., "unit_type": ..., "content": ..., "order": ...}
+
+Export streams rows from server-side cursors straight into the response (optionally
+gzip-compressed on the fly), so memory does not grow with the course. Import reads
+the request body incrementally, decompressing if needed, and inserts modules and units
+in batches inside one transaction; only the module id map and one batch are held.
+"""
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import json
+import uuid
+import zlib
+import traceback
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.crud.crud_course import crud_course
+from app.db.session import AsyncSessionLocal
+from app.models.course import Course as CourseModel
+from app.models.enums import UnitTypeEnum, UserCourseRoleEnum
+from app.models.module_model import Module as ModuleModel
+from app.models.unit import Unit as UnitModel
+from app.models.user import User as UserModel
+from app.models.user_course import UserCourse as UserCourseModel
+
+FORMAT_VERSION = 1
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class CourseImportError(ValueError):
+    """The uploaded stream is not a valid course export; reported as 400 with the line number."""
+
+
+class _LineBuffer:
+    """
+    Splits a byte stream into lines. Consumed bytes are dropped once per feed(), not once
+    per line, so a chunk of many short lines is split in linear time.
+    """
+
+    def __init__(self, max_line: int):
+        self.max_line = max_line
+        self.pending = bytearray() # Bytes after the last complete line
+        self.line_number = 0 # Number of the last complete line
+
+    def feed(self, data: bytes) -> Iterator[Tuple[int, bytes]]:
+        """Appends `data` and yields (line_number, line) for every complete, non-blank line."""
+        pending = self.pending
+        pending += data
+        start = 0
+        while True:
+            end = pending.find(b"\n", start)
+            if end < 0:
+                break
+            self.line_number += 1
+            raw = bytes(pending[start:end])
+            start = end + 1
+            if raw.strip():
+                yield self.line_number, raw
+        del pending[:start]
+        if len(pending) > self.max_line:
+            raise CourseImportError(f"Line {self.line_number + 1} exceeds {self.max_line} bytes")
+
+
+class CourseTransferService:
+    # --- Export ---
+
+    async def export_lines(self, *, course_id: uuid.UUID) -> AsyncIterator[bytes]:
+        """
+        Yields the course as JSON Lines. Uses its own session: a streaming response
+        outlives the request's dependencies, so the request session is already closed.
+        """
+        batch_size = settings.COURSE_EXPORT_BATCH_SIZE
+        async with AsyncSessionLocal() as db:
+            course = await crud_course.get(db, record_id=course_id)
+            if course is None:
+                return
+            yield _line({
+                "type": "course", "format_version": FORMAT_VERSION,
+                "id": course.id, "name": course.name, "description": course.description,
+            })
+
+            modules_stmt = (
+                select(ModuleModel.id, ModuleModel.title, ModuleModel.description, ModuleModel.order)
+                .where(ModuleModel.course_id == course_id)
+                .order_by(ModuleModel.order, ModuleModel.id)
+                .execution_options(yield_per=batch_size) # Server-side cursor, fetched batch_size rows at a time
+            )
+            async for row in await db.stream(modules_stmt):
+                yield _line({"type": "module", "id": row.id, "title": row.title, "description": row.description, "order": row.order})
+
+            units_stmt = (
+                select(UnitModel.id, UnitModel.module_id, UnitModel.title, UnitModel.unit_type, UnitModel.content, UnitModel.order)
+                .join(ModuleModel, UnitModel.module_id == ModuleModel.id)
+                .where(ModuleModel.course_id == course_id)
+                .order_by(ModuleModel.order, ModuleModel.id, UnitModel.order, UnitModel.id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for row in await db.stream(units_stmt):
+                yield _line({
+                    "type": "unit", "id": row.id, "module_id": row.module_id, "title": row.title,
+                    "unit_type": row.unit_type.value, "content": row.content, "order": row.order,
+                })
+
+    async def export_stream(self, *, course_id: uuid.UUID, compress: bool) -> AsyncIterator[bytes]:
+        """export_lines(), regrouped into ~64 KiB chunks and optionally gzip-compressed incrementally."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None # wbits=31: gzip container
+        buffer: List[bytes] = []
+        buffered = 0
+        try:
+            async for line in self.export_lines(course_id=course_id):
+                buffer.append(line)
+                buffered += len(line)
+                if buffered >= 64 * 1024:
+                    data = b"".join(buffer)
+                    buffer, buffered = [], 0
+                    data = compressor.compress(data) if compressor else data
+                    if data:
+                        yield data
+        except Exception as e:
+            # Headers are already sent; all we can do is stop. The truncated stream fails to import.
+            print(f"ERROR in CourseTransferService.export_stream (course {course_id}): {e}")
+            traceback.print_exc()
+            raise
+        data = b"".join(buffer)
+        if compressor:
+            data = compressor.compress(data) + compressor.flush()
+        if data:
+            yield data
+
+    # --- Import ---
+
+    async def _records(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+        """Decodes an (optionally gzip-compressed) byte stream into (line_number, record) pairs."""
+        max_line = settings.COURSE_IMPORT_MAX_LINE_BYTES
+        lines = _LineBuffer(max_line)
+        decompressor = None
+        first = True
+        async for chunk in chunks:
+            if first and chunk:
+                first = False
+                if chunk[:2] == _GZIP_MAGIC:
+                    decompressor = zlib.decompressobj(47) # wbits=47: gzip or zlib, auto-detected
+            if decompressor is not None:
+                # Cap the output per call so a small, highly compressed chunk cannot expand unboundedly.
+                chunk = decompressor.decompress(chunk, max_line)
+                while decompressor.unconsumed_tail:
+                    for line_number, raw in lines.feed(chunk):
+                        yield line_number, self._parse(raw, line_number)
+                    chunk = decompressor.decompress(decompressor.unconsumed_tail, max_line)
+            for line_number, raw in lines.feed(chunk):
+                yield line_number, self._parse(raw, line_number)
+        if decompressor is not None:
+            for line_number, raw in lines.feed(decompressor.flush()):
+                yield line_number, self._parse(raw, line_number)
+        if lines.pending.strip():
+            line_number = lines.line_number + 1
+            yield line_number, self._parse(bytes(lines.pending), line_number)
+
+    def _parse(self, raw: bytes, line_number: int) -> Dict[str, Any]:
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            raise CourseImportError(f"Line {line_number}: invalid JSON ({e})")
+        if not isinstance(record, dict) or "type" not in record:
+            raise CourseImportError(f"Line {line_number}: expected an object with a 'type'")
+        return record
+
+    async def import_stream(
+        self, db: AsyncSession, *, chunks: AsyncIterator[bytes], creator: UserModel, name: Optional[str] = None
+    ) -> CourseModel:
+        """
+        Creates a new course (new ids) from an export stream; the creator becomes its teacher.
+        All-or-nothing: any error rolls the whole import back.
+        """
+        print(f"DEBUG: CourseTransferService.import_stream called by user_id: {creator.id}")
+        batch_size = settings.COURSE_IMPORT_BATCH_SIZE
+        course_id: Optional[uuid.UUID] = None
+        module_ids: Dict[Any, Optional[int]] = {} # Exported module id -> new module id (None until flushed)
+        modules_batch: List[Dict[str, Any]] = []
+        modules_batch_ids: List[Any] = [] # Exported ids of modules_batch, in the same order
+        units_batch: List[Dict[str, Any]] = []
+        unit_count = 0
+
+        async def flush_modules() -> None:
+            if modules_batch:
+                # One multi-row INSERT per batch; ids come back in the order of the rows.
+                result = await db.execute(
+                    insert(ModuleModel).returning(ModuleModel.id, sort_by_parameter_order=True), modules_batch
+                )
+                module_ids.update(zip(modules_batch_ids, result.scalars().all()))
+                modules_batch.clear()
+                modules_batch_ids.clear()
+
+        async def flush_units() -> None:
+            nonlocal unit_count
+            if units_batch:
+                await db.execute(insert(UnitModel), units_batch) # executemany, sent as multi-row INSERTs
+                unit_count += len(units_batch)
+                units_batch.clear()
+
+        try:
+            async for line_number, record in self._records(chunks):
+                kind = record["type"]
+                try:
+                    if kind == "course":
+                        if course_id is not None:
+                            raise CourseImportError("more than one course record")
+                        if record.get("format_version", FORMAT_VERSION) > FORMAT_VERSION:
+                            raise CourseImportError(f"unsupported format_version {record['format_version']}")
+                        course_id = uuid.uuid4()
+                        await db.execute(insert(CourseModel).values(
+                            id=course_id, name=name or record["name"], description=record.get("description"),
+                        ))
+                        await db.execute(insert(UserCourseModel).values(
+                            user_id=creator.id, course_id=course_id, role=UserCourseRoleEnum.teacher,
+                        ))
+                    elif course_id is None:
+                        raise CourseImportError("the first record must be the course")
+                    elif kind == "module":
+                        if record["id"] in module_ids:
+                            raise CourseImportError(f"duplicate module id {record['id']!r}")
+                        modules_batch.append({
+                            "title": record["title"], "description": record.get("description"),
+                            "order": record.get("order", 0), "course_id": course_id,
+                        })
+                        modules_batch_ids.append(record["id"])
+                        module_ids[record["id"]] = None
+                        if len(modules_batch) >= batch_size:
+                            await flush_modules()
+                    elif kind == "unit":
+                        if record["module_id"] not in module_ids:
+                            raise CourseImportError(f"unit refers to unknown module {record['module_id']!r}")
+                        if module_ids[record["module_id"]] is None:
+                            await flush_modules()
+                        module_id = module_ids[record["module_id"]]
+                        units_batch.append({
+                            "title": record["title"], "unit_type": UnitTypeEnum(record["unit_type"]),
+                            "content": record.get("content"), "order": record.get("order", 0), "module_id": module_id,
+                        })
+                        if len(units_batch) >= batch_size:
+                            await flush_units()
+                    else:
+                        raise CourseImportError(f"unknown record type {kind!r}")
+                except (KeyError, ValueError, TypeError) as e:
+                    if isinstance(e, CourseImportError):
+                        raise CourseImportError(f"Line {line_number}: {e}")
+                    raise CourseImportError(f"Line {line_number}: invalid {kind} record ({e!r})")
+            if course_id is None:
+                raise CourseImportError("the stream contains no course record")
+            await flush_modules()
+            await flush_units()
+            await db.commit()
+        except CourseImportError as e:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid course export: {e}")
+        except Exception as e:
+            await db.rollback()
+            print(f"ERROR in CourseTransferService.import_stream: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error importing course.")
+
+        print(f"DEBUG: Imported course {course_id}: {len(module_ids)} modules, {unit_count} units")
+        return await crud_course.get_with_details(db, course_uuid=course_id)
+
+course_transfer_service = CourseTransferService()
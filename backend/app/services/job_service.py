@@ -0,0 +1,48 @@
+# backend/app/services/job_service.py
+from typing import Any, Dict, Optional
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.jobs.worker import job_worker
+from app.models.job import Job as JobModel
+from app.models.user import User as UserModel
+
+class JobService:
+    async def enqueue(
+        self, db: AsyncSession, *, kind: str, payload: Dict[str, Any], created_by: Optional[UserModel] = None,
+        max_attempts: Optional[int] = None
+    ) -> JobModel:
+        """
+        Persists a job (committed, so any instance's workers can claim it) and wakes a local worker.
+        The payload must be JSON-serializable (e.g. ids as strings).
+        """
+        job = JobModel(
+            kind=kind,
+            payload=payload,
+            max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+            created_by_id=created_by.id if created_by else None,
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        print(f"DEBUG: JobService.enqueue queued job {job.id} ({kind})")
+        job_worker.notify()
+        return job
+
+    async def get_job_for_user(
+        self, db: AsyncSession, *, job_id: uuid.UUID, user: UserModel
+    ) -> JobModel:
+        """
+        Returns a job for status polling.
+        Authorization: only the user who started the job can see it (404 otherwise, so
+        job ids of other users are not confirmed to exist).
+        """
+        job = await db.get(JobModel, job_id, populate_existing=True) # Always fresh: pollers expect progress to move
+        if not job or job.created_by_id != user.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return job
+
+job_service = JobService()
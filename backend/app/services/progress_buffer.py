@@ -0,0 +1,172 @@
+# backend/app/services/progress_buffer.py
+"""
+Write-behind buffer for unit progress events.
+
+Progress events (a unit opened, a unit completed) arrive far more often than anything
+else the app writes, and most of them repeat: the same student reopening the same
+unit. Instead of one transaction per event, events are coalesced in memory per
+(user, unit) and written as batched upserts (crud_unit_progress.upsert_many) when
+the flush interval elapses or the number of pending pairs reaches the size threshold.
+
+Durability: a flush takes the pending map atomically; if the write fails, its
+entries are merged back and retried on the next flush. On graceful shutdown `stop()`
+flushes whatever is left (with retries), so only a crash can lose the last interval
+of events. Each worker process has its own buffer; upserts merge commutatively, so
+concurrent flushes from several workers are safe.
+"""
+import asyncio
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.crud.crud_progress import crud_unit_progress
+from app.db.session import AsyncSessionLocal
+
+ProgressKey = Tuple[int, int] # (user_id, unit_id)
+
+
+@dataclass
+class PendingProgress:
+    """Coalesced, not-yet-written events for one (user, unit)."""
+    open_count: int = 0
+    first_opened_at: Optional[datetime] = None
+    last_opened_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    def merge(self, other: "PendingProgress") -> None:
+        self.open_count += other.open_count
+        if other.first_opened_at and (self.first_opened_at is None or other.first_opened_at < self.first_opened_at):
+            self.first_opened_at = other.first_opened_at
+        if other.last_opened_at and (self.last_opened_at is None or other.last_opened_at > self.last_opened_at):
+            self.last_opened_at = other.last_opened_at
+        if other.completed_at and (self.completed_at is None or other.completed_at < self.completed_at):
+            self.completed_at = other.completed_at
+
+
+class ProgressWriteBehindBuffer:
+    def __init__(self, *, flush_interval: float = 2.0, flush_threshold: int = 5000, max_pending: int = 100_000):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_pending = max_pending # Past this, record() waits for a flush (backpressure)
+        self._pending: Dict[ProgressKey, PendingProgress] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    # --- Recording ---
+
+    async def record(self, *, user_id: int, unit_id: int, opened: bool = False, completed: bool = False) -> None:
+        now = datetime.now(timezone.utc)
+        event = PendingProgress(
+            open_count=1 if opened else 0,
+            first_opened_at=now if opened else None,
+            last_opened_at=now if opened else None,
+            completed_at=now if completed else None,
+        )
+        key = (user_id, unit_id)
+        existing = self._pending.get(key)
+        if existing is None:
+            if len(self._pending) >= self.max_pending:
+                await self.flush() # The database is behind; slow producers down instead of growing without bound
+            self._pending[key] = event
+        else:
+            existing.merge(event)
+        metrics.PROGRESS_EVENTS.labels("completed" if completed else "opened").inc()
+        if len(self._pending) >= self.flush_threshold:
+            self._flush_requested.set()
+
+    def pending_for_user(self, user_id: int) -> Dict[int, PendingProgress]:
+        """Unflushed entries of one user, by unit id, so reads can include this process's recent writes."""
+        return {unit_id: entry for (uid, unit_id), entry in self._pending.items() if uid == user_id}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # --- Flushing ---
+
+    async def flush(self) -> int:
+        """Writes everything pending; returns the number of (user, unit) rows written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            rows = [
+                {
+                    "user_id": user_id, "unit_id": unit_id, "open_count": entry.open_count,
+                    "first_opened_at": entry.first_opened_at, "last_opened_at": entry.last_opened_at,
+                    "completed_at": entry.completed_at,
+                }
+                for (user_id, unit_id), entry in batch.items()
+            ]
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    written = await crud_unit_progress.upsert_many(db, rows=rows)
+            except BaseException:
+                self._requeue(batch) # Keep the events (also when cancelled mid-write); retried next flush
+                raise
+            metrics.PROGRESS_FLUSH_DURATION.observe(time.perf_counter() - started)
+            metrics.PROGRESS_ROWS_FLUSHED.inc(written)
+            return written
+
+    def _requeue(self, batch: Dict[ProgressKey, PendingProgress]) -> None:
+        for key, entry in batch.items():
+            newer = self._pending.get(key)
+            if newer is not None:
+                entry.merge(newer)
+            self._pending[key] = entry
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"ERROR: Progress buffer flush failed, {self.pending_count} entries kept for retry: {e}")
+                traceback.print_exc()
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="progress-write-behind")
+        print(f"Progress write-behind buffer started (every {self.flush_interval}s or {self.flush_threshold} entries).")
+
+    async def stop(self, attempts: int = 3) -> None:
+        """Stops the timer and flushes what is left, retrying a few times before giving up (logged)."""
+        self._stopping = True
+        self._flush_requested.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for attempt in range(1, attempts + 1):
+            try:
+                written = await self.flush()
+                print(f"Progress write-behind buffer stopped; final flush wrote {written} entries.")
+                return
+            except Exception as e:
+                print(f"ERROR: Final progress flush attempt {attempt}/{attempts} failed: {e}")
+                await asyncio.sleep(0.5 * attempt)
+        print(f"ERROR: {self.pending_count} progress entries could not be written on shutdown and are lost.")
+
+
+def _collect_pending() -> None:
+    metrics.PROGRESS_PENDING.set(progress_buffer.pending_count)
+
+
+progress_buffer = ProgressWriteBehindBuffer(
+    flush_interval=settings.PROGRESS_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.PROGRESS_FLUSH_THRESHOLD,
+    max_pending=settings.PROGRESS_MAX_PENDING,
+) # Started and stopped (with a final flush) by the application lifespan
+metrics.REGISTRY.add_collector(_collect_pending)
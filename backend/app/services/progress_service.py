@@ -0,0 +1,83 @@
+# backend/app/services/progress_service.py
+from typing import Dict, List
+import uuid
+import traceback
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import HTTPException, status
+
+from app.crud.crud_progress import crud_unit_progress
+from app.models.user import User as UserModel
+from app.models.user_course import UserCourse as UserCourseModel
+from app.schemas.progress_schemas import ProgressEvent, UnitProgressOut
+from app.services.progress_buffer import PendingProgress, progress_buffer
+from app.services.activity_log import UNIT_COMPLETED, UNIT_OPENED, activity_log
+
+class ProgressService:
+    async def record_event(
+        self, db: AsyncSession, *, unit_id: int, event: ProgressEvent, user: UserModel
+    ) -> None:
+        """
+        Records a progress event for the current user. Only buffered here: the write happens
+        in the next write-behind flush (see app/services/progress_buffer.py).
+        Authorization: the user must be enrolled in the unit's course (404 otherwise).
+        """
+        course_id = await crud_unit_progress.get_enrolled_course_id_for_unit(db, user_id=user.id, unit_id=unit_id)
+        if course_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unit not found in your courses")
+        await progress_buffer.record(
+            user_id=user.id, unit_id=unit_id,
+            opened=event == ProgressEvent.OPENED, completed=event == ProgressEvent.COMPLETED,
+        )
+        await activity_log.record(
+            UNIT_COMPLETED if event == ProgressEvent.COMPLETED else UNIT_OPENED,
+            user_id=user.id, course_id=course_id, unit_id=unit_id,
+        )
+
+    async def get_course_progress_for_user(
+        self, db: AsyncSession, *, course_id: uuid.UUID, user: UserModel
+    ) -> List[UnitProgressOut]:
+        """
+        The user's progress on every unit of the course they have interacted with, including
+        events still waiting in this process's write-behind buffer.
+        Authorization: the user must be enrolled in the course.
+        """
+        print(f"DEBUG: ProgressService.get_course_progress_for_user called for course_id: {course_id}, user_id: {user.id}")
+        enrollment_stmt = select(UserCourseModel.role).filter_by(user_id=user.id, course_id=course_id)
+        if (await db.execute(enrollment_stmt)).first() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found in your courses")
+        try:
+            stored = await crud_unit_progress.get_for_user_in_course(db, user_id=user.id, course_id=course_id)
+            merged: Dict[int, PendingProgress] = {
+                row.unit_id: PendingProgress(
+                    open_count=row.open_count, first_opened_at=row.first_opened_at,
+                    last_opened_at=row.last_opened_at, completed_at=row.completed_at,
+                )
+                for row in stored
+            }
+            pending = progress_buffer.pending_for_user(user.id)
+            if pending:
+                # Only units of this course (the enrollment check above does not cover other courses' units),
+                # re-listed in course order so units known only to the buffer are not appended at the end.
+                course_unit_ids = await crud_unit_progress.unit_ids_in_course(
+                    db, course_id=course_id, unit_ids=[*merged, *pending]
+                )
+                merged = {unit_id: merged.get(unit_id) or PendingProgress() for unit_id in course_unit_ids}
+                for unit_id, entry in merged.items():
+                    if unit_id in pending:
+                        entry.merge(pending[unit_id])
+            return [
+                UnitProgressOut(
+                    unit_id=unit_id, open_count=entry.open_count, first_opened_at=entry.first_opened_at,
+                    last_opened_at=entry.last_opened_at, completed_at=entry.completed_at,
+                    completed=entry.completed_at is not None,
+                )
+                for unit_id, entry in merged.items()
+            ]
+        except Exception as e:
+            print(f"ERROR in ProgressService.get_course_progress_for_user: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching progress.")
+
+progress_service = ProgressService()
@@ -0,0 +1,187 @@
+# backend/app/services/submission_service.py
+"""
+Assignment submissions as resumable chunked uploads.
+
+    POST /units/{unit_id}/submissions            declare filename and size -> id, chunk_size
+    PUT  /submissions/{id}/chunks/{index}        raw chunk body, X-Chunk-SHA256 header
+    GET  /submissions/{id}                       resume state: next_chunk, chunk_checksums
+
+Chunks are accepted strictly in order; each is streamed to disk (app/services/
+submission_storage.py), checked against its SHA-256 and only then acknowledged by
+recording its checksum on the row. An interrupted client asks for the resume state and
+continues at next_chunk; resending a chunk that was already acknowledged (the response
+was lost) is answered without storing it again. The body is read without holding a
+database connection; the row is locked only to append and acknowledge the chunk.
+"""
+import re
+import uuid
+from typing import AsyncIterator, List
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.crud.crud_submission import crud_submission
+from app.models.enums import UnitTypeEnum
+from app.models.submission import Submission as SubmissionModel
+from app.models.user import User as UserModel
+from app.schemas.submission_schemas import SubmissionCreate
+from app.services.activity_log import SUBMISSION, activity_log
+from app.services.submission_storage import ChunkTooLarge, submission_storage
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+class SubmissionService:
+    async def start_submission(
+        self, db: AsyncSession, *, unit_id: int, submission_in: SubmissionCreate, user: UserModel
+    ) -> SubmissionModel:
+        """
+        Creates the submission row and its empty file; the client then uploads the chunks.
+        Authorization: the user must be enrolled in the unit's course (404 otherwise),
+        and only ASSIGNMENT units accept submissions.
+        """
+        print(f"DEBUG: SubmissionService.start_submission called for unit_id: {unit_id}, user_id: {user.id}")
+        enrolled = await crud_submission.get_enrolled_unit(db, user_id=user.id, unit_id=unit_id)
+        if enrolled is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unit not found in your courses")
+        unit_type, _course_id = enrolled
+        if unit_type != UnitTypeEnum.ASSIGNMENT:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only assignment units accept submissions")
+        if submission_in.size_bytes > settings.SUBMISSION_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Submissions may be at most {settings.SUBMISSION_MAX_BYTES} bytes",
+            )
+        submission_id = uuid.uuid4()
+        storage_path = submission_storage.storage_path(unit_id=unit_id, submission_id=submission_id)
+        await submission_storage.create(storage_path)
+        try:
+            return await crud_submission.create_for_user(
+                db, obj_in=submission_in, submission_id=submission_id, unit_id=unit_id, user_id=user.id,
+                chunk_size=settings.SUBMISSION_CHUNK_SIZE, storage_path=storage_path,
+            )
+        except BaseException:
+            # No row refers to the file: it would never be uploaded to, nor cleaned up.
+            await submission_storage.delete(storage_path)
+            raise
+
+    async def get_submission_for_user(
+        self, db: AsyncSession, *, submission_id: uuid.UUID, user: UserModel
+    ) -> SubmissionModel:
+        """
+        Returns a submission with its upload state.
+        Authorization: only the user who submitted it can see it (404 otherwise).
+        """
+        submission = await crud_submission.get(db, submission_id)
+        if not submission or submission.user_id != user.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Submission not found")
+        return submission
+
+    async def list_submissions_for_user(
+        self, db: AsyncSession, *, unit_id: int, user: UserModel
+    ) -> List[SubmissionModel]:
+        """The user's submissions for a unit, newest first (to find an upload to resume)."""
+        return await crud_submission.get_multi_for_user_in_unit(db, user_id=user.id, unit_id=unit_id)
+
+    async def upload_chunk(
+        self, db: AsyncSession, *, submission_id: uuid.UUID, index: int, checksum: str,
+        chunks: AsyncIterator[bytes], user: UserModel
+    ) -> SubmissionModel:
+        """
+        Stores chunk `index` of a submission and returns the updated upload state.
+        `checksum` is the SHA-256 (hex) of the chunk body; a mismatch rejects the chunk (422),
+        as does a body that is not exactly the chunk's size. Only the next expected chunk is
+        accepted (409 otherwise); an already acknowledged chunk with the same checksum is a no-op.
+        """
+        checksum = checksum.strip().lower()
+        if not _SHA256_HEX.match(checksum):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="X-Chunk-SHA256 must be a hex SHA-256 digest")
+        submission = await self.get_submission_for_user(db, submission_id=submission_id, user=user)
+        if not 0 <= index < submission.chunk_count:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Chunk index must be between 0 and {submission.chunk_count - 1}",
+            )
+        acknowledged = self._check_order(submission, index=index, checksum=checksum)
+        if acknowledged:
+            metrics.SUBMISSION_CHUNKS.labels("duplicate").inc()
+            return submission
+        offset = index * submission.chunk_size
+        expected_length = min(submission.chunk_size, submission.size_bytes - offset)
+        storage_path = submission.storage_path
+        # The request's session is released while the body arrives; slow uploads hold no DB connection.
+        await db.close()
+
+        try:
+            received = await submission_storage.receive_chunk(storage_path, chunks, max_bytes=expected_length)
+        except ChunkTooLarge:
+            metrics.SUBMISSION_CHUNKS.labels("rejected").inc()
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Chunk {index} must be exactly {expected_length} bytes",
+            )
+        try:
+            if received.length != expected_length:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Chunk {index} must be exactly {expected_length} bytes, got {received.length}",
+                )
+            if received.sha256 != checksum:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Chunk {index} does not match its checksum; send it again",
+                )
+            # Locked from here to the commit: a concurrent retry of this chunk waits, then finds it acknowledged.
+            submission = await crud_submission.get_for_update(db, submission_id)
+            if submission is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Submission not found")
+            if self._check_order(submission, index=index, checksum=checksum):
+                await db.commit()
+                await submission_storage.discard(received.temp_path)
+                metrics.SUBMISSION_CHUNKS.labels("duplicate").inc()
+                return submission
+            await submission_storage.append(storage_path, received, offset=offset)
+        except BaseException:
+            metrics.SUBMISSION_CHUNKS.labels("rejected").inc()
+            await submission_storage.discard(received.temp_path)
+            raise
+
+        metrics.SUBMISSION_CHUNKS.labels("stored").inc()
+        metrics.SUBMISSION_BYTES.inc(received.length)
+        sha256 = None
+        if index == submission.chunk_count - 1:
+            # Still under the row lock: the hash covers exactly the acknowledged chunks.
+            sha256 = await submission_storage.file_sha256(storage_path, length=submission.size_bytes)
+        submission = await crud_submission.record_chunk(
+            db, submission=submission, length=received.length, checksum=checksum, sha256=sha256
+        )
+        if submission.completed:
+            print(f"DEBUG: Submission {submission.id} completed ({submission.size_bytes} bytes) by user_id: {user.id}")
+            metrics.SUBMISSIONS_COMPLETED.inc()
+            course_id = await crud_submission.get_enrolled_unit(db, user_id=user.id, unit_id=submission.unit_id)
+            await activity_log.record(
+                SUBMISSION, user_id=user.id, unit_id=submission.unit_id,
+                course_id=course_id[1] if course_id is not None else None,
+                data={"submission_id": str(submission.id), "size_bytes": submission.size_bytes},
+            )
+        return submission
+
+    def _check_order(self, submission: SubmissionModel, *, index: int, checksum: str) -> bool:
+        """True if chunk `index` was already acknowledged with this checksum; raises 409 if it cannot be stored now."""
+        received = submission.chunk_checksums or []
+        if index < len(received):
+            if received[index] == checksum:
+                return True
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Chunk {index} was already received with a different checksum",
+            )
+        if index > len(received):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Chunk {index} is out of order; the next expected chunk is {len(received)}",
+            )
+        return False
+
+submission_service = SubmissionService()
@@ -0,0 +1,131 @@
+# backend/app/services/submission_storage.py
+"""
+Local-disk storage for assignment submissions, one file per submission at
+SUBMISSIONS_DIR/<unit_id>/<submission_id>.
+
+A chunk is first streamed to its own temporary file next to the submission, hashed as it
+arrives and bounded by the size the chunk must have, so request memory stays at one write
+buffer however large the file is. Only a verified chunk is copied into the submission file,
+at its offset (index * chunk_size), which also cuts off anything a failed earlier attempt
+left past that point. Blocking file I/O runs in worker threads (asyncio.to_thread).
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO
+
+from app.core.config import settings
+
+WRITE_BUFFER_BYTES = 1024 * 1024 # Request bytes collected before each disk write
+
+
+class ChunkTooLarge(Exception):
+    pass
+
+
+@dataclass
+class ReceivedChunk:
+    temp_path: str
+    length: int
+    sha256: str # Hex digest
+
+
+class LocalSubmissionStorage:
+    def __init__(self, root: str):
+        self.root = root
+
+    def storage_path(self, *, unit_id: int, submission_id: uuid.UUID) -> str:
+        """Relative path recorded on the submission row."""
+        return f"{unit_id}/{submission_id}"
+
+    def absolute_path(self, storage_path: str) -> str:
+        return os.path.join(self.root, storage_path)
+
+    async def create(self, storage_path: str) -> None:
+        """Creates the (empty) submission file and its directory."""
+        path = self.absolute_path(storage_path)
+
+        def _create() -> None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "wb").close()
+
+        await asyncio.to_thread(_create)
+
+    async def receive_chunk(self, storage_path: str, chunks: AsyncIterator[bytes], *, max_bytes: int) -> ReceivedChunk:
+        """
+        Streams a request body to a temporary file beside the submission and returns its
+        length and SHA-256. Raises ChunkTooLarge as soon as more than `max_bytes` arrive.
+        The temporary file is removed on any error; otherwise call append() or discard().
+        """
+        temp_path = f"{self.absolute_path(storage_path)}.{uuid.uuid4().hex}.chunk"
+        digest = hashlib.sha256()
+        length = 0
+        buffer = bytearray()
+        f: BinaryIO = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            async for piece in chunks:
+                length += len(piece)
+                if length > max_bytes:
+                    raise ChunkTooLarge()
+                digest.update(piece)
+                buffer += piece
+                if len(buffer) >= WRITE_BUFFER_BYTES:
+                    await asyncio.to_thread(f.write, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(f.write, bytes(buffer))
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await self.discard(temp_path)
+            raise
+        await asyncio.to_thread(f.close)
+        return ReceivedChunk(temp_path=temp_path, length=length, sha256=digest.hexdigest())
+
+    async def append(self, storage_path: str, chunk: ReceivedChunk, *, offset: int) -> None:
+        """Writes a received chunk into the submission file at `offset` (truncating there first)."""
+        path = self.absolute_path(storage_path)
+
+        def _append() -> None:
+            with open(path, "r+b") as dst, open(chunk.temp_path, "rb") as src:
+                dst.truncate(offset)
+                dst.seek(offset)
+                shutil.copyfileobj(src, dst, WRITE_BUFFER_BYTES)
+                dst.flush()
+                os.fsync(dst.fileno()) # Acknowledged chunks must survive a crash
+            os.remove(chunk.temp_path)
+
+        await asyncio.to_thread(_append)
+
+    async def file_sha256(self, storage_path: str, *, length: int) -> str:
+        """SHA-256 of the first `length` bytes of the submission file."""
+        path = self.absolute_path(storage_path)
+
+        def _hash() -> str:
+            digest = hashlib.sha256()
+            remaining = length
+            with open(path, "rb") as f:
+                while remaining > 0:
+                    block = f.read(min(WRITE_BUFFER_BYTES, remaining))
+                    if not block:
+                        break
+                    digest.update(block)
+                    remaining -= len(block)
+            return digest.hexdigest()
+
+        return await asyncio.to_thread(_hash)
+
+    async def delete(self, storage_path: str) -> None:
+        """Removes a submission file (if it exists)."""
+        await self.discard(self.absolute_path(storage_path))
+
+    async def discard(self, temp_path: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, temp_path)
+        except FileNotFoundError:
+            pass
+
+
+submission_storage = LocalSubmissionStorage(settings.SUBMISSIONS_DIR)
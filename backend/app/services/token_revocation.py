@@ -0,0 +1,284 @@
+# backend/app/services/token_revocation.py
+"""
+In-memory revocation list for access tokens.
+
+Two kinds of revocation are stored in Postgres (app/crud/crud_revocation.py):
+a single token by its `jti` claim (logout) and a per-user epoch: every token whose
+`iat` is before it is rejected (log out everywhere). Authenticating a request must
+not cost another query, so each process keeps both in dicts and `is_revoked` is two
+lookups.
+
+The same per-user rows carry identity versions: access tokens embed an identity
+snapshot (id, email, name) with the user's token_version, and a snapshot older than
+the version recorded here is reissued on its next use (`is_stale`, app/api/deps.py).
+
+Until the first successful load the list is unknown, so it fails closed: is_revoked()
+rejects every token and /health reports 503 (app/main.py), and authentication answers
+503 rather than 401 (app/api/deps.py).
+
+Synchronization is incremental: a revocation is applied locally at once and
+broadcast with pg_notify on TOKEN_REVOCATION_CHANNEL; every process LISTENs and
+applies what it receives. As a safety net (and after the listener reconnects) the
+process also reads the rows written since its last sync, minus an overlap for
+transactions that committed late. Entries for expired tokens are dropped from
+memory and, periodically, from the table.
+"""
+import asyncio
+import json
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.crud.crud_revocation import crud_token_revocation
+from app.db.session import AsyncSessionLocal, async_engine
+from app.schemas.token_schemas import TokenPayload
+
+
+class TokenRevocationList:
+    def __init__(
+        self,
+        *,
+        channel: str = "lms_token_revocations",
+        sync_interval: float = 30.0,
+        sync_overlap: float = 60.0,
+        prune_interval: float = 3600.0,
+        heartbeat_seconds: float = 15.0,
+    ):
+        self.channel = channel
+        self.sync_interval = sync_interval
+        self.sync_overlap = sync_overlap # Rows committed up to this long after their timestamp are still picked up
+        self.prune_interval = prune_interval
+        self.heartbeat_seconds = heartbeat_seconds
+        self._revoked: Dict[str, float] = {} # jti -> expiry (unix time)
+        self._epochs: Dict[int, float] = {} # user id -> not_before (unix time)
+        self._versions: Dict[int, Tuple[int, float]] = {} # user id -> (token_version, changed at (unix time))
+        self._synced_at: Optional[datetime] = None # Database time of the last successful sync
+        self._last_prune = 0.0
+        self._listener: Optional[asyncio.Task] = None
+        self._syncer: Optional[asyncio.Task] = None
+        self._listening = False
+
+    # --- Request path ---
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the list was loaded from the database at least once."""
+        return self._synced_at is not None
+
+    def is_revoked(self, token: TokenPayload) -> bool:
+        """
+        Constant time; no I/O. Tokens without `iat` (issued before epochs existed) count as issued at 0.
+        Every token counts as revoked until the list is loaded.
+        """
+        if not self.loaded:
+            return True
+        if token.jti is not None and token.jti in self._revoked:
+            return True
+        if token.sub is not None and self._epochs:
+            not_before = self._epochs.get(int(token.sub)) if token.sub.isdigit() else None
+            if not_before is not None and (token.iat or 0) < not_before:
+                return True
+        return False
+
+    def is_stale(self, token: TokenPayload) -> bool:
+        """True when the token's identity snapshot is missing or older than the user's current version."""
+        if token.ver is None:
+            return True
+        known = self._versions.get(int(token.sub)) if token.sub is not None and token.sub.isdigit() else None
+        return known is not None and token.ver < known[0]
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {"token": len(self._revoked), "user": len(self._epochs), "version": len(self._versions)}
+
+    # --- Revoking ---
+
+    async def revoke_token(self, db: AsyncSession, token: TokenPayload) -> None:
+        """Logs one token out everywhere it is presented. Tokens without a jti cannot be revoked individually."""
+        if token.jti is None or token.sub is None or token.exp is None:
+            return
+        await crud_token_revocation.revoke_token(
+            db, jti=token.jti, user_id=int(token.sub), expires_at=datetime.fromtimestamp(token.exp, timezone.utc)
+        )
+        self._apply({"jti": token.jti, "exp": float(token.exp)})
+        metrics.TOKEN_REVOCATIONS.labels("token").inc()
+        await self._publish({"jti": token.jti, "exp": float(token.exp)})
+
+    async def revoke_all_for_user(self, db: AsyncSession, *, user_id: int) -> None:
+        """Rejects every token of the user issued until now; tokens issued afterwards are unaffected."""
+        effective = await crud_token_revocation.revoke_all_for_user(
+            db, user_id=user_id, not_before=datetime.now(timezone.utc)
+        )
+        entry = {"user_id": user_id, "not_before": effective.timestamp()}
+        self._apply(entry)
+        metrics.TOKEN_REVOCATIONS.labels("user").inc()
+        await self._publish(entry)
+
+    async def record_token_version(self, db: AsyncSession, *, user_id: int, token_version: int) -> None:
+        """
+        Call after the user's identity (users.token_version) changed: every worker then reissues
+        that user's older tokens on their next use. A no-op when the version is already known here.
+        """
+        known = self._versions.get(user_id)
+        if token_version <= 1 or (known is not None and known[0] >= token_version):
+            return
+        effective = await crud_token_revocation.set_token_version(db, user_id=user_id, token_version=token_version)
+        entry = {"user_id": user_id, "ver": effective, "at": time.time()}
+        self._apply(entry)
+        await self._publish(entry)
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        if "jti" in entry:
+            if entry["exp"] > time.time():
+                self._revoked[entry["jti"]] = entry["exp"]
+            return
+        user_id = int(entry["user_id"])
+        if entry.get("not_before") is not None:
+            self._epochs[user_id] = max(self._epochs.get(user_id, 0.0), float(entry["not_before"]))
+        if entry.get("ver") is not None:
+            known = self._versions.get(user_id)
+            if known is None or entry["ver"] > known[0]:
+                self._versions[user_id] = (int(entry["ver"]), float(entry["at"]))
+
+    async def _publish(self, entry: Dict[str, Any]) -> None:
+        # Other workers also pick the row up at their next sync, so a lost broadcast only delays them.
+        try:
+            async with async_engine.connect() as conn:
+                await conn.execute(select(func.pg_notify(self.channel, json.dumps(entry))))
+                await conn.commit()
+        except Exception as e:
+            print(f"ERROR: Could not broadcast token revocation {entry}: {e}")
+
+    # --- Synchronization ---
+
+    async def sync(self) -> int:
+        """Applies revocations written since the last sync (all of them the first time); returns how many."""
+        since = self._synced_at - timedelta(seconds=self.sync_overlap) if self._synced_at is not None else None
+        async with AsyncSessionLocal() as db:
+            tokens, epochs, now = await crud_token_revocation.get_changes(db, since=since)
+        for jti, expires_at in tokens:
+            self._apply({"jti": jti, "exp": expires_at.timestamp()})
+        for user_id, not_before, token_version, updated_at in epochs:
+            self._apply({
+                "user_id": user_id, "not_before": not_before.timestamp() if not_before is not None else None,
+                "ver": token_version, "at": updated_at.timestamp(),
+            })
+        self._synced_at = now
+        self._drop_expired()
+        return len(tokens) + len(epochs)
+
+    def _drop_expired(self) -> None:
+        now = time.time()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        # Epochs and versions older than the longest token lifetime cannot apply to any live token.
+        horizon = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for user_id in [uid for uid, not_before in self._epochs.items() if not_before <= horizon]:
+            del self._epochs[user_id]
+        for user_id in [uid for uid, (_, changed_at) in self._versions.items() if changed_at <= horizon]:
+            del self._versions[user_id]
+
+    async def _prune_table(self) -> None:
+        if time.monotonic() - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            deleted = await crud_token_revocation.prune_expired(
+                db, chunk_size=settings.DB_DELETE_CHUNK_SIZE,
+                token_lifetime=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            )
+        if deleted:
+            print(f"Token revocations: pruned {deleted} entries of expired tokens.")
+
+    async def _run_sync(self) -> None:
+        while True:
+            # Until the first load succeeds requests cannot be authenticated: retry sooner.
+            await asyncio.sleep(self.sync_interval if self.loaded else min(self.sync_interval, 2.0))
+            try:
+                await self.sync()
+                await self._prune_table()
+            except Exception as e:
+                print(f"ERROR: Token revocation sync failed, serving the last known list: {e}")
+                traceback.print_exc()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self._apply(json.loads(payload))
+        except Exception as e:
+            print(f"ERROR: Bad token revocation notification {payload[:200]!r}: {e}")
+
+    async def _listen(self) -> None:
+        """Holds one pooled connection with LISTEN; reconnects with backoff and catches up with a sync."""
+        delay = 1.0
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection # asyncpg.Connection
+                    lost = asyncio.Event()
+                    driver.add_termination_listener(lambda _conn: lost.set())
+                    await driver.add_listener(self.channel, self._on_notify)
+                    self._listening = True
+                    delay = 1.0
+                    print(f"Token revocations: listening on channel {self.channel!r}.")
+                    try:
+                        await self.sync() # Anything broadcast while we were not listening
+                        while not lost.is_set():
+                            try:
+                                await asyncio.wait_for(lost.wait(), timeout=self.heartbeat_seconds)
+                            except asyncio.TimeoutError:
+                                await asyncio.wait_for(driver.execute("SELECT 1"), timeout=self.heartbeat_seconds)
+                    finally:
+                        self._listening = False
+                        if not driver.is_closed():
+                            await driver.remove_listener(self.channel, self._on_notify)
+                raise ConnectionError("listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR: Token revocation listener failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    # --- Lifecycle ---
+
+    async def start(self) -> None:
+        """
+        Loads the full list before serving, then keeps it in sync. If the database is down the
+        load is retried in the background; until it succeeds tokens are rejected (see `loaded`).
+        """
+        try:
+            loaded = await self.sync()
+            print(f"Token revocations: loaded {loaded} entries.")
+        except Exception as e:
+            print(f"ERROR: Initial token revocation load failed; rejecting tokens until a retry succeeds: {e}")
+        self._listener = asyncio.create_task(self._listen(), name="token-revocation-listener")
+        self._syncer = asyncio.create_task(self._run_sync(), name="token-revocation-sync")
+
+    async def stop(self) -> None:
+        for task in (self._listener, self._syncer):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(t for t in (self._listener, self._syncer) if t is not None), return_exceptions=True)
+        self._listener = self._syncer = None
+        self._listening = False
+
+
+def _collect_size() -> None:
+    for kind, count in token_revocations.size.items():
+        metrics.TOKEN_REVOCATION_LIST_SIZE.labels(kind).set(count)
+
+
+token_revocations = TokenRevocationList(
+    channel=settings.TOKEN_REVOCATION_CHANNEL,
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    sync_overlap=settings.TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS,
+) # Loaded, listened for and synced by the application lifespan
+metrics.REGISTRY.add_collector(_collect_size)
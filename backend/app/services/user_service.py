@@ -1,12 +1,14 @@
 # backend/app/services/user_service.py
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.crud import crud_user
+from app.core.config import settings
+from app.crud.crud_user import crud_user
 from app.models.user import User as UserModel
 from app.schemas.user_schemas import UserUpdate, UserOut # Assuming UserOut is appropriate for list/get
+from app.services.token_revocation import token_revocations
 # from app.models.enums import UserRoleEnum # If you have global roles for authorization
 
 class UserService:
@@ -64,6 +66,8 @@ class UserService:
         #     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email cannot be changed directly.")
 
         updated_user = await crud_user.update(db, db_obj=user_to_update, obj_in=user_data)
+        # Tokens carry email and name: after a change, every session gets a fresh token on its next request.
+        await token_revocations.record_token_version(db, user_id=updated_user.id, token_version=updated_user.token_version)
         return updated_user
 
     async def get_all_users(
@@ -83,6 +87,10 @@ class UserService:
         users = await crud_user.get_multi(db, skip=skip, limit=limit)
         return users
 
+    async def count_all_users(self, db: AsyncSession, *, current_user: UserModel) -> Tuple[int, bool]:
+        """Total for the get_all_users list as (total, is_exact); estimated past LIST_TOTAL_EXACT_THRESHOLD."""
+        return await crud_user.count(db, exact_threshold=settings.LIST_TOTAL_EXACT_THRESHOLD)
+
     async def delete_user_by_id(
         self, db: AsyncSession, *, user_id_to_delete: int, current_user: UserModel
     ) -> Optional[UserModel]:
@@ -105,8 +113,13 @@ class UserService:
         if not user_to_delete:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User to delete not found")
 
-        deleted_user = await crud_user.remove(db, record_id=user_id_to_delete)
-        return deleted_user
+        # Set-based and chunked: enrollments are deleted in short transactions without
+        # loading them into the session, then the user row.
+        counts = await crud_user.remove_with_cascade(db, user_id=user_id_to_delete, chunk_size=settings.DB_DELETE_CHUNK_SIZE)
+        # Identity-only endpoints trust the token without loading the user: reject the deleted user's tokens.
+        await token_revocations.revoke_all_for_user(db, user_id=user_id_to_delete)
+        print(f"DEBUG: UserService.delete_user_by_id removed user {user_id_to_delete}: {counts}")
+        return user_to_delete
 
 
 # Instantiate the service
@@ -0,0 +1,107 @@
+# backend/scripts/bench_user_lookup.py
+"""
+Micro-benchmark of the per-request user lookup (CRUDBase.get on users).
+
+Compares three ways of issuing the same primary-key query:
+    legacy - build select() per call and stringify it for a debug print (the old CRUDBase.get)
+    fresh  - build select() per call, no stringification
+    cached - the prebuilt statement CRUDBase.get executes now
+
+Each variant first runs in-process only (statement preparation, no DB round trip)
+and then end-to-end against the configured database, so the Python-side share of
+the lookup cost is visible separately. Seed data first, e.g.:
+    python scripts/seed_data.py --profile tiny --truncate
+    python scripts/bench_user_lookup.py --iterations 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List, Sequence
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from app.crud.crud_user import crud_user
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models.user import User as UserModel
+
+
+def prepare_legacy(user_id: int):
+    stmt = select(UserModel).filter(UserModel.id == user_id)
+    str(stmt) # What the old debug print paid on every call
+    return stmt, None
+
+
+def prepare_fresh(user_id: int):
+    return select(UserModel).filter(UserModel.id == user_id), None
+
+
+def prepare_cached(user_id: int):
+    return crud_user._get_stmt, {"record_id": user_id}
+
+
+VARIANTS = {"legacy": prepare_legacy, "fresh": prepare_fresh, "cached": prepare_cached}
+
+
+def bench_prepare(prepare: Callable, iterations: int, max_id: int) -> float:
+    """Statement preparation plus the cache-key lookup SQLAlchemy performs before executing."""
+    dialect = async_engine.sync_engine.dialect
+    started = time.perf_counter()
+    for i in range(iterations):
+        stmt, _ = prepare(i % max_id + 1)
+        stmt._generate_cache_key()
+    elapsed = time.perf_counter() - started
+    stmt.compile(dialect=dialect) # Sanity check that the statement is valid
+    return elapsed / iterations
+
+
+async def bench_execute(prepare: Callable, iterations: int, max_id: int, rounds: int) -> List[float]:
+    per_round: List[float] = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for i in range(iterations):
+                stmt, params = prepare(i % max_id + 1)
+                result = await db.execute(stmt, params)
+                result.scalars().first()
+                db.expunge_all() # Every request has a fresh session; don't let the identity map help
+            per_round.append((time.perf_counter() - started) / iterations)
+    return per_round
+
+
+async def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--offline", action="store_true", help="Only measure statement preparation; no DB needed.")
+    args = parser.parse_args(argv)
+
+    max_id = 1_000
+    if not args.offline:
+        async with AsyncSessionLocal() as db:
+            max_id = (await db.execute(select(func.max(UserModel.id)))).scalar() or 0
+        if not max_id:
+            print("No users found; seed the database first (scripts/seed_data.py).")
+            return
+        for prepare in VARIANTS.values(): # Warm the compiled cache and prepared statements
+            await bench_execute(prepare, 50, max_id, 1)
+
+    print(f"{'variant':<8} {'prepare (us/op)':>16} {'end-to-end median (us/op)':>27}")
+    for name, prepare in VARIANTS.items():
+        prepare_us = bench_prepare(prepare, args.iterations, max_id) * 1e6
+        if args.offline:
+            print(f"{name:<8} {prepare_us:>16.1f} {'-':>27}")
+            continue
+        per_round = await bench_execute(prepare, args.iterations, max_id, args.rounds)
+        print(f"{name:<8} {prepare_us:>16.1f} {statistics.median(per_round) * 1e6:>27.1f}")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,138 @@
+# backend/scripts/check_query_plans.py
+"""
+Plan check for the hot read paths: EXPLAINs each query as the app issues it and fails
+(exit status 1) unless the plan reads the index meant for it (alembic/versions/0009_hot_query_indexes.py).
+
+    query              index
+    enrollment check   user_courses_pkey               (user_id, course_id)
+    my courses         user_courses_pkey               user_id prefix
+    course outline     ix_modules_course_id_order      modules of one course, in order
+    module units       ix_units_module_id_order        units of its modules, in order
+    course roster      ix_user_courses_course_id_role  one page of members, teachers first
+    roster count       ix_user_courses_course_id_role
+    courses by name    ix_courses_name                 first page of courses by name
+
+Plans depend on table sizes, so run it against a seeded dataset, not an empty database:
+    alembic upgrade head
+    python scripts/seed_data.py --profile small --truncate
+    python scripts/check_query_plans.py
+Sample ids (the busiest course and user) are read from the data. Tables are ANALYZEd first
+unless --no-analyze is given.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.future import select
+
+from app.crud.crud_course import crud_course
+from app.db.session import async_engine
+from app.models.course import Course
+from app.models.module_model import Module
+from app.models.unit import Unit
+from app.models.user_course import UserCourse
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+TABLES = ("users", "courses", "user_courses", "modules", "units")
+
+
+def walk(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def summarize(plan: Dict[str, Any]) -> str:
+    """Scan nodes of the plan, e.g. 'Index Scan using ix_units_module_id_order on units'."""
+    scans = []
+    for node in walk(plan):
+        if "Relation Name" in node or "Index Name" in node:
+            using = f" using {node['Index Name']}" if "Index Name" in node else ""
+            on = f" on {node['Relation Name']}" if "Relation Name" in node else ""
+            scans.append(f"{node['Node Type']}{using}{on}")
+    return "; ".join(scans)
+
+
+async def explain(conn: AsyncConnection, stmt) -> Dict[str, Any]:
+    # EXPLAIN takes no bind parameters; the samples are ids and enums, safe to inline.
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def sample_ids(conn: AsyncConnection) -> Dict[str, Any]:
+    course_id = (await conn.execute(
+        select(UserCourse.course_id).group_by(UserCourse.course_id).order_by(func.count().desc()).limit(1)
+    )).scalar()
+    user_id = (await conn.execute(
+        select(UserCourse.user_id).group_by(UserCourse.user_id).order_by(func.count().desc()).limit(1)
+    )).scalar()
+    if course_id is None or user_id is None:
+        raise SystemExit("No enrollments found; seed the database first (scripts/seed_data.py).")
+    module_ids = (await conn.execute(select(Module.id).filter(Module.course_id == course_id))).scalars().all()
+    return {"course_id": course_id, "user_id": user_id, "module_ids": module_ids or [0]}
+
+
+def hot_queries(ids: Dict[str, Any]) -> List[Tuple[str, str, Any]]:
+    """
+    (name, expected index, statement): the statements the CRUD layer executes, or the ones its
+    loaders emit. Untyped skip/limit parameters are replaced by literals (EXPLAIN has no binds).
+    """
+    return [
+        ("enrollment check", "user_courses_pkey",
+         select(UserCourse.role).filter_by(user_id=ids["user_id"], course_id=ids["course_id"])),
+        ("my courses", "user_courses_pkey",
+         crud_course._multi_for_user_stmt.params(user_id=ids["user_id"]).offset(0).limit(100)),
+        # What selectinload(Course.modules) / selectinload(Module.units) emit when GET /courses/{id}
+        # loads one course (for a whole page of courses a scan of modules can rightly be cheaper)
+        ("course outline", "ix_modules_course_id_order",
+         select(Module).filter(Module.course_id.in_([ids["course_id"]])).order_by(Module.order)),
+        ("module units", "ix_units_module_id_order",
+         select(Unit).filter(Unit.module_id.in_(ids["module_ids"])).order_by(Unit.order)),
+        ("course roster", "ix_user_courses_course_id_role",
+         crud_course._roster_stmt.params(course_id=ids["course_id"]).offset(0).limit(100)),
+        ("roster count", "ix_user_courses_course_id_role",
+         select(func.count()).select_from(
+             select(UserCourse.user_id).filter(UserCourse.course_id == ids["course_id"]).subquery()
+         )),
+        ("courses by name", "ix_courses_name", select(Course).order_by(Course.name).limit(20)),
+    ]
+
+
+async def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-analyze", action="store_true", help="Use the current planner statistics as they are.")
+    parser.add_argument("--verbose", action="store_true", help="Print the full JSON plan of failing queries.")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    async with async_engine.connect() as conn:
+        if not args.no_analyze:
+            await conn.execute(text(f"ANALYZE {', '.join(TABLES)}"))
+        ids = await sample_ids(conn)
+        print(f"{'query':<18} {'expected index':<32} result")
+        for name, index, stmt in hot_queries(ids):
+            plan = await explain(conn, stmt)
+            used = any(node.get("Index Name") == index and node["Node Type"] in INDEX_NODES for node in walk(plan))
+            failures += not used
+            print(f"{name:<18} {index:<32} {'ok' if used else 'FAIL'}  ({summarize(plan)})")
+            if not used and args.verbose:
+                print(json.dumps(plan, indent=2, default=str))
+        await conn.rollback()
+    await async_engine.dispose()
+    print(f"{failures} of the hot queries do not use their index." if failures else "All hot queries use their index.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,47 @@
+# backend/scripts/rebuild_completion_summaries.py
+"""
+Recomputes the course / module completion summaries from unit_progress.
+
+The summaries are maintained incrementally by every progress flush, so this is
+only needed after they were created on a database that already had progress,
+after units were deleted (their progress rows cascade away without updating the
+rollups), or to repair drift. Progress flushes wait while a rebuild runs.
+
+Usage (from the backend/ directory):
+    python scripts/rebuild_completion_summaries.py                 # every course
+    python scripts/rebuild_completion_summaries.py --course-id <uuid>
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from typing import Sequence
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.crud.crud_completion import crud_completion
+from app.db.session import AsyncSessionLocal, async_engine
+
+
+async def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--course-id", type=uuid.UUID, default=None, help="Only rebuild this course (default: all).")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            counts = await crud_completion.rebuild(db, course_id=args.course_id)
+    finally:
+        await async_engine.dispose()
+    scope = f"course {args.course_id}" if args.course_id else "all courses"
+    print(
+        f"Rebuilt completion summaries for {scope} in {time.perf_counter() - started:.2f}s: "
+        f"{counts['module_completion']} module rows, {counts['course_completion']} course rows."
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
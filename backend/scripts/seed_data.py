@@ -0,0 +1,390 @@
+# backend/scripts/seed_data.py
+"""
+Synthetic data generator for scale testing.
+
+Bulk-loads a realistic, fully deterministic dataset (users, courses, modules,
+units and enrollments) built on the app's own models, so benchmarks and
+query-plan checks can be repeated against the same data.
+
+Usage (from the backend/ directory):
+    python scripts/seed_data.py --profile small --seed 42 --truncate
+    python scripts/seed_data.py --profile large --method copy   # after `alembic upgrade head`
+    python scripts/seed_data.py --profile tiny --users 5000   # override a single size
+
+Loading methods:
+    copy   - asyncpg binary COPY (fastest, default)
+    insert - batched multi-row INSERT ... VALUES statements
+"""
+import argparse
+import asyncio
+import itertools
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import Enum as SQLAlchemyEnum, insert, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.session import async_engine
+from app.models import Base, Course, Module, Unit, User, UserCourse
+from app.models.enums import UnitTypeEnum, UserCourseRoleEnum
+
+
+@dataclass(frozen=True)
+class SizeProfile:
+    users: int
+    courses: int
+    enrollments: int
+    units: int
+    units_per_module: float = 6.0 # Average module size; the actual size varies per module
+    max_teachers_per_course: int = 2
+
+
+PROFILES: Dict[str, SizeProfile] = {
+    "tiny": SizeProfile(users=1_000, courses=100, enrollments=10_000, units=5_000),
+    "small": SizeProfile(users=10_000, courses=1_000, enrollments=100_000, units=50_000),
+    "medium": SizeProfile(users=50_000, courses=5_000, enrollments=500_000, units=250_000),
+    "large": SizeProfile(users=200_000, courses=20_000, enrollments=2_000_000, units=1_000_000),
+}
+
+# Relative frequency of unit types and the typical content size (median bytes) for each.
+# The database stores SQLAlchemy Enum *names*, so rows are generated with `.name`.
+UNIT_TYPE_MIX: Sequence[Tuple[UnitTypeEnum, float, int]] = (
+    (UnitTypeEnum.MATERIAL, 0.45, 2_000),
+    (UnitTypeEnum.VIDEO, 0.20, 0),
+    (UnitTypeEnum.QUIZ, 0.12, 1_200),
+    (UnitTypeEnum.ASSIGNMENT, 0.12, 800),
+    (UnitTypeEnum.DISCUSSION, 0.06, 300),
+    (UnitTypeEnum.EXTERNAL_LINK, 0.05, 0),
+)
+
+FIRST_NAMES = (
+    "Ada", "Alan", "Grace", "Linus", "Barbara", "Ken", "Margaret", "Dennis", "Frances", "Edsger",
+    "Radia", "Donald", "Katherine", "John", "Hedy", "Tim", "Shafi", "Niklaus", "Sophie", "Guido",
+)
+LAST_NAMES = (
+    "Lovelace", "Turing", "Hopper", "Torvalds", "Liskov", "Thompson", "Hamilton", "Ritchie", "Allen",
+    "Dijkstra", "Perlman", "Knuth", "Johnson", "McCarthy", "Lamarr", "Berners-Lee", "Goldwasser",
+    "Wirth", "Wilson", "van Rossum",
+)
+SUBJECTS = (
+    "Algebra", "Biology", "Chemistry", "Databases", "Economics", "French", "Geometry", "History",
+    "Linear Algebra", "Literature", "Machine Learning", "Music Theory", "Networks", "Operating Systems",
+    "Philosophy", "Physics", "Psychology", "Statistics", "Web Development", "World Geography",
+)
+LEVELS = ("Introduction to", "Foundations of", "Intermediate", "Advanced", "Topics in", "Applied")
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+    "et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip "
+    "ex ea commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla "
+    "pariatur excepteur sint occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim"
+).split()
+
+# asyncpg caps a single statement at 32767 bind parameters.
+MAX_BIND_PARAMS = 32_767
+
+
+def _rng(seed: int, stream: str) -> random.Random:
+    """Independent deterministic stream per table, so one table's size never shifts another's data."""
+    return random.Random(f"{seed}:{stream}")
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _apportion(total: int, weights: Sequence[float], rng: random.Random, cap: int = 0) -> List[int]:
+    """
+    Splits `total` into integer parts proportional to `weights` (largest remainder method).
+    With `cap`, no part exceeds it and the overflow is handed to the remaining parts.
+    """
+    weight_sum = sum(weights) or 1.0
+    raw = [total * w / weight_sum for w in weights]
+    parts = [int(x) for x in raw]
+    if cap:
+        parts = [min(p, cap) for p in parts]
+    remaining = total - sum(parts)
+    order = sorted(range(len(weights)), key=lambda i: raw[i] - int(raw[i]), reverse=True)
+    while remaining > 0:
+        progressed = False
+        for i in order:
+            if remaining == 0:
+                break
+            if cap and parts[i] >= cap:
+                continue
+            parts[i] += 1
+            remaining -= 1
+            progressed = True
+        if not progressed:
+            break # Every part is at the cap; the dataset simply ends up smaller
+    return parts
+
+
+class TextPool:
+    """Pre-generated word soup; unit content is sliced from it instead of built word by word."""
+
+    def __init__(self, rng: random.Random, size: int = 1 << 20):
+        chunks: List[str] = []
+        length = 0
+        while length < size:
+            word = rng.choice(WORDS)
+            chunks.append(word)
+            length += len(word) + 1
+        self.blob = " ".join(chunks)
+
+    def take(self, rng: random.Random, length: int) -> str:
+        length = max(1, min(length, len(self.blob) - 1))
+        start = rng.randrange(0, len(self.blob) - length)
+        return self.blob[start:start + length]
+
+
+# --- Row generators ---
+# Every generator yields plain tuples in the column order given next to it.
+
+USER_COLUMNS = ("id", "google_sub", "email", "name")
+COURSE_COLUMNS = ("id", "name", "description")
+MODULE_COLUMNS = ("id", "title", "description", "order", "course_id")
+UNIT_COLUMNS = ("id", "title", "type", "content", "order", "module_id")
+ENROLLMENT_COLUMNS = ("user_id", "course_id", "role")
+
+
+def generate_users(profile: SizeProfile, seed: int) -> Iterator[tuple]:
+    rng = _rng(seed, "users")
+    for user_id in range(1, profile.users + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        yield (user_id, f"seed-{seed}-{user_id}", f"user{user_id}.s{seed}@example.com", name)
+
+
+def generate_course_ids(profile: SizeProfile, seed: int) -> List[uuid.UUID]:
+    rng = _rng(seed, "course-ids")
+    return [_uuid(rng) for _ in range(profile.courses)]
+
+
+def generate_courses(profile: SizeProfile, seed: int, course_ids: List[uuid.UUID]) -> Iterator[tuple]:
+    rng = _rng(seed, "courses")
+    text_pool = TextPool(_rng(seed, "course-text"), size=1 << 16)
+    for index, course_id in enumerate(course_ids):
+        name = f"{rng.choice(LEVELS)} {rng.choice(SUBJECTS)} {100 + index % 400} (Section {index // 400 + 1})"
+        description = text_pool.take(rng, int(rng.lognormvariate(5.0, 0.6))) if rng.random() < 0.9 else None
+        yield (course_id, name, description)
+
+
+def plan_course_sizes(profile: SizeProfile, seed: int) -> List[int]:
+    """Units per course follow a log-normal distribution: most courses are modest, a few are huge."""
+    rng = _rng(seed, "course-sizes")
+    weights = [rng.lognormvariate(0.0, 0.9) for _ in range(profile.courses)]
+    return _apportion(profile.units, weights, rng)
+
+
+def generate_modules_and_units(
+    profile: SizeProfile, seed: int, course_ids: List[uuid.UUID]
+) -> Tuple[Iterator[tuple], Iterator[tuple]]:
+    """
+    Returns (modules, units) generators. Both replay the same deterministic plan,
+    so they can be streamed into the database one after the other without holding
+    a million unit rows in memory.
+    """
+    units_per_course = plan_course_sizes(profile, seed)
+    type_choices = [t for t, _, _ in UNIT_TYPE_MIX]
+    type_cum_weights = list(itertools.accumulate(w for _, w, _ in UNIT_TYPE_MIX))
+    content_sizes = {t: size for t, _, size in UNIT_TYPE_MIX}
+
+    def plan() -> Iterator[Tuple[uuid.UUID, List[int]]]:
+        rng = _rng(seed, "modules")
+        for course_id, unit_count in zip(course_ids, units_per_course):
+            module_count = max(1, round(unit_count / max(profile.units_per_module, 1.0) * rng.uniform(0.7, 1.3)))
+            module_count = min(module_count, max(unit_count, 1))
+            cuts = sorted(rng.sample(range(1, unit_count), module_count - 1)) if unit_count > 1 and module_count > 1 else []
+            bounds = [0] + cuts + [unit_count]
+            yield course_id, [bounds[i + 1] - bounds[i] for i in range(module_count)]
+
+    def modules() -> Iterator[tuple]:
+        rng = _rng(seed, "module-rows")
+        text_pool = TextPool(_rng(seed, "module-text"), size=1 << 16)
+        module_id = 0
+        for course_id, module_sizes in plan():
+            for order in range(len(module_sizes)):
+                module_id += 1
+                description = text_pool.take(rng, int(rng.lognormvariate(4.5, 0.5))) if rng.random() < 0.7 else None
+                yield (module_id, f"Module {order + 1}: {rng.choice(WORDS).title()} {rng.choice(WORDS)}", description, order, course_id)
+
+    def units() -> Iterator[tuple]:
+        rng = _rng(seed, "unit-rows")
+        text_pool = TextPool(_rng(seed, "unit-text"))
+        module_id = 0
+        unit_id = 0
+        for _, module_sizes in plan():
+            for size in module_sizes:
+                module_id += 1
+                for order in range(size):
+                    unit_id += 1
+                    unit_type = rng.choices(type_choices, cum_weights=type_cum_weights)[0]
+                    median = content_sizes[unit_type]
+                    if unit_type in (UnitTypeEnum.VIDEO, UnitTypeEnum.EXTERNAL_LINK):
+                        content = f"https://media.example.com/{seed}/{unit_id}"
+                    else:
+                        content = text_pool.take(rng, int(rng.lognormvariate(math.log(median), 0.8)))
+                    title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {order + 1}"
+                    yield (unit_id, title, unit_type.name, content, order, module_id)
+
+    return modules(), units()
+
+
+def generate_enrollments(profile: SizeProfile, seed: int, course_ids: List[uuid.UUID]) -> Iterator[tuple]:
+    """
+    Course popularity is Pareto-distributed (a long tail of small classes and a few
+    very large ones); each course gets 1..max_teachers_per_course teachers.
+    """
+    rng = _rng(seed, "enrollments")
+    weights = [rng.paretovariate(1.2) for _ in range(profile.courses)]
+    per_course = _apportion(profile.enrollments, weights, rng, cap=profile.users)
+    teacher = UserCourseRoleEnum.teacher.name
+    student = UserCourseRoleEnum.student.name
+    for course_id, count in zip(course_ids, per_course):
+        if count == 0:
+            continue
+        members = rng.sample(range(1, profile.users + 1), count)
+        teacher_count = min(count, rng.randint(1, max(profile.max_teachers_per_course, 1)))
+        for position, user_id in enumerate(members):
+            yield (user_id, course_id, teacher if position < teacher_count else student)
+
+
+# --- Loading ---
+
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    batch: List[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def load_table(
+    conn: AsyncConnection, model: Any, columns: Sequence[str], rows: Iterable[tuple], *, method: str, batch_size: int
+) -> int:
+    table = model.__table__
+    started = time.perf_counter()
+    loaded = 0
+    if method == "copy":
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection # The underlying asyncpg connection
+        for batch in _batched(rows, batch_size):
+            await driver_connection.copy_records_to_table(table.name, records=batch, columns=list(columns))
+            loaded += len(batch)
+    else:
+        rows_per_statement = max(1, min(batch_size, MAX_BIND_PARAMS // len(columns)))
+        for batch in _batched(rows, rows_per_statement):
+            await conn.execute(insert(table).values([dict(zip(columns, row)) for row in batch]))
+            loaded += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"--- Seed: {table.name}: {loaded:,} rows in {elapsed:.1f}s ({loaded / max(elapsed, 1e-9):,.0f} rows/s) ---")
+    return loaded
+
+
+async def create_schema(conn: AsyncConnection) -> None:
+    """
+    Creates the enum types (declared with create_type=False on the models) and any missing tables.
+    For scratch databases only: the result is not managed by Alembic and cannot be upgraded
+    later. Create every other database with `alembic upgrade head` before seeding.
+    """
+    enum_types = {
+        column.type.name: column.type.enums
+        for table in Base.metadata.sorted_tables for column in table.columns
+        if isinstance(column.type, SQLAlchemyEnum)
+    } # Every enum column of every model, so a new enum type cannot be missed here
+    for name, values in enum_types.items():
+        enum_type = postgresql.ENUM(*values, name=name)
+        await conn.run_sync(lambda sync_conn: enum_type.create(sync_conn, checkfirst=True))
+    await conn.run_sync(Base.metadata.create_all)
+
+
+async def truncate(conn: AsyncConnection) -> None:
+    tables = ", ".join(m.__tablename__ for m in (UserCourse, Unit, Module, Course, User))
+    await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+async def reset_sequences(conn: AsyncConnection) -> None:
+    """Explicit ids were loaded, so move the serial sequences past them."""
+    for model in (User, Module, Unit):
+        table = model.__tablename__
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        ))
+
+
+async def seed(profile: SizeProfile, *, seed_value: int, method: str, batch_size: int, truncate_first: bool, schema: bool) -> None:
+    print(f"--- Seed: profile={profile} seed={seed_value} method={method} ---")
+    started = time.perf_counter()
+    course_ids = generate_course_ids(profile, seed_value)
+    modules, units = generate_modules_and_units(profile, seed_value, course_ids)
+
+    async with async_engine.begin() as conn:
+        if schema:
+            await create_schema(conn)
+        if truncate_first:
+            await truncate(conn)
+
+    # One transaction per table keeps each COPY's WAL and lock footprint bounded.
+    steps = (
+        (User, USER_COLUMNS, generate_users(profile, seed_value)),
+        (Course, COURSE_COLUMNS, generate_courses(profile, seed_value, course_ids)),
+        (Module, MODULE_COLUMNS, modules),
+        (Unit, UNIT_COLUMNS, units),
+        (UserCourse, ENROLLMENT_COLUMNS, generate_enrollments(profile, seed_value, course_ids)),
+    )
+    for model, columns, rows in steps:
+        async with async_engine.begin() as conn:
+            await load_table(conn, model, columns, rows, method=method, batch_size=batch_size)
+
+    async with async_engine.begin() as conn:
+        await reset_sequences(conn)
+    # ANALYZE cannot run inside a transaction block, so use an autocommit connection.
+    async with async_engine.connect() as conn:
+        autocommit_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for model in (User, Course, Module, Unit, UserCourse):
+            await autocommit_conn.execute(text(f"ANALYZE {model.__tablename__}"))
+
+    await async_engine.dispose()
+    print(f"--- Seed: completed in {time.perf_counter() - started:.1f}s ---")
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load a deterministic synthetic LMS dataset.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--seed", type=int, default=42, help="Same seed + same sizes = identical dataset.")
+    parser.add_argument("--method", choices=("copy", "insert"), default="copy")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per COPY batch / upper bound per INSERT.")
+    parser.add_argument("--truncate", action="store_true", help="Empty the LMS tables before loading.")
+    parser.add_argument("--create-schema", action="store_true", help="Create enum types and tables if missing (scratch databases only; otherwise run `alembic upgrade head` first).")
+    for size in ("users", "courses", "enrollments", "units"):
+        parser.add_argument(f"--{size}", type=int, default=None, help=f"Override the profile's {size} count.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] = ()) -> None:
+    args = parse_args(argv)
+    overrides = {k: getattr(args, k) for k in ("users", "courses", "enrollments", "units") if getattr(args, k) is not None}
+    profile = replace(PROFILES[args.profile], **overrides)
+    asyncio.run(seed(
+        profile,
+        seed_value=args.seed,
+        method=args.method,
+        batch_size=args.batch_size,
+        truncate_first=args.truncate,
+        schema=args.create_schema,
+    ))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
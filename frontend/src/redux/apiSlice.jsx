@@ -46,6 +46,30 @@ export const api = createApi({
       query: id => `/courses/${id}`,
       providesTags: (result, error, id) => [{ type: 'Courses', id }],
       keepUnusedDataFor: 0,
+      // While the course is on screen, follow its server-sent events and refetch only
+      // when something changed, instead of re-polling the course.
+      async onCacheEntryAdded(id, { cacheDataLoaded, cacheEntryRemoved, dispatch }) {
+        let source;
+        try {
+          await cacheDataLoaded;
+          source = new EventSource(
+            `${process.env.REACT_APP_API_BASE_URL}/events/courses?course_id=${id}`,
+            { withCredentials: true },
+          );
+          const refetch = () => dispatch(api.util.invalidateTags([{ type: 'Courses', id }]));
+          ['enrollment.created', 'course.updated', 'resync'].forEach(type =>
+            source.addEventListener(type, refetch),
+          );
+          source.addEventListener('course.deleted', () => {
+            source.close();
+            dispatch(api.util.invalidateTags(['Courses']));
+          });
+        } catch {
+          // The cache entry was removed before the first load finished.
+        }
+        await cacheEntryRemoved;
+        source?.close();
+      },
     }),
 
     // Create new course